@@ -48,6 +48,7 @@ class Parameter(BaseALObject):
 
     def set_dimension(self, dimension):
         self._dimension = dimension
+        self._mutated()
 
     def __repr__(self):
         return ("Parameter({}{})"
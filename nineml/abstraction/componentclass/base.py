@@ -38,7 +38,7 @@ class ComponentClass(with_metaclass(
         ContainerObject.__init__(self)
 
         # Caches the dimension resolver so that it can be reused in subsequent
-        # calls
+        # calls (until the class is modified)
         self._dimension_resolver = None
 
         # Turn any strings in the parameter list into Parameters:
@@ -67,6 +67,7 @@ class ComponentClass(with_metaclass(
     @name.setter
     def name(self, name):
         self._name = validate_identifier(name)
+        self._mutated()
 
     @property
     def num_parameters(self):
@@ -142,3 +143,4 @@ class ComponentClass(with_metaclass(
             except StopIteration:
                 continue
             a.set_dimension(std_dim)
+        self._mutated()
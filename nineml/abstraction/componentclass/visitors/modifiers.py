@@ -30,12 +30,15 @@ class ComponentRenameSymbol(BaseVisitor):
 
     def note_lhs_changed(self, what):
         self.lhs_changes.append(what)
+        what._mutated()
 
     def note_rhs_changed(self, what):
         self.rhs_changes.append(what)
+        what._mutated()
 
     def note_port_changed(self, what):
         self.port_changes.append(what)
+        what._mutated()
 
     def _update_dicts(self, *dicts):
         for d in dicts:
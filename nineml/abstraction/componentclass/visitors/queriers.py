@@ -7,13 +7,69 @@ from sympy.functions.elementary.piecewise import ExprCondPair
 from ...expressions import reserved_identifiers
 from nineml.visitors import BaseVisitor, BaseVisitorWithContext
 from nineml.units import Dimension
+import nineml.units as un
 from nineml.abstraction.ports import SendPortBase
 from nineml.abstraction.expressions import Expression
-from nineml.exceptions import NineMLNameError
+from nineml.exceptions import (
+    NineMLNameError, NineMLUsageError, NineMLDimensionError)
 import operator
 from functools import reduce
 
 
+# Dimensions are represented by tuples of the powers of each of the base
+# dimensions (see Dimension.dimension_symbols) while they are being resolved,
+# which are much cheaper to combine than the equivalent sympy expressions.
+# Boolean expressions are represented by 0
+DIMENSIONLESS = tuple(un.dimensionless)
+BOOLEAN = 0
+
+
+def multiply_dims(dims1, dims2):
+    """Multiplies two dimension power vectors"""
+    if dims1 == BOOLEAN or dims2 == BOOLEAN:
+        return BOOLEAN
+    return tuple(p1 + p2 for p1, p2 in zip(dims1, dims2))
+
+
+def power_dims(dims, exponent):
+    """Raises a dimension power vector to the power of a sympy exponent"""
+    if dims == BOOLEAN or dims == DIMENSIONLESS:
+        return dims
+    exponent = sympify(exponent)
+    if exponent.is_Integer:
+        exponent = int(exponent)
+    elif exponent.is_Float:
+        exponent = float(exponent)
+    elif not exponent.is_Rational:
+        raise NineMLDimensionError(
+            "Cannot raise dimension {} to the non-numeric power '{}'"
+            .format(dims_to_sympy(dims), exponent))
+    return tuple(p * exponent for p in dims)
+
+
+def to_sympy(expr):
+    """
+    Converts NineML objects to sympy directly instead of via 'sympify', which
+    would calculate the hash of the (potentially large) object
+    """
+    try:
+        return expr._sympy_()
+    except AttributeError:
+        return sympify(expr)
+
+
+def dims_to_sympy(dims):
+    """
+    Converts a dimension power vector to the equivalent sympy expression
+    (used in error messages)
+    """
+    if dims == BOOLEAN:
+        return sympy.Integer(0)
+    return reduce(operator.mul,
+                  (sympy.Symbol(s) ** p
+                   for s, p in zip(Dimension.dimension_symbols, dims)))
+
+
 class ComponentClassInterfaceInferer(BaseVisitor):
 
     """ Used to infer output |EventPorts|, |StateVariables| & |Parameters|."""
@@ -156,7 +212,7 @@ class ComponentDimensionResolver(BaseVisitorWithContext):
     Used to calculate the unit dimension of elements within a component class
     """
 
-    reserved_symbol_dims = {sympy.Symbol('t'): sympy.Symbol('t')}
+    reserved_symbol_dims = {sympy.Symbol('t'): tuple(un.time)}
 
     def __init__(self, component_class):
         super(ComponentDimensionResolver, self).__init__()
@@ -165,9 +221,13 @@ class ComponentDimensionResolver(BaseVisitorWithContext):
         # Insert declared dimensions into dimensionality database
         for a in component_class.attributes_with_dimension:
             if not isinstance(a, SendPortBase):
-                self._dims[sympify(a)] = sympify(a.dimension)
+                self._dims[to_sympy(a)] = tuple(a.dimension)
         for a in component_class.attributes_with_units:
-            self._dims[sympify(a)] = sympify(a.units.dimension)
+            self._dims[to_sympy(a)] = tuple(a.units.dimension)
+        # Dimensions returned by 'dimension_of' for element names
+        self._named_dimensions = {}
+        # Used to check whether the resolved dimensions are still valid
+        self.mutation_stamp = component_class._mutation_stamp
         self.visit(component_class)
 
     @property
@@ -176,12 +236,26 @@ class ComponentDimensionResolver(BaseVisitorWithContext):
 
     def dimension_of(self, element):
         if isinstance(element, basestring):
-            element = self.component_class.element(
-                element, child_types=self.base_nineml_children)
-        return Dimension.from_sympy(self._flatten(element))
+            try:
+                return self._named_dimensions[element]
+            except KeyError:
+                name = element
+                element = self.component_class.element(
+                    name, child_types=self.base_nineml_children)
+        else:
+            name = None
+        dims = self._flatten(element)
+        if dims == BOOLEAN:
+            raise NineMLUsageError(
+                "Cannot determine the dimension of boolean expression '{}'"
+                .format(element))
+        dimension = Dimension.from_powers(dims)
+        if name is not None:
+            self._named_dimensions[name] = dimension
+        return dimension
 
     def _flatten(self, expr, **kwargs):  # @UnusedVariable
-        expr = sympify(expr)
+        expr = to_sympy(expr)
         if expr in self.reserved_symbol_dims:
             flattened = self._flatten_reserved(expr, **kwargs)
         elif isinstance(expr, sympy.Symbol):
@@ -210,10 +284,12 @@ class ComponentDimensionResolver(BaseVisitorWithContext):
     def find_element(self, sym):
         name = Expression.symbol_to_str(sym)
         element = None
-        for context in reversed(self.contexts):
+        # Elements in outer scopes take precedence
+        for context in self.contexts:
             try:
                 element = context.parent.element(
                     name, child_types=context.parent_cls.nineml_children)
+                break
             except KeyError:
                 pass
         if element is None:
@@ -232,25 +308,22 @@ class ComponentDimensionResolver(BaseVisitorWithContext):
         return flattened
 
     def _flatten_boolean(self, expr, **kwargs):  # @UnusedVariable
-        return 0
+        return BOOLEAN
 
     def _flatten_constant(self, expr, **kwargs):  # @UnusedVariable
-        return 1
+        return DIMENSIONLESS
 
     def _flatten_function(self, expr, **kwargs):  # @UnusedVariable
-        return 1
+        return DIMENSIONLESS
 
     def _flatten_matching(self, expr, **kwargs):  # @UnusedVariable
         return self._flatten(expr.args[0])
 
     def _flatten_multiplied(self, expr, **kwargs):  # @UnusedVariable
-        flattened = reduce(operator.mul, (self._flatten(a) for a in expr.args))
-        if isinstance(flattened, sympy.Basic):
-            flattened = flattened.powsimp()  # Simplify the expression
-        return flattened
+        return reduce(multiply_dims, (self._flatten(a) for a in expr.args))
 
     def _flatten_power(self, expr, **kwargs):  # @UnusedVariable
-        return (self._flatten(expr.args[0]) ** expr.args[1])
+        return power_dims(self._flatten(expr.args[0]), expr.args[1])
 
     def _flatten_reserved(self, expr, **kwargs):  # @UnusedVariable
         return self.reserved_symbol_dims[expr]
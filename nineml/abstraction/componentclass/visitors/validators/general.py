@@ -9,26 +9,30 @@ from nineml.exceptions import NineMLUsageError, NineMLDimensionError
 from nineml.abstraction.expressions.utils import is_valid_lhs_target
 from nineml.abstraction.expressions import reserved_identifiers, Expression
 from nineml.base import BaseNineMLObject
-import operator
 import sympy
 from sympy import sympify
 from nineml.base import SendPortBase
 from sympy.logic.boolalg import BooleanTrue, BooleanFalse
 from nineml.visitors import BaseVisitor, BaseVisitorWithContext
+from nineml.visitors.validators import BaseValidator
+from nineml.abstraction.componentclass.visitors.queriers import (
+    DIMENSIONLESS, BOOLEAN, multiply_dims, power_dims, dims_to_sympy)
+import nineml.units as un
 from functools import reduce
 
 
-class AliasesAreNotRecursiveComponentValidator(BaseVisitor):
+class AliasesAreNotRecursiveComponentValidator(BaseValidator, BaseVisitor):
 
     """Check that aliases are not self-referential"""
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseVisitor.__init__(self)
-        self.visit(component_class)
-
-    def action_componentclass(self, component_class, **kwargs):  # @UnusedVariable @IgnorePep8
+        self.component_class = component_class
+        self._validate(component_class, defer)
 
-        unresolved_aliases = dict((a.lhs, a) for a in component_class.aliases)
+    def finalise(self):
+        unresolved_aliases = dict((a.lhs, a)
+                                  for a in self.component_class.aliases)
 
         def alias_contains_unresolved_symbols(alias):
             unresolved = [sym for sym in alias.rhs_symbol_names
@@ -55,13 +59,13 @@ class AliasesAreNotRecursiveComponentValidator(BaseVisitor):
         pass
 
 
-class NoUnresolvedSymbolsComponentValidator(BaseVisitor):
+class NoUnresolvedSymbolsComponentValidator(BaseValidator, BaseVisitor):
     """
     Check that aliases and timederivatives are defined in terms of other
     parameters, aliases, statevariables and ports
     """
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable @IgnorePep8
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseVisitor.__init__(self)
 
         self.available_symbols = []
@@ -69,8 +73,9 @@ class NoUnresolvedSymbolsComponentValidator(BaseVisitor):
         self.time_derivatives = []
         self.state_assignments = []
         self.component_class = component_class
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
+    def finalise(self):
         # Check Aliases:
         for alias in self.aliases:
             for rhs_atom in alias.rhs_symbol_names:
@@ -121,17 +126,16 @@ class NoUnresolvedSymbolsComponentValidator(BaseVisitor):
 
 
 class CheckNoLHSAssignmentsToMathsNamespaceComponentValidator(
-        BaseVisitor):
+        BaseValidator, BaseVisitor):
 
     """
     This class checks that there is not a mathematical symbols, (e.g. pi, e)
     on the left-hand-side of an equation
     """
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseVisitor.__init__(self)
-
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
     def check_lhssymbol_is_valid(self, symbol):
         assert isinstance(symbol, basestring)
@@ -153,72 +157,81 @@ class CheckNoLHSAssignmentsToMathsNamespaceComponentValidator(
         pass
 
 
-class DimensionalityComponentValidator(BaseVisitorWithContext):
+class DimensionalityComponentValidator(BaseValidator,
+                                       BaseVisitorWithContext):
 
     _RECURSION_MAX = 450
+    _TIME = tuple(un.time)
 
-    class DeclaredDimensionsVisitor(BaseVisitor):
-        """
-        Inserts declared dimensions into dimensionality dictionary
-        before inferring dimensions from derived expressions
-        """
-
-        def __init__(self, component_class, as_class, **kwargs):
-            BaseVisitor.__init__(self)
-            self._dimensions = {}
-            self.as_class = as_class
-            self.visit(component_class, **kwargs)
-
-        def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
-            if not isinstance(obj, SendPortBase):
-                try:
-                    self._dimensions[obj.id] = sympify(obj.dimension)
-                except AttributeError:
-                    # If element doesn't have dimension attribute
-                    try:
-                        self._dimensions[obj.id] = sympify(obj.units.dimension)
-                    except AttributeError:
-                        pass  # If element doesn't have units attribute
-
-        @property
-        def dimensions(self):
-            return self._dimensions
-
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable @IgnorePep8
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseVisitorWithContext.__init__(self)
         self.component_class = component_class
-        self._dimensions = self.DeclaredDimensionsVisitor(
-            component_class, self.as_class, **kwargs).dimensions
+        # Dimensions of the elements, either declared or derived from their
+        # expressions, keyed by element ID
+        self._dimensions = {}
         self._recursion_count = 0
-        self.visit(component_class)
+        # Elements referenced by each symbol in the scopes they are looked up
+        # in, as looking them up in each scope is relatively expensive
+        self._scoped_elements = {}
+        self._validate(component_class, defer)
+
+    @classmethod
+    def _declared_dimensions(cls, element):
+        """
+        Returns the dimensions declared by the element (via its 'dimension' or
+        'units' attributes) or None if it doesn't declare them (the dimensions
+        of send ports are derived from the elements they are attached to)
+        """
+        if isinstance(element, SendPortBase):
+            return None
+        try:
+            return tuple(element.dimension)
+        except AttributeError:
+            try:
+                return tuple(element.units.dimension)
+            except AttributeError:
+                return None
 
     def _get_dimensions(self, element):
         if isinstance(element, (sympy.Symbol, basestring)):
             if element == sympy.Symbol('t'):  # Reserved symbol 't'
-                return sympy.Symbol('t')  # representation of the time dim.
+                return self._TIME  # representation of the time dim.
             name = Expression.symbol_to_str(element)
-            # Look back through the scope stack to find the referenced
-            # element
-            element = None
-            for context in reversed(self.contexts):
-                try:
-                    element = context.parent.element(
-                        name, child_types=context.parent_cls.nineml_children)
-                except KeyError:
-                    pass
-            if element is None:
-                raise NineMLUsageError(
-                    "Did not find '{}' in '{}' dynamics class (scopes: {})"
-                    .format(name, self.component_class.name,
-                            list(reversed([c.parent for c in self.contexts]))))
+            scope_key = (name,) + tuple(id(c.parent) for c in self.contexts)
+            try:
+                element = self._scoped_elements[scope_key]
+            except KeyError:
+                # Look through the scope stack to find the referenced
+                # element, where elements in outer scopes take precedence
+                element = None
+                for context in self.contexts:
+                    try:
+                        element = context.parent.element(
+                            name,
+                            child_types=context.parent_cls.nineml_children)
+                        break
+                    except KeyError:
+                        pass
+                if element is None:
+                    raise NineMLUsageError(
+                        "Did not find '{}' in '{}' dynamics class (scopes: {})"
+                        .format(name, self.component_class.name,
+                                list(reversed([c.parent
+                                               for c in self.contexts]))))
+                self._scoped_elements[scope_key] = element
         try:
             expr = element.rhs
         except AttributeError:  # for basic sympy expressions
             expr = element
         try:
             dims = self._dimensions[element.id]
+        except (KeyError, AttributeError):
+            dims = self._declared_dimensions(element)
+            if dims is not None:
+                self._dimensions[element.id] = dims
+        if dims is not None:
             self._recursion_count = 0
-        except (KeyError, AttributeError):  # for derived dimensions
+        else:  # for derived dimensions
             if self._recursion_count > self._RECURSION_MAX:
                 assert False, (
                     "'{}' is not defined.\nDefined symbols:\n{}"
@@ -237,72 +250,71 @@ class DimensionalityComponentValidator(BaseVisitorWithContext):
 
     def _flatten_dims(self, expr, element):
         if isinstance(expr, (sympy.Integer, sympy.Float, int, float)):
-            dims = 1
+            dims = DIMENSIONLESS
         elif isinstance(expr, (BooleanTrue, BooleanFalse)):
-            dims = 0
+            dims = BOOLEAN
         elif isinstance(expr, sympy.Symbol):
             dims = self._get_dimensions(expr)
         elif isinstance(expr, sympy.Mul):
-            dims = reduce(operator.mul,
+            dims = reduce(multiply_dims,
                           (self._flatten_dims(a, element) for a in expr.args))
-            if isinstance(dims, sympy.Basic):
-                dims = dims.powsimp()
         elif isinstance(expr, sympy.Pow):
             base = expr.args[0]
             exponent = expr.args[1]
             exp_dims = self._flatten_dims(exponent, element)
-            if exp_dims != 1:
+            if exp_dims != DIMENSIONLESS:
                 raise NineMLDimensionError(self._construct_error_message(
                     "Exponents are required to be dimensionless arguments,"
                     " which was not the case in", exp_dims, expr, element))
             base_dims = self._flatten_dims(base, element)
-            if base_dims != 1:
+            if base_dims != DIMENSIONLESS:
                 if not isinstance(exponent, (sympy.Integer, int,
                                              sympy.numbers.NegativeOne)):
                     raise NineMLDimensionError(self._construct_error_message(
                         "Integer exponents are required for non-dimensionless "
                         "bases, which was not the case in", exp_dims, expr,
                         element))
-            dims = (self._flatten_dims(base, element) ** exponent)
+            dims = power_dims(base_dims, exponent)
         elif isinstance(expr, sympy.Add):
             dims = None
             for arg in expr.args:
                 arg_dims = self._flatten_dims(arg, element)
                 if dims is None:
                     dims = arg_dims
-                elif arg_dims - dims != 0:
+                elif arg_dims != dims:
                     raise NineMLDimensionError(self._construct_error_message(
                         "Dimensions do not match within",
-                        ' + '.join(str(self._flatten_dims(a, element))
-                                   for a in expr.args), expr, element))
+                        ' + '.join(
+                            str(dims_to_sympy(self._flatten_dims(a, element)))
+                            for a in expr.args), expr, element))
         elif isinstance(expr, (sympy.GreaterThan, sympy.LessThan,
                                sympy.StrictGreaterThan, sympy.StrictLessThan)):
             lhs_dims = self._flatten_dims(expr.args[0], element)
             rhs_dims = self._flatten_dims(expr.args[1], element)
-            if lhs_dims - rhs_dims != 0:
+            if lhs_dims != rhs_dims:
                 raise NineMLDimensionError(self._construct_error_message(
                     "LHS/RHS dimensions of boolean expression",
-                    lhs_dims - rhs_dims, expr, postamble="do not match"))
-            dims = 0  # boolean expression
+                    dims_to_sympy(lhs_dims) - dims_to_sympy(rhs_dims), expr,
+                    postamble="do not match"))
+            dims = BOOLEAN
         elif isinstance(expr, (sympy.And, sympy.Or, sympy.Not)):
             for arg in expr.args:
                 dims = self._flatten_dims(arg, element)
-                # boolean expression == 0
-                if dims != 0 and dims != 1:  # FIXME: allow dimless until bool params @IgnorePep8
+                if dims != BOOLEAN and dims != DIMENSIONLESS:  # FIXME: allow dimless until bool params @IgnorePep8
                     raise NineMLDimensionError(self._construct_error_message(
                         "Logical expression provided non-boolean argument '{}'"
                         .format(arg), dims, expr))
         elif isinstance(type(expr), sympy.FunctionClass):
             for arg in expr.args:
                 arg_dims = self._flatten_dims(arg, element)
-                if arg_dims != 1:
+                if arg_dims != DIMENSIONLESS:
                     raise NineMLDimensionError(self._construct_error_message(
                         "Dimensionless arguments required for function",
                         arg_dims, element=element, expr=arg))
-            dims = 1
+            dims = DIMENSIONLESS
         elif (type(expr).__name__ in ('Pi',) or
               isinstance(expr, sympy.Rational)):
-            dims = 1
+            dims = DIMENSIONLESS
         elif isinstance(element, BaseNineMLObject):
             assert False, ("{} was not added to pre-determined dimensions"
                            .format(element))
@@ -313,7 +325,7 @@ class DimensionalityComponentValidator(BaseVisitorWithContext):
         return dims
 
     def _compare_dimensionality(self, dimension, reference, element, ref_name):
-        if dimension - sympify(reference) != 0:
+        if dimension != tuple(reference):
             raise NineMLDimensionError(self._construct_error_message(
                 "Dimension of", dimension, element=element,
                 postamble=(" match that declared for '{}', {} ('{}')".format(
@@ -347,6 +359,8 @@ class DimensionalityComponentValidator(BaseVisitorWithContext):
                 symbols = []
         else:
             symbols = expr.free_symbols
+        if not isinstance(dimension, (sympy.Basic, basestring)):
+            dimension = dims_to_sympy(dimension)
         msg = preamble
         if element is None:
             msg += ' expression'
@@ -356,7 +370,8 @@ class DimensionalityComponentValidator(BaseVisitorWithContext):
                 self.component_class.name)
         msg += ", {} [{}, with {}], ".format(
             dimension, expr, ', '.join(
-                '{}={}'.format(a, self._get_dimensions(a)) for a in symbols))
+                '{}={}'.format(a, dims_to_sympy(self._get_dimensions(a)))
+                for a in symbols))
         if postamble is not None:
             msg += postamble
         return msg
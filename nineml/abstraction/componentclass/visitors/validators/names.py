@@ -7,11 +7,12 @@ docstring needed
 
 from nineml.exceptions import NineMLUsageError
 from nineml.visitors import BaseVisitor
+from nineml.visitors.validators import BaseValidator
 
 
 # Check that the sub-components stored are all of the
 # right types:
-class LocalNameConflictsComponentValidator(BaseVisitor):
+class LocalNameConflictsComponentValidator(BaseValidator, BaseVisitor):
 
     """
     Check for conflicts between Aliases, StateVariables, Parameters, and
@@ -21,11 +22,11 @@ class LocalNameConflictsComponentValidator(BaseVisitor):
     will use names.
     """
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseVisitor.__init__(self)
         self.symbols = []
         self.component_class = component_class
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
     def check_conflicting_symbol(self, symbol):
         symbol = symbol.lower()
@@ -53,12 +54,12 @@ class LocalNameConflictsComponentValidator(BaseVisitor):
         pass
 
 
-class DimensionNameConflictsComponentValidator(BaseVisitor):
+class DimensionNameConflictsComponentValidator(BaseValidator, BaseVisitor):
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseVisitor.__init__(self)
         self.dimensions = {}
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
     def check_conflicting_dimension(self, dimension):
         try:
@@ -8,14 +8,15 @@ docstring needed
 from ...base import Parameter
 from nineml.abstraction.expressions import Alias, Constant
 from nineml.visitors import BaseVisitor
+from nineml.visitors.validators import BaseValidator
 from nineml.units import Dimension, Unit
 
 
-class TypesComponentValidator(BaseVisitor):
+class TypesComponentValidator(BaseValidator, BaseVisitor):
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseVisitor.__init__(self)
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
     def action_parameter(self, parameter, **kwargs):  # @UnusedVariable
         assert isinstance(parameter, Parameter), \
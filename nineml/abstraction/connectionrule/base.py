@@ -50,12 +50,15 @@ class ConnectionRule(ComponentClass):
 
     def rename_symbol(self, old_symbol, new_symbol):
         ConnectionRuleRenameSymbol(self, old_symbol, new_symbol)
+        self._mutated()
 
     def required_for(self, expressions):
         return ConnectionRuleRequiredDefinitions(self, expressions)
 
     def dimension_of(self, element):
-        if self._dimension_resolver is None:
+        if (self._dimension_resolver is None or
+                (self._dimension_resolver.mutation_stamp !=
+                 self._mutation_stamp)):
             self._dimension_resolver = ConnectionRuleDimensionResolver(self)
         return self._dimension_resolver.dimension_of(element)
 
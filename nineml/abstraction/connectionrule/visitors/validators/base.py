@@ -6,7 +6,9 @@ This file contains the ConnectionRuleValidator class for validating component
 """
 
 from builtins import object
-from nineml.visitors.validators import NoDuplicatedObjectsValidator
+from nineml.visitors.validators import (
+    FusedValidator, NoDuplicatedObjectsValidator)
+from ...base import ConnectionRule
 from .general import (
     AliasesAreNotRecursiveConnectionRuleValidator,
     NoUnresolvedSymbolsConnectionRuleValidator,
@@ -29,8 +31,9 @@ class ConnectionRuleValidator(object):
         internal structure
         """
         # Check class structure:
-        TypesConnectionRuleValidator(component_class, **kwargs)
-        NoDuplicatedObjectsValidator(component_class, **kwargs)
+        FusedValidator(component_class, [TypesConnectionRuleValidator,
+                                         NoDuplicatedObjectsValidator],
+                       as_class=ConnectionRule, **kwargs)
 #         LocalNameConflictsConnectionRuleValidator(component_class, **kwargs)
 #         DimensionNameConflictsConnectionRuleValidator(component_class,
 #                                                       **kwargs)
@@ -193,6 +193,7 @@ class Dynamics(ComponentClass, DynamicPortsObject):
 
     def rename_symbol(self, old_symbol, new_symbol):
         DynamicsRenameSymbol(self, old_symbol, new_symbol)
+        self._mutated()
 
     def required_for(self, expressions):
         return DynamicsRequiredDefinitions(self, expressions)
@@ -201,10 +202,26 @@ class Dynamics(ComponentClass, DynamicPortsObject):
         return self.clone(name=name, **kwargs)
 
     def dimension_of(self, element):
-        if self._dimension_resolver is None:
+        if (self._dimension_resolver is None or
+                (self._dimension_resolver.mutation_stamp !=
+                 self._mutation_stamp)):
             self._dimension_resolver = DynamicsDimensionResolver(self)
         return self._dimension_resolver.dimension_of(element)
 
+    def generate_code(self):
+        """
+        Generates a C function and a vectorized NumPy kernel for each regime,
+        which evaluate all of its time derivatives, aliases, triggers and
+        state assignments with their common subexpressions hoisted into
+        temporaries (see DynamicsCodeGenerator)
+
+        Returns
+        -------
+        code : OrderedDict[str, RegimeCode]
+            The code generated for each regime, keyed by regime name
+        """
+        return DynamicsCodeGenerator().generate(self)
+
     def substitute_aliases(self):
         """
         Returns a equivalent Dynamics class with all references to aliases with
@@ -540,3 +557,4 @@ from .visitors.queriers import (DynamicsRequiredDefinitions,  # @IgnorePep8
                                 DynamicsInterfaceInferer)
 from .visitors.modifiers import (  # @IgnorePep8
     DynamicsRenameSymbol, DynamicsSubstituteAliases)
+from .codegen import DynamicsCodeGenerator  # @IgnorePep8
@@ -0,0 +1,314 @@
+"""
+Generates a C function and a vectorized NumPy kernel for each regime of a
+Dynamics class, which evaluate all of its time derivatives, aliases, triggers
+and state assignments together so that common subexpressions are only
+evaluated once
+
+:copyright: Copyright 2010-2017 by the NineML Python team, see AUTHORS.
+:license: BSD-3, see LICENSE for details.
+"""
+from __future__ import division
+from builtins import next
+from collections import namedtuple, OrderedDict
+from itertools import chain, count
+import numpy
+import sympy
+from sympy.core.relational import Relational
+from sympy.logic.boolalg import BooleanFunction, BooleanAtom
+from sympy.printing.lambdarepr import NumPyPrinter
+from sympy.utilities.lambdify import NUMPY_TRANSLATIONS
+from nineml.exceptions import NineMLUsageError, NineMLNameError
+from ..expressions import Expression
+from ..expressions.parser import Parser, _ParseCache
+from ..expressions.utils import compiled_expression_namespace
+
+
+# The code generated for a regime. 'inputs' and 'outputs' are the names of the
+# arguments and results of the C function and NumPy kernel, the latter
+# returning a tuple of the outputs in the same order
+RegimeCode = namedtuple('RegimeCode', ('regime_name function_name inputs '
+                                       'outputs c_code numpy_code '
+                                       'numpy_kernel'))
+
+
+def _broadcast_shape(*args):
+    "The shape of the sample to draw from inline random distributions"
+    arrays = [a for a in args if numpy.ndim(a)]
+    return numpy.broadcast(*arrays).shape if arrays else None
+
+
+# Namespace the NumPy kernels are executed in
+_numpy_namespace = dict(
+    chain(((n, getattr(numpy, n)) for n in dir(numpy)
+           if not n.startswith('_')),
+          ((s, getattr(numpy, n)) for s, n in NUMPY_TRANSLATIONS.items()
+           if hasattr(numpy, n)),
+          compiled_expression_namespace.items(),
+          [('Abs', numpy.abs), ('_broadcast_shape', _broadcast_shape)]))
+
+
+class DynamicsCodeGenerator(object):
+    """
+    Generates a C function and a vectorized NumPy kernel for each regime of a
+    Dynamics class.
+
+    All the time derivatives (of every state variable, zero if it doesn't
+    have one in the regime), aliases (with those in the regime overriding
+    those of the class), triggers and state assignments of the regime are
+    collected, aliases and constants are substituted into them and the
+    common subexpressions across all of them are hoisted into temporaries.
+    The outputs are named:
+
+        d<state-variable>_dt                     time derivatives
+        <alias-name>                             aliases
+        trigger<i>                               triggers
+        oncondition<i>_<state-variable>          state assignments
+        onevent_<port-name>_<state-variable>     state assignments
+
+    where <i> is the index of the on-condition in the regime (sorted by
+    trigger). State assignments are evaluated from the values of the state
+    variables before the transition regardless of whether it is triggered.
+    Constants are inlined using their values in their declared units.
+    NumPy kernels of regimes that contain inline random distributions take
+    an optional '_rng' argument, the NumPy random generator to draw from
+    (the global NumPy random state is used if it isn't given).
+
+    Generated code is cached by the structural hash of the Dynamics class in a
+    process-wide cache (see 'configure_cache') along with a clone of the
+    class, which is checked to be equal to the class the code is requested
+    for before the cached code is returned.
+    """
+
+    DEFAULT_CACHE_SIZE = 1000
+    _cache = _ParseCache(DEFAULT_CACHE_SIZE)
+    _random_funcs = tuple(Parser.inline_random_distributions())
+
+    def generate(self, component_class):
+        """
+        Generates the code for each regime of the component class
+
+        Parameters
+        ----------
+        component_class : Dynamics
+            The Dynamics class to generate the code for. Classes that are not
+            flat (i.e. MultiDynamics) are flattened first
+
+        Returns
+        -------
+        code : OrderedDict[str, RegimeCode]
+            The code generated for each regime, keyed by regime name
+        """
+        key = hash(component_class)
+        cached = self._cache.get(key)
+        # The class the code was generated from is cached with it to guard
+        # against hash collisions between different classes
+        if cached is not None and cached[0].equals(component_class):
+            code = cached[1]
+        else:
+            # A clone is cached so later modifications of the class can't
+            # make it appear equal to classes the code doesn't match
+            cached_class = component_class.clone(validate=False)
+            if not component_class.is_flat():
+                component_class = component_class.flatten()
+            code = OrderedDict(
+                (r.name, self._generate_regime(component_class, r))
+                for r in sorted(component_class.regimes,
+                                key=lambda r: r.name))
+            self._cache.put(key, (cached_class, code))
+        return OrderedDict(code)
+
+    @classmethod
+    def configure_cache(cls, max_size=DEFAULT_CACHE_SIZE):
+        """
+        Sets the maximum number of Dynamics classes the generated code is
+        cached for. Set to 0 to disable the cache
+        """
+        cls._cache.resize(max_size)
+
+    @classmethod
+    def cache_info(cls):
+        "Returns the hits, misses, maximum size and current size of the cache"
+        return cls._cache.info()
+
+    @classmethod
+    def clear_cache(cls):
+        "Empties the cache of generated code and resets its statistics"
+        cls._cache.clear()
+
+    def _generate_regime(self, component_class, regime):
+        outputs = self._collect_outputs(component_class, regime)
+        names = list(outputs.keys())
+        exprs = [sympy.sympify(e) for e in outputs.values()]
+        inputs = sorted(set(str(s) for s in chain.from_iterable(
+            e.free_symbols for e in exprs)))
+        clashes = set(inputs) & set(names)
+        if clashes:
+            raise NineMLUsageError(
+                "Cannot generate code for '{}' regime of '{}' as the names "
+                "of outputs clash with those of inputs ('{}')".format(
+                    regime.name, component_class.name,
+                    "', '".join(sorted(clashes))))
+        reserved = set(chain(inputs, names))
+        # Each inline random distribution is drawn separately so they are
+        # replaced by their own symbols before eliminating the common
+        # subexpressions (which would otherwise merge identical draws)
+        draw_symbols = self._symbols('random', reserved)
+        draws = []
+        exprs = [self._isolate_randoms(e, draws, draw_symbols) for e in exprs]
+        temps, exprs = sympy.cse(exprs,
+                                 symbols=self._symbols('tmp', reserved))
+        function_name = '{}_{}'.format(component_class.name, regime.name)
+        c_code = self._c_function(
+            component_class, regime, function_name, inputs, names,
+            draws + temps, exprs)
+        numpy_code = self._numpy_function(function_name, inputs, draws,
+                                          temps, exprs)
+        namespace = dict(_numpy_namespace)
+        exec(compile(numpy_code, '<{}>'.format(function_name), 'exec'),
+             namespace)
+        return RegimeCode(regime.name, function_name, tuple(inputs),
+                          tuple(names), c_code, numpy_code,
+                          namespace[function_name])
+
+    @classmethod
+    def _collect_outputs(cls, component_class, regime):
+        aliases = OrderedDict(
+            (a.name, a.rhs) for a in sorted(
+                chain(component_class.aliases, regime.aliases),
+                key=lambda a: a.name))
+        # Regime aliases override those of the component class
+        aliases.update((a.name, a.rhs) for a in regime.aliases)
+        substitutions = dict(
+            (sympy.Symbol(c.name), sympy.sympify(c.value))
+            for c in component_class.constants)
+        resolved = {}
+
+        def substitute(expr):
+            expr = sympy.sympify(expr)
+            for symbol in expr.free_symbols:
+                name = str(symbol)
+                if name in aliases and symbol not in substitutions:
+                    if name not in resolved:
+                        resolved[name] = substitute(aliases[name])
+                    substitutions[symbol] = resolved[name]
+            return expr.xreplace(substitutions)
+
+        outputs = OrderedDict()
+        for sv_name in sorted(component_class.state_variable_names):
+            try:
+                rhs = regime.time_derivative(sv_name).rhs
+            except NineMLNameError:
+                rhs = 0
+            outputs['d{}_dt'.format(sv_name)] = substitute(rhs)
+        for name in aliases:
+            outputs[name] = substitute(sympy.Symbol(name))
+        on_conditions = sorted(regime.on_conditions,
+                               key=lambda oc: oc.sort_key)
+        for i, on_condition in enumerate(on_conditions):
+            outputs['trigger{}'.format(i)] = substitute(
+                on_condition.trigger.rhs)
+        for i, on_condition in enumerate(on_conditions):
+            cls._collect_assignments(outputs, 'oncondition{}'.format(i),
+                                     on_condition, substitute)
+        for on_event in sorted(regime.on_events,
+                               key=lambda oe: oe.src_port_name):
+            cls._collect_assignments(
+                outputs, 'onevent_{}'.format(on_event.src_port_name),
+                on_event, substitute)
+        return outputs
+
+    @classmethod
+    def _collect_assignments(cls, outputs, prefix, transition, substitute):
+        for assignment in sorted(transition.state_assignments,
+                                 key=lambda sa: sa.lhs):
+            outputs['{}_{}'.format(prefix, assignment.lhs)] = substitute(
+                assignment.rhs)
+
+    @classmethod
+    def _isolate_randoms(cls, expr, draws, draw_symbols):
+        if type(expr) in cls._random_funcs:
+            symbol = next(draw_symbols)
+            draws.append((symbol, expr))
+            return symbol
+        if not expr.args:
+            return expr
+        return expr.func(*(cls._isolate_randoms(a, draws, draw_symbols)
+                           for a in expr.args))
+
+    @classmethod
+    def _symbols(cls, prefix, reserved):
+        "Generates symbols for temporaries that don't clash with other names"
+        for i in count():
+            name = '{}{}'.format(prefix, i)
+            if name not in reserved:
+                yield sympy.Symbol(name)
+
+    @classmethod
+    def _c_function(cls, component_class, regime, function_name, inputs,
+                    names, temps, exprs):
+        # Temporaries that hold the values of boolean subexpressions
+        booleans = set(s for s, e in temps if cls._is_boolean(e, ()))
+        args = ['double {}'.format(i) for i in inputs]
+        args.extend('{} *{}'.format(cls._c_type(e, booleans), n)
+                    for n, e in zip(names, exprs))
+        lines = ["/* Generated from the '{}' regime of '{}' */".format(
+            regime.name, component_class.name)]
+        lines.append('void {}({})'.format(function_name, ', '.join(args)))
+        lines.append('{')
+        lines.extend('    const {} {} = {};'.format(
+            cls._c_type(e, booleans), s, cls._c_expr(e)) for s, e in temps)
+        lines.extend('    *{} = {};'.format(n, cls._c_expr(e))
+                     for n, e in zip(names, exprs))
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def _is_boolean(cls, expr, booleans):
+        # NB: sympy symbols are also instances of sympy's Boolean class
+        return (isinstance(expr, (Relational, BooleanFunction, BooleanAtom)) or
+                expr in booleans)
+
+    @classmethod
+    def _c_type(cls, expr, booleans):
+        return 'int' if cls._is_boolean(expr, booleans) else 'double'
+
+    @classmethod
+    def _c_expr(cls, expr):
+        cstr = Expression._print_c(expr)
+        cstr = Expression._ccode_print_warn_re.sub('', cstr)
+        return Expression._multiple_whitespace_re.sub(' ', cstr)
+
+    @classmethod
+    def _numpy_function(cls, function_name, inputs, draws, temps, exprs):
+        printer = NumPyPrinter()
+        if draws:
+            # Samples are drawn from the generator passed as '_rng', or from
+            # the global NumPy random state if it isn't given
+            lines = ['def {}({}):'.format(
+                function_name, ', '.join(inputs + ['_rng=None']))]
+            lines.append('    _size = _broadcast_shape({})'.format(
+                ', '.join(inputs)))
+        else:
+            lines = ['def {}({}):'.format(function_name, ', '.join(inputs))]
+        lines.extend(
+            '    {} = {}({}_size, _rng)'.format(
+                s, e.func, ''.join(printer.doprint(a) + ', '
+                                   for a in e.args))
+            for s, e in draws)
+        lines.extend('    {} = {}'.format(s, printer.doprint(
+            cls._elementwise(e))) for s, e in temps)
+        lines.append('    return ({},)'.format(', '.join(
+            printer.doprint(cls._elementwise(e)) for e in exprs)))
+        return '\n'.join(lines) + '\n'
+
+    @classmethod
+    def _elementwise(cls, expr):
+        # Min and Max are otherwise printed as numpy.amin/amax, which reduce
+        # over the elements of array arguments
+        if isinstance(expr, sympy.Basic):
+            expr = expr.replace(
+                lambda e: isinstance(e, (sympy.Min, sympy.Max)),
+                lambda e: sympy.Function(
+                    'minimum_' if isinstance(e, sympy.Min) else 'maximum_')(
+                        *e.args))
+        return expr
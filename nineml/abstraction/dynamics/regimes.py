@@ -53,6 +53,7 @@ class StateVariable(BaseALObject):
 
     def set_dimension(self, dimension):
         self._dimension = dimension
+        self._mutated()
 
     def __repr__(self):
         return ("StateVariable({}{})"
@@ -393,7 +393,12 @@ class Trigger(BaseALObject, Expression):
     def __init__(self, rhs):
         BaseALObject.__init__(self)
         Expression.__init__(self, rhs)
-        self._rhs = self._make_strict(self.rhs)
+        # Triggers are keyed by their sympy expressions so they are parsed
+        # straight away. The source string is only retained if it parses to
+        # the strict form
+        strict = self._make_strict(self.rhs)
+        if strict != self.rhs:
+            self._rhs = strict
 
     def __repr__(self):
         return "Trigger('%s')" % (self.rhs)
@@ -498,6 +503,7 @@ class OnCondition(Transition):
         if isinstance(trigger, Trigger):
             trigger = trigger.rhs
         self._trigger = Trigger(rhs=trigger)
+        self._trigger._parent = self
         Transition.__init__(self, state_assignments=state_assignments,
                             output_events=output_events,
                             target_regime_name=target_regime_name)
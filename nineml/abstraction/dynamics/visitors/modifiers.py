@@ -24,6 +24,7 @@ class DynamicsRenameSymbol(ComponentRenameSymbol,
     def action_regime(self, regime, **kwargs):  # @UnusedVariable @IgnorePep8
         if regime.name == self.old_symbol_name:
             regime._name = self.new_symbol_name
+            regime._mutated()
         regime._update_member_key(
             self.old_symbol_name, self.new_symbol_name)
         # Update the on condition trigger keys, which can't be updated via
@@ -35,6 +36,7 @@ class DynamicsRenameSymbol(ComponentRenameSymbol,
                      sympy.Symbol(self.new_symbol_name)})
                 regime._on_conditions[new_trigger] = (regime._on_conditions.
                                                       pop(trigger))
+                regime._mutated()
 
     def action_statevariable(self, state_variable, **kwargs):  # @UnusedVariable @IgnorePep8
         if state_variable.name == self.old_symbol_name:
@@ -82,6 +84,7 @@ class DynamicsRenameSymbol(ComponentRenameSymbol,
     def action_oncondition(self, on_condition, **kwargs):  # @UnusedVariable
         if on_condition._target_regime == self.old_symbol_name:
             on_condition._target_regime = self.new_symbol_name
+            on_condition._mutated()
         on_condition._update_member_key(
             self.old_symbol_name, self.new_symbol_name)
 
@@ -91,6 +94,7 @@ class DynamicsRenameSymbol(ComponentRenameSymbol,
             self.note_rhs_changed(on_event)
         if on_event._target_regime.name == self.old_symbol_name:
             on_event._target_regime._name = self.new_symbol_name
+            on_event._mutated()
         on_event._update_member_key(
             self.old_symbol_name, self.new_symbol_name)
 
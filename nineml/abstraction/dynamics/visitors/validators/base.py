@@ -5,7 +5,9 @@ This file contains the DynamicsValidator class for validating component
 :license: BSD-3, see LICENSE for details.
 """
 from builtins import object
-from nineml.visitors.validators import NoDuplicatedObjectsValidator
+from nineml.visitors.validators import (
+    FusedValidator, NoDuplicatedObjectsValidator)
+from ...base import Dynamics
 from .general import (
     TimeDerivativesAreDeclaredDynamicsValidator,
     StateAssignmentsAreOnStateVariablesDynamicsValidator,
@@ -18,8 +20,7 @@ from .general import (
 from .names import (
     LocalNameConflictsDynamicsValidator,
     DimensionNameConflictsDynamicsValidator,
-    DuplicateRegimeNamesDynamicsValidator,
-    RegimeAliasMatchesBaseScopeValidator)
+    DuplicateRegimeNamesDynamicsValidator)
 from .ports import (
     EventPortsDynamicsValidator, OutputAnalogPortsDynamicsValidator)
 from .types import (
@@ -30,31 +31,38 @@ class DynamicsValidator(object):
 
     """Class for grouping all the component-validations tests together"""
 
+    # The validators checked on each Dynamics class, in the order their errors
+    # take precedence. NB: RegimeAliasMatchesBaseScopeValidator is not
+    # included as it never traversed the class it was given before the
+    # validators were fused, so including it could change which classes
+    # are accepted
+    validator_classes = (
+        # Check class structure:
+        TypesDynamicsValidator,
+        NoDuplicatedObjectsValidator,
+        DuplicateRegimeNamesDynamicsValidator,
+        LocalNameConflictsDynamicsValidator,
+        DimensionNameConflictsDynamicsValidator,
+        EventPortsDynamicsValidator,
+        OutputAnalogPortsDynamicsValidator,
+        TimeDerivativesAreDeclaredDynamicsValidator,
+        StateAssignmentsAreOnStateVariablesDynamicsValidator,
+        AliasesAreNotRecursiveDynamicsValidator,
+        NoUnresolvedSymbolsDynamicsValidator,
+        RegimeGraphDynamicsValidator,
+        RegimeOnlyHasOneHandlerPerEventDynamicsValidator,
+        CheckNoLHSAssignmentsToMathsNamespaceDynamicsValidator)
+
     @classmethod
     def validate_componentclass(cls, component_class,
                                 validate_dimensions=True, **kwargs):
         """
         Tests a componentclassclass against a variety of tests, to verify its
-        internal structure
+        internal structure. The tests are checked together in a single
+        traversal of the class (see FusedValidator)
         """
-        # Check class structure:
-        TypesDynamicsValidator(component_class, **kwargs)
-        NoDuplicatedObjectsValidator(component_class, **kwargs)
-        DuplicateRegimeNamesDynamicsValidator(component_class, **kwargs)
-        LocalNameConflictsDynamicsValidator(component_class, **kwargs)
-        DimensionNameConflictsDynamicsValidator(component_class, **kwargs)
-        RegimeAliasMatchesBaseScopeValidator(component_class, **kwargs)
-        EventPortsDynamicsValidator(component_class, **kwargs)
-        OutputAnalogPortsDynamicsValidator(component_class, **kwargs)
-        TimeDerivativesAreDeclaredDynamicsValidator(component_class, **kwargs)
-        StateAssignmentsAreOnStateVariablesDynamicsValidator(component_class,
-                                                             **kwargs)
-        AliasesAreNotRecursiveDynamicsValidator(component_class, **kwargs)
-        NoUnresolvedSymbolsDynamicsValidator(component_class, **kwargs)
-        RegimeGraphDynamicsValidator(component_class, **kwargs)
-        RegimeOnlyHasOneHandlerPerEventDynamicsValidator(component_class,
-                                                         **kwargs)
-        CheckNoLHSAssignmentsToMathsNamespaceDynamicsValidator(component_class,
-                                                               **kwargs)
+        validators = list(cls.validator_classes)
         if validate_dimensions:
-            DimensionalityDynamicsValidator(component_class, **kwargs)
+            validators.append(DimensionalityDynamicsValidator)
+        FusedValidator(component_class, validators, as_class=Dynamics,
+                       **kwargs)
@@ -9,6 +9,7 @@ from future.utils import itervalues
 from collections import defaultdict
 from nineml.exceptions import NineMLUsageError
 from nineml.utils import assert_no_duplicates
+from nineml.visitors.validators import BaseValidator
 from ....componentclass.visitors.validators import (
     AliasesAreNotRecursiveComponentValidator,
     NoUnresolvedSymbolsComponentValidator,
@@ -18,17 +19,20 @@ from ..base import BaseDynamicsVisitor
 import nineml.units as un
 
 
-class TimeDerivativesAreDeclaredDynamicsValidator(BaseDynamicsVisitor):
+class TimeDerivativesAreDeclaredDynamicsValidator(BaseValidator,
+                                                   BaseDynamicsVisitor):
 
     """ Check all variables used in TimeDerivative blocks are defined
         as  StateVariables.
     """
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseDynamicsVisitor.__init__(self)
         self.sv_declared = []
         self.time_derivatives_used = []
-        self.visit(component_class)
+        self._validate(component_class, defer)
+
+    def finalise(self):
         for td in self.time_derivatives_used:
             if td not in self.sv_declared:
                 raise NineMLUsageError(
@@ -46,16 +50,18 @@ class TimeDerivativesAreDeclaredDynamicsValidator(BaseDynamicsVisitor):
 
 
 class StateAssignmentsAreOnStateVariablesDynamicsValidator(
-        BaseDynamicsVisitor):
+        BaseValidator, BaseDynamicsVisitor):
 
     """ Check that we only attempt to make StateAssignments to state-variables.
     """
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseDynamicsVisitor.__init__(self)
         self.sv_declared = []
         self.state_assignments_lhs = []
-        self.visit(component_class)
+        self._validate(component_class, defer)
+
+    def finalise(self):
         for sa in self.state_assignments_lhs:
             if sa not in self.sv_declared:
                 raise NineMLUsageError(
@@ -77,8 +83,7 @@ class AliasesAreNotRecursiveDynamicsValidator(
 
     """Check that aliases are not self-referential"""
 
-    def action_dynamics(self, dynamics, **kwargs):
-        return self.action_componentclass(dynamics, **kwargs)
+    pass
 
 
 class NoUnresolvedSymbolsDynamicsValidator(
@@ -105,14 +110,17 @@ class NoUnresolvedSymbolsDynamicsValidator(
         self.state_assignments.append(state_assignment)
 
 
-class RegimeGraphDynamicsValidator(BaseDynamicsVisitor):
+class RegimeGraphDynamicsValidator(BaseValidator, BaseDynamicsVisitor):
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseDynamicsVisitor.__init__(self)
         self.connected_regimes_from_regime = defaultdict(set)
         self.component_class = component_class
         self.regimes = {}
-        self.visit(component_class)
+        self._validate(component_class, defer)
+
+    def finalise(self):
+        component_class = self.component_class
         self.connected = set()
         if self.regimes:
             first_regime = next(iter(itervalues(self.regimes)))
@@ -150,11 +158,12 @@ class RegimeGraphDynamicsValidator(BaseDynamicsVisitor):
         pass
 
 
-class RegimeOnlyHasOneHandlerPerEventDynamicsValidator(BaseDynamicsVisitor):
+class RegimeOnlyHasOneHandlerPerEventDynamicsValidator(BaseValidator,
+                                                       BaseDynamicsVisitor):
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         BaseDynamicsVisitor.__init__(self)
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
     def action_regime(self, regime, **kwargs):  # @UnusedVariable
         event_triggers = [on_event.src_port_name
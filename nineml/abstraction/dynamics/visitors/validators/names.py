@@ -9,6 +9,7 @@ from ....componentclass.visitors.validators import (
     LocalNameConflictsComponentValidator,
     DimensionNameConflictsComponentValidator)
 from nineml.exceptions import NineMLUsageError
+from nineml.visitors.validators import BaseValidator
 from ..base import BaseDynamicsVisitor
 
 
@@ -56,11 +57,12 @@ class DimensionNameConflictsDynamicsValidator(
         self.check_conflicting_dimension(port.dimension)
 
 
-class DuplicateRegimeNamesDynamicsValidator(BaseDynamicsVisitor):
+class DuplicateRegimeNamesDynamicsValidator(BaseValidator,
+                                            BaseDynamicsVisitor):
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         super(DuplicateRegimeNamesDynamicsValidator, self).__init__()
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
     def action_dynamics(self, component_class, **kwargs):  # @UnusedVariable @IgnorePep8
         regime_names = [r.name for r in component_class.regimes]
@@ -70,11 +72,13 @@ class DuplicateRegimeNamesDynamicsValidator(BaseDynamicsVisitor):
         pass
 
 
-class RegimeAliasMatchesBaseScopeValidator(BaseDynamicsVisitor):
+class RegimeAliasMatchesBaseScopeValidator(BaseValidator,
+                                           BaseDynamicsVisitor):
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         super(RegimeAliasMatchesBaseScopeValidator, self).__init__()
         self.component_class = component_class
+        self._validate(component_class, defer)
 
     def action_alias(self, alias, **kwargs):  # @UnusedVariable
         if alias.name not in self.component_class.alias_names:
@@ -83,3 +87,6 @@ class RegimeAliasMatchesBaseScopeValidator(BaseDynamicsVisitor):
                 "scope of the Dynamics class '{}'"
                 .format(alias.name,
                         "', '".join(self.component_class.alias_names)))
+
+    def default_action(self, obj, nineml_cls, **kwargs):
+        pass
@@ -6,18 +6,20 @@ docstring needed
 """
 from itertools import chain
 from nineml.exceptions import NineMLUsageError
+from nineml.visitors.validators import BaseValidator
 from ..base import BaseDynamicsVisitor
 
 
-class EventPortsDynamicsValidator(BaseDynamicsVisitor):
+class EventPortsDynamicsValidator(BaseValidator, BaseDynamicsVisitor):
 
     """
     Check that each OutputEvent and OnEvent has a corresponding EventPort
     defined, and that the EventPort has the right direction.
     """
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         super(EventPortsDynamicsValidator, self).__init__()
+        self.component_class = component_class
 
         # Mapping component_class to list of events/eventports at that
         # component_class
@@ -27,8 +29,10 @@ class EventPortsDynamicsValidator(BaseDynamicsVisitor):
         self.input_events = []
 
         # Visit all elements of the component class
-        self.visit(component_class)
+        self._validate(component_class, defer)
 
+    def finalise(self):
+        component_class = self.component_class
         # Check that each output event has a corresponding event_port with a
         # send mode:
         for output_event in self.output_events:
@@ -79,19 +83,21 @@ class EventPortsDynamicsValidator(BaseDynamicsVisitor):
 
 # Check that the sub-components stored are all of the
 # right types:
-class OutputAnalogPortsDynamicsValidator(BaseDynamicsVisitor):
+class OutputAnalogPortsDynamicsValidator(BaseValidator, BaseDynamicsVisitor):
 
     """
     Check that all output AnalogPorts reference a local symbol, either an alias
     or a state variable
     """
 
-    def __init__(self, component_class, **kwargs):  # @UnusedVariable
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
         super(OutputAnalogPortsDynamicsValidator, self).__init__()
         self.output_analogports = []
         self.available_symbols = []
         self.component_class = component_class
-        self.visit(component_class)
+        self._validate(component_class, defer)
+
+    def finalise(self):
         for ap in self.output_analogports:
             if ap not in self.available_symbols:
                 raise NineMLUsageError(
@@ -8,7 +8,7 @@ from __future__ import division
 from builtins import object
 from past.builtins import basestring
 from itertools import chain
-from copy import deepcopy
+import numpy
 import sympy
 from sympy.printing import ccode
 from sympy.logic.boolalg import BooleanTrue, BooleanFalse
@@ -28,7 +28,7 @@ builtin_functions = set([
 reserved_symbols = set(['t'])
 reserved_identifiers = set(chain(builtin_constants, builtin_functions,
                                  reserved_symbols))
-from .parser import Parser  # @IgnorePep8
+from .parser import Parser, _ParseCache  # @IgnorePep8
 
 
 t = sympy.Symbol('t')  # The symbol for time
@@ -66,6 +66,17 @@ class Expression(AnnotatedNineMLObject):
     _rationals_re = re.compile(r'(?<!\w)([\d\.]+)L/(?<!\w)([\d\.]+)L')
     _multiple_whitespace_re = re.compile(r'\s+')
     _ccode_print_warn_re = re.compile(r'// (?:Not supported in C:|abs)\n')
+    # Process-wide cache mapping source strings to their canonical form
+    # written by 'rhs_xml'
+    _canonical_cache = _ParseCache(Parser.DEFAULT_CACHE_SIZE)
+    # The source string the RHS was set from (normalised whitespace), which is
+    # retained until the RHS is modified, and the sympy expression parsed from
+    # it, which is only parsed when first accessed
+    _rhs_source = None
+    _parsed_rhs = None
+    # The RHS the cached python function was compiled from and the function
+    # (see rhs_as_python_func)
+    _compiled_rhs = None
 
     def __init__(self, rhs, **kwargs):
         super(Expression, self).__init__(**kwargs)
@@ -78,9 +89,50 @@ class Expression(AnnotatedNineMLObject):
     @rhs.setter
     def rhs(self, rhs):
         if isinstance(rhs, Expression):
-            self._rhs = rhs.rhs
+            if rhs._rhs_source is not None:
+                # Share the unmodified source string (and the parsed
+                # expression if it has already been parsed)
+                self._parsed_rhs = rhs._parsed_rhs
+                self._rhs_source = rhs._rhs_source
+            else:
+                self._rhs = rhs.rhs
+        elif (isinstance(rhs, basestring) and
+                not Parser.valid_identifier(rhs,
+                                            safe_symbols=reserved_symbols)):
+            # Defer parsing the string into sympy until it is required,
+            # only checking its syntax so that malformed expressions are
+            # still rejected when they are set
+            rhs = Parser.normalise(rhs)
+            Parser.check_syntax(rhs)
+            self._parsed_rhs = None
+            self._rhs_source = rhs
         else:
             self._rhs = Parser().parse(rhs)
+        self._mutated()
+
+    @property
+    def _rhs(self):
+        """
+        The sympy form of the RHS, which is parsed from the source string on
+        first access. Setting it discards the source string, so the RHS
+        is then serialized from the sympy expression
+        """
+        if self._parsed_rhs is None:
+            self._parsed_rhs = Parser().parse(self._rhs_source)
+        return self._parsed_rhs
+
+    @_rhs.setter
+    def _rhs(self, rhs):
+        self._parsed_rhs = rhs
+        self._rhs_source = None
+
+    @property
+    def is_parsed(self):
+        """
+        Whether the RHS has been parsed into sympy (i.e. whether it has been
+        accessed symbolically or was set from a non-string)
+        """
+        return self._parsed_rhs is not None
 
     def __str__(self):
         return self.rhs_str
@@ -127,18 +179,48 @@ class Expression(AnnotatedNineMLObject):
 
     @property
     def rhs_cstr(self):
-        rhs = self.expand_integer_powers(self.rhs)
-        cstr = ccode(rhs, user_functions=self._cfunc_map)
-        cstr = self.strip_L_from_rationals(cstr)
+        return self._print_c(self.rhs)
+
+    @classmethod
+    def _print_c(cls, rhs):
+        rhs = cls.expand_integer_powers(rhs)
+        cstr = ccode(rhs, user_functions=cls._cfunc_map)
+        cstr = cls.strip_L_from_rationals(cstr)
         return cstr
 
     @property
     def rhs_xml(self):
-        rhs = self.expand_integer_powers(self.rhs)
-        s = ccode(rhs, user_functions=self._random_map)
-        s = self.strip_L_from_rationals(s)
-        s = self._ccode_print_warn_re.sub('', s)
-        s = self._multiple_whitespace_re.sub(' ', s)
+        """
+        The RHS in the canonical (C-style) form it is serialized in.
+
+        Unmodified expressions are looked up in a process-wide cache of the
+        canonical forms of their source strings, so each source string is
+        only parsed and printed once. The source string itself is not written
+        as it is generally not in canonical form (e.g. the order of terms and
+        the format of numbers differ). The gains are therefore limited to
+        source strings that are repeated within or between documents, as the
+        first time a string is written it is still parsed (if it hasn't been
+        already, which most are by the validation of their classes) and
+        printed (see test/expression_write_profile.py)
+        """
+        source = self._rhs_source
+        if source is None:
+            return self._print_xml(self.rhs)
+        # The expression hasn't been modified since it was set from the
+        # source string so its canonical form only needs to be printed once
+        xml = self._canonical_cache.get(source)
+        if xml is None:
+            xml = self._print_xml(self.rhs)
+            self._canonical_cache.put(source, xml)
+        return xml
+
+    @classmethod
+    def _print_xml(cls, rhs):
+        rhs = cls.expand_integer_powers(rhs)
+        s = ccode(rhs, user_functions=cls._random_map)
+        s = cls.strip_L_from_rationals(s)
+        s = cls._ccode_print_warn_re.sub('', s)
+        s = cls._multiple_whitespace_re.sub(' ', s)
         return s
 
     @property
@@ -178,43 +260,67 @@ class Expression(AnnotatedNineMLObject):
 
     @property
     def rhs_as_python_func(self):
-        """ Returns a python callable which evaluates the expression in
-        namespace and returns the result """
+        """
+        Returns a Python function that evaluates the expression given the
+        values of its free symbols as keyword arguments.
+
+        The expression is compiled with ``sympy.lambdify`` against NumPy, so
+        the values of the symbols can be scalars or arrays (which are
+        broadcast against each other, e.g. to evaluate the expression for a
+        whole population at once), and cached until the expression is
+        modified. Inline random distributions draw a sample for each element
+        of the broadcast arrays, from the NumPy random generator passed as
+        the 'rng' keyword argument (unless the expression has a symbol of
+        that name) or from the global NumPy random state if it isn't given.
+        """
+        compiled = self._compiled_rhs
+        if compiled is None or compiled[0] is not self._rhs:
+            compiled = self._compiled_rhs = (self._rhs, self._compile_rhs())
+        return compiled[1]
+
+    def _compile_rhs(self):
+        rhs = self.rhs
+        symbols = sorted(self.rhs_symbols, key=self.symbol_to_str)
+        names = [self.symbol_to_str(s) for s in symbols]
+        has_randoms = any(True for _ in self.rhs_random_distributions)
+        if isinstance(rhs, sympy.Basic):
+            # Min and Max are otherwise printed as numpy.amin/amax, which
+            # reduce over the elements of array arguments
+            rhs = rhs.replace(
+                lambda e: isinstance(e, (sympy.Min, sympy.Max)),
+                lambda e: sympy.Function(
+                    'minimum_' if isinstance(e, sympy.Min) else 'maximum_')(
+                        *e.args))
+        if has_randoms:
+            # Pass the shape of the sample to draw and the generator to draw
+            # it from to the random functions
+            size = sympy.Dummy('size')
+            rng = sympy.Dummy('rng')
+            random_funcs = tuple(Parser.inline_random_distributions())
+            rhs = rhs.replace(lambda e: type(e) in random_funcs,
+                              lambda e: e.func(*(e.args + (size, rng))))
+            symbols.extend((size, rng))
+        func = sympy.lambdify(
+            symbols, rhs, dummify=True,
+            modules=[compiled_expression_namespace, 'numpy', 'math'])
+
         def nineml_expression(**kwargs):
-            if isinstance(self.rhs, (bool, int, float, BooleanTrue,
-                                     BooleanFalse)):
-                val = self.rhs
-            else:
-                if self.rhs.is_Boolean:
-                    try:
-                        val = self.rhs.subs(kwargs)
-                    except Exception:
-                        raise NineMLUsageError(
-                            "Incorrect arguments provided to expression ('{}')"
-                            ": '{}'\n".format(
-                                "', '".join(self.rhs_symbol_names),
-                                "', '".join(list(kwargs.keys()))))
-                else:
-                    try:
-                        val = self.rhs.evalf(subs=kwargs)
-                    except Exception:
-                        raise NineMLUsageError(
-                            "Incorrect arguments provided to expression '{}'"
-                            ": '{}' (expected '{}')\n".format(
-                                self.rhs,
-                                "', '".join(list(kwargs.keys())),
-                                "', '".join(self.rhs_symbol_names)))
-                    try:
-                        val = float(val)
-                    except TypeError:
-                        try:
-                            locals_dict = deepcopy(kwargs)
-                            locals_dict.update(str_to_npfunc_map)
-                            val = eval(str(val), {}, locals_dict)
-                        except Exception:
-                            raise NineMLUsageError(
-                                "Could not evaluate expression: {}"
-                                .format(self.rhs_str))
+            rng = kwargs.pop('rng', None) if 'rng' not in names else None
+            try:
+                args = [kwargs[n] for n in names]
+            except KeyError:
+                raise NineMLUsageError(
+                    "Incorrect arguments provided to expression '{}'"
+                    ": '{}' (expected '{}')\n".format(
+                        self.rhs, "', '".join(kwargs), "', '".join(names)))
+            if has_randoms:
+                arrays = [a for a in args if numpy.ndim(a)]
+                args.append(numpy.broadcast(*arrays).shape
+                            if arrays else None)
+                args.append(rng)
+            val = func(*args)
+            if isinstance(val, numpy.ndarray) and not val.ndim:
+                val = val[()]  # Unwrap scalars (e.g. from Piecewise)
             return val
         return nineml_expression
 
@@ -233,6 +339,7 @@ class Expression(AnnotatedNineMLObject):
     def rhs_name_transform_inplace(self, name_map):
         """Replace atoms on the RHS with values in the name_map in place"""
         self._rhs = self.rhs_substituted(name_map)
+        self._mutated()
 
     def rhs_substituted(self, name_map):
         """Replace atoms on the RHS with values in the name_map"""
@@ -243,6 +350,7 @@ class Expression(AnnotatedNineMLObject):
     def subs(self, old, new):
         "Substitute 'old' expression for 'new' in the rhs of the expression"
         self._rhs = self._rhs.subs(old, new)
+        self._mutated()
 
     def simplify(self):
         """
@@ -250,6 +358,7 @@ class Expression(AnnotatedNineMLObject):
         (see http://docs.sympy.org/latest/tutorial/simplification.html)
         """
         self._rhs = sympy.simplify(self._rhs)
+        self._mutated()
         return self
 
     def rhs_str_substituted(self, name_map={}, funcname_map={}):
@@ -556,4 +665,5 @@ class ODE(ExpressionWithLHS):
         return [self.independent_variable, self.dependent_variable]
 
 
-from .utils import str_to_npfunc_map, is_single_symbol, is_valid_lhs_target  # @IgnorePep8
+from .utils import (  # @IgnorePep8
+    compiled_expression_namespace, is_single_symbol, is_valid_lhs_target)
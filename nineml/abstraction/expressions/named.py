@@ -162,6 +162,7 @@ class Constant(BaseALObject, ExpressionSymbol):
         assert self.units == units, \
             "Renaming units with ones that do not match"
         self._units = units
+        self._mutated()
 
     def serialize_node(self, node, **options):  # @UnusedVariable
         node.attr('name', self.name, **options)
@@ -5,11 +5,14 @@ from builtins import range
 from past.builtins import basestring
 from builtins import object
 from itertools import chain
+from collections import OrderedDict, namedtuple
+from threading import Lock
 import sympy
 from sympy.parsing.sympy_parser import (
     parse_expr as sympy_parse, standard_transformations, convert_xor)
 from sympy.parsing.sympy_tokenize import NAME, OP
 import operator
+import ast
 import re
 from nineml.exceptions import NineMLMathParseError
 from .base import (
@@ -26,6 +29,74 @@ def sympy_func(func_name):
     return sympy.Function(func_name)
 
 
+ParseCacheInfo = namedtuple('ParseCacheInfo',
+                            'hits misses max_size size')
+
+
+class _ParseCache(object):
+    """
+    A thread-safe, bounded, least-recently-used cache mapping (normalised)
+    expression strings to the sympy expressions parsed from them (or other
+    values derived from them)
+
+    Parameters
+    ----------
+    max_size : int
+        The maximum number of expressions to hold. If 0 the cache is
+        disabled
+    """
+
+    def __init__(self, max_size):
+        self._lock = Lock()
+        self._parsed = OrderedDict()
+        self._max_size = max_size
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, expr_str):
+        "Returns the cached expression or None if it isn't cached"
+        with self._lock:
+            try:
+                # Reinsert to mark as the most recently used
+                expr = self._parsed.pop(expr_str)
+            except KeyError:
+                self._misses += 1
+                return None
+            self._parsed[expr_str] = expr
+            self._hits += 1
+            return expr
+
+    def put(self, expr_str, expr):
+        with self._lock:
+            self._parsed[expr_str] = expr
+            while len(self._parsed) > self._max_size:
+                self._parsed.popitem(last=False)
+
+    @property
+    def enabled(self):
+        return self._max_size > 0
+
+    def info(self):
+        with self._lock:
+            return ParseCacheInfo(self._hits, self._misses, self._max_size,
+                                  len(self._parsed))
+
+    def clear(self):
+        with self._lock:
+            self._parsed.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def resize(self, max_size):
+        if max_size < 0:
+            raise ValueError(
+                "Parse cache size must be non-negative ({})".format(max_size))
+        with self._lock:
+            self._max_size = max_size
+            while len(self._parsed) > max_size:
+                self._parsed.popitem(last=False)
+
+
 class Parser(object):
     # Escape all objects in sympy namespace that aren't defined in NineML
     # by predefining them as symbol names to avoid naming conflicts when
@@ -51,6 +122,10 @@ class Parser(object):
     _precedence = {'&&': 2, '&': 2, '|': 3, '||': 3, '>=': 1, '>': 1,
                    '<': 1, '<=': 1, '==': 1, '=': 1}
     _whitespace_re = re.compile(r'\s+')
+    # Logical operators that need to be translated to check the syntax of an
+    # expression with Python's parser (see 'check_syntax')
+    _python_logic_re = re.compile(r'&&|\|\||!(?!=)|(?<![=<>!])=(?!=)')
+    _python_logic_ops = {'&&': '&', '||': '|', '!': '~', '=': '=='}
     inline_randoms_dict = {
         'random_uniform_': sympy_func('random_uniform_'),
         'random_binomial_': sympy_func('random_binomial_'),
@@ -58,6 +133,12 @@ class Parser(object):
         'random_exponential_': sympy_func('random_exponential_'),
         'random_normal_': sympy_func('random_normal_')}
 
+    # Process-wide cache of the expressions parsed from strings, as the same
+    # right-hand sides typically recur many times across component classes,
+    # documents and clones (see 'configure_cache')
+    DEFAULT_CACHE_SIZE = 10000
+    _cache = _ParseCache(DEFAULT_CACHE_SIZE)
+
     def __init__(self):
         self.escaped_names = None
 
@@ -80,8 +161,16 @@ class Parser(object):
         return expr
 
     def _parse_expr(self, expr):
-        # Strip non-space whitespace
-        expr = self._whitespace_re.sub(' ', expr)
+        expr = self.normalise(expr)
+        if not self._cache.enabled:
+            return self._parse_normalised(expr)
+        parsed = self._cache.get(expr)
+        if parsed is None:
+            parsed = self._parse_normalised(expr)
+            self._cache.put(expr, parsed)
+        return parsed
+
+    def _parse_normalised(self, expr):
         expr = self.escape_random_namespace(expr)
         if self._logic_relation_re.search(expr):
             expr = self._parse_relationals(expr)
@@ -176,6 +265,59 @@ class Parser(object):
         """
         return self._preprocess(tokens)
 
+    @classmethod
+    def configure_cache(cls, max_size=DEFAULT_CACHE_SIZE):
+        """
+        Sets the maximum number of parsed expressions held in the
+        process-wide parse cache, discarding the least recently used
+        expressions if it is reduced.
+
+        Parameters
+        ----------
+        max_size : int
+            The maximum number of expressions to cache. Set to 0 to disable
+            the cache.
+        """
+        cls._cache.resize(max_size)
+
+    @classmethod
+    def cache_info(cls):
+        """
+        Returns the hits, misses, maximum size and current size of the
+        process-wide parse cache
+
+        Returns
+        -------
+        info : ParseCacheInfo
+            Named tuple containing the statistics of the cache
+        """
+        return cls._cache.info()
+
+    @classmethod
+    def clear_cache(cls):
+        "Empties the process-wide parse cache and resets its statistics"
+        cls._cache.clear()
+
+    @classmethod
+    def normalise(cls, expr):
+        "Replaces non-space whitespace in an expression string with spaces"
+        return cls._whitespace_re.sub(' ', expr)
+
+    @classmethod
+    def check_syntax(cls, expr):
+        """
+        Checks the syntax of an expression string without converting it into
+        sympy, by parsing it with Python's parser after translating its
+        logical operators. Strings that Python can't parse are fully parsed,
+        so the error raised is the same as when the expression is parsed
+        """
+        python_expr = cls._python_logic_re.sub(
+            lambda m: cls._python_logic_ops[m.group(0)], expr)
+        try:
+            ast.parse(python_expr.strip(), mode='eval')
+        except SyntaxError:
+            cls().parse(expr)
+
     @classmethod
     def valid_identifier(cls, expr, safe_symbols=set([])):
         if expr in reserved_identifiers - safe_symbols:
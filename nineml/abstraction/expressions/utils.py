@@ -7,6 +7,7 @@ expressions.
 """
 
 import re
+from functools import reduce
 import numpy
 from .base import reserved_identifiers
 
@@ -39,6 +40,35 @@ str_to_npfunc_map = {
 }
 
 
+
+def _random_state(rng):
+    "The generator to draw from, the global NumPy random state if None"
+    return numpy.random if rng is None else rng
+
+
+# Functions used in expressions that aren't provided (under the same name) by
+# numpy or math, for when expressions are compiled into Python functions (see
+# Expression.rhs_as_python_func). Min and Max are replaced by the element-wise
+# 'minimum_' and 'maximum_' and the inline random distributions are passed the
+# shape of the sample to draw and, optionally, the random generator to draw it
+# from as additional final arguments
+compiled_expression_namespace = {
+    'log10': numpy.log10,
+    'minimum_': lambda *args: reduce(numpy.minimum, args),
+    'maximum_': lambda *args: reduce(numpy.maximum, args),
+    'random_uniform_': (
+        lambda _, size, rng=None: _random_state(rng).uniform(size=size)),
+    'random_normal_': (
+        lambda _, size, rng=None: _random_state(rng).normal(size=size)),
+    'random_binomial_': (
+        lambda n, p, size, rng=None: _random_state(rng).binomial(n, p, size)),
+    'random_poisson_': (
+        lambda lam, size, rng=None: _random_state(rng).poisson(lam, size)),
+    'random_exponential_': (
+        lambda rate, size, rng=None: _random_state(rng).exponential(
+            1.0 / rate, size))}
+
+
 def str_expr_replacement(frm, to, expr_string, func_ok=False):
     """ replaces all occurences of name 'frm' with 'to' in expr_string
     ('frm' may not occur as a function name on the rhs) ...
@@ -89,6 +89,7 @@ class DimensionedPort(
         assert self.dimension == dimension,\
             "Dimensions should not change, only change of names is permitted"
         self._dimension = dimension
+        self._mutated()
 
     def __repr__(self):
         classstring = self.__class__.__name__
@@ -5,7 +5,9 @@ This file contains the RandomDistributionValidator class for validating componen
 :license: BSD-3, see LICENSE for details.
 """
 from builtins import object
-from nineml.visitors.validators import NoDuplicatedObjectsValidator
+from nineml.visitors.validators import (
+    FusedValidator, NoDuplicatedObjectsValidator)
+from ...base import RandomDistribution
 from .general import (
     AliasesAreNotRecursiveRandomDistributionValidator,
     NoUnresolvedSymbolsRandomDistributionValidator,
@@ -28,8 +30,9 @@ class RandomDistributionValidator(object):
         internal structure
         """
         # Check class structure:
-        TypesRandomDistributionValidator(component_class, **kwargs)
-        NoDuplicatedObjectsValidator(component_class, **kwargs)
+        FusedValidator(component_class, [TypesRandomDistributionValidator,
+                                         NoDuplicatedObjectsValidator],
+                       as_class=RandomDistribution, **kwargs)
 #         LocalNameConflictsRandomDistributionValidator(component_class,
 #                                                       **kwargs)
 #         DimensionNameConflictsRandomDistributionValidator(component_class,
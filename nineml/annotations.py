@@ -153,6 +153,7 @@ class BaseAnnotations(ContainerObject):
                     .format(key, self._name))
             branch = key_branches[0]
             branch.add(*args)
+        self._mutated()
         return branch
 
     def pop(self, key):
@@ -167,9 +168,11 @@ class BaseAnnotations(ContainerObject):
             is not provided it is taken to be the same as the containing branch
         """
         try:
-            return self._branches.pop(self._parse_key(key))
+            branches = self._branches.pop(self._parse_key(key))
         except KeyError:
             return []
+        self._mutated()
+        return branches
 
     def set(self, key, *args):
         """
@@ -201,6 +204,7 @@ class BaseAnnotations(ContainerObject):
                 " '{}', cannot use 'set' method".format(
                     key, self._name))
         branch.set(*args)  # recurse into branch
+        self._mutated()
 
     def get(self, key, *args, **kwargs):
         """
@@ -265,6 +269,7 @@ class BaseAnnotations(ContainerObject):
                 key_branches[0].delete(*args, **kwargs)
                 if key_branches[0].empty():
                     del self._branches[key]
+                self._mutated()
             else:
                 raise NineMLNameError(
                     "Multiple branches found for key '{}' in annoations "
@@ -503,6 +508,7 @@ class _AnnotationsBranch(BaseAnnotations):
         """
         if len(args) == 1:
             self._attr[key] = str(args[0])
+            self._mutated()
         elif not args:
             raise NineMLUsageError("No value was provided to set of '{}' "
                                      "in annotations branch '{}'"
@@ -567,6 +573,7 @@ class _AnnotationsBranch(BaseAnnotations):
                 raise NineMLNameError(
                     "Annotations branch {{{}}}{} does not contain '{}' "
                     "attribute".format(self.ns, self.name, key))
+            self._mutated()
         else:
             super(_AnnotationsBranch, self).delete(key, *args, **kwargs)
 
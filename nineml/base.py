@@ -2,6 +2,7 @@ from past.builtins import basestring
 from builtins import object
 from itertools import chain
 import re
+import weakref
 # from copy import copy
 import operator
 from collections import OrderedDict
@@ -25,6 +26,11 @@ def hash_non_str(key):
 
 camel_caps_re = re.compile(r'([a-z])([A-Z])')
 
+# Memoized accessor names of the NineML classes (see _child_accessor_name and
+# _children_iter_name)
+_child_accessor_names = {}
+_children_iter_names = {}
+
 
 class BaseNineMLObject(object):
     """
@@ -41,6 +47,19 @@ class BaseNineMLObject(object):
     temporary = False
     # Specifies whether a serialized object has a "body" (i.e. in XML)
     has_serial_body = False
+    # Incremented each time the object is modified in place (see '_mutated')
+    # so that data cached from it, such as its serialization, can be checked
+    # to still be valid
+    _mutation_stamp = 0
+    # The structural hash of the object, which is cached when it is first
+    # required and cleared when the object or any of its descendants is
+    # modified (see '_mutated')
+    _cached_hash = None
+    # The object containing this one, which modifications are propagated to
+    _parent = None
+    # All containers the object has been added to (elements such as aliases
+    # can be added to several), keyed by their IDs (see 'ContainerObject.add')
+    _containers = None
 
     @classmethod
     def _sorted_values(self, container):
@@ -58,11 +77,66 @@ class BaseNineMLObject(object):
         return self.equals(other)
 
     def __hash__(self):
-        return Hasher().hash(self)
+        if self.temporary:
+            # Temporary objects are generated from other objects on the fly so
+            # they aren't notified when those objects are modified
+            return Hasher().hash(self)
+        if self._cached_hash is None:
+            self._cached_hash = Hasher().hash(self)
+        return self._cached_hash
+
+    def __getstate__(self):
+        # Cached hashes are not valid in other processes (as the hashes of
+        # strings are salted per process) and weak references can't be pickled
+        state = self.__dict__.copy()
+        state.pop('_cached_hash', None)
+        state.pop('_referrers', None)
+        state.pop('_containers', None)
+        return state
 
     def __ne__(self, other):
         return not self == other
 
+    def _mutated(self):
+        """
+        Marks the object as modified. Should be called by all methods that
+        modify the object in place after it has been constructed.
+        """
+        self._mutation_stamp += 1
+        self._clear_cached_hash()
+
+    def _clear_cached_hash(self):
+        """
+        Clears the cached hash of the object and those of its ancestors (which
+        include its hash in theirs) so they are recomputed when next required
+        """
+        stack = [self]
+        cleared = set()
+        while stack:
+            obj = stack.pop()
+            if id(obj) in cleared:
+                continue
+            cleared.add(id(obj))
+            obj._cached_hash = None
+            obj._clear_referrers()
+            if obj._parent is not None:
+                stack.append(obj._parent)
+            if obj._containers:
+                stack.extend(obj._containers.values())
+
+    def _add_referrer(self, referrer):
+        """
+        Records that the hash of the object is included in the hash of the
+        given object. Only required for objects that can be shared by several
+        containers (see DocumentLevelObject), as the hashes of the others are
+        cleared via their '_parent' links and the containers they have been
+        added to
+        """
+        pass
+
+    def _clear_referrers(self):
+        pass
+
     @property
     def id(self):
         """
@@ -217,12 +291,23 @@ class BaseNineMLObject(object):
 
     @classmethod
     def _child_accessor_name(cls):
-        return camel_caps_re.sub(r'\1_\2', cls.nineml_type).lower()
+        # Memoized per class as it is called for every element lookup
+        try:
+            return _child_accessor_names[cls]
+        except KeyError:
+            name = camel_caps_re.sub(r'\1_\2', cls.nineml_type).lower()
+            _child_accessor_names[cls] = name
+            return name
 
     @classmethod
     def _children_iter_name(cls):
-        name = cls._child_accessor_name()
-        return pluralise(name)
+        # Memoized per class as it is called for every visit of the children
+        try:
+            return _children_iter_names[cls]
+        except KeyError:
+            name = pluralise(cls._child_accessor_name())
+            _children_iter_names[cls] = name
+            return name
 
     @classmethod
     def _children_dict_name(cls):
@@ -285,6 +370,22 @@ class DocumentLevelObject(BaseNineMLObject):
         # _document is set when the object is added to a document
         self._document = None
 
+    # Objects whose cached hashes include the hash of this object, keyed by
+    # their IDs (see '_add_referrer')
+    _referrers = None
+
+    def _add_referrer(self, referrer):
+        if self._referrers is None:
+            self._referrers = weakref.WeakValueDictionary()
+        self._referrers[id(referrer)] = referrer
+
+    def _clear_referrers(self):
+        if self._referrers:
+            referrers = list(self._referrers.values())
+            self._referrers.clear()
+            for referrer in referrers:
+                referrer._clear_cached_hash()
+
     @property
     def document(self):
         return self._document
@@ -473,12 +574,15 @@ class ContainerObject(BaseNineMLObject):
                     "with an existing element with the same key"
                     .format(element.key, type(element).__name__))
             dct[element.key] = element
-            # Set parent if a property of the child element to add
-            if hasattr(element, 'parent'):
-                element._parent = self
+            # Link the element to its container, so modifications to it are
+            # propagated to the container (and nested containers can access
+            # the document)
+            element._parent = self
+            self._add_to_containers(element)
             # Add nested references to document
             if self.document is not None:
                 add_to_doc_visitor.visit(element)
+        self._mutated()
 
     def remove(self, *elements):
         for element in elements:
@@ -491,11 +595,29 @@ class ContainerObject(BaseNineMLObject):
                     "found in member dictionary (use 'ignore_missing' option "
                     "to ignore)".format(element.key))
             # Remove reference to parent if present
-            try:
-                if element.parent is self:
-                    element._parent = None
-            except AttributeError:
-                pass
+            if element._parent is self:
+                element._parent = None
+            if element._containers:
+                element._containers.pop(id(self), None)
+        self._mutated()
+
+    def _add_to_containers(self, element):
+        """
+        Records the container on the element, as the '_parent' link is only
+        to the last container the element was added to
+        """
+        if element._containers is None:
+            element._containers = weakref.WeakValueDictionary()
+        element._containers[id(self)] = self
+
+    def __setstate__(self, state):
+        # The weak references to the containers are dropped when pickling
+        self.__dict__.update(state)
+        for children_type in self.nineml_children:
+            member_dict = state.get(children_type._children_dict_name(), {})
+            for element in member_dict.values():
+                if isinstance(element, BaseNineMLObject):
+                    self._add_to_containers(element)
 
     def _update_member_key(self, old_key, new_key):
         """
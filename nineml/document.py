@@ -133,6 +133,7 @@ class Document(AnnotatedNineMLObject, dict):
                     .format(nineml_obj.name, self.url))
         assert nineml_obj.document is self
         nineml_obj._document = None
+        nineml_obj._mutated()
 
     def pop(self, name):
         element = self[name]
@@ -174,7 +175,7 @@ class Document(AnnotatedNineMLObject, dict):
         elif self._unserializer is None:
             return False
         else:
-            return name in list(self._unserializer.keys())
+            return name in self._unserializer
 
     @property
     def elements(self):
@@ -202,9 +203,27 @@ class Document(AnnotatedNineMLObject, dict):
         Ensure all elements are loaded before iterating, as additional
         elements may be added to the document during the load process
         """
-        for name in dict.keys(self):
+        for name in list(self.keys()):
             self[name]
 
+    def __reduce__(self):
+        # Documents are reconstructed from their state instead of their dict
+        # items, which would otherwise be added (and cloned) via __setitem__
+        # before the rest of their state is restored
+        self._load_all()
+        return (Document, (), self.__getstate__())
+
+    def __getstate__(self):
+        return {'annotations': self._annotations, 'url': self._url,
+                'elements': dict(dict.items(self))}
+
+    def __setstate__(self, state):
+        self._annotations = state['annotations']
+        self._url = state['url']
+        self._unserializer = None
+        self._loading = []
+        dict.update(self, state['elements'])
+
     def clone(self, cloner=None, **kwargs):
         """
         Creates a duplicate of the current document with its url set to None to
@@ -326,6 +345,7 @@ class AddToDocumentVisitor(BaseVisitorWithContext):
             else:
                 dict.__setitem__(self.document, obj.name, obj)
                 obj._document = self.document
+                obj._mutated()
         return obj
 
     def post_action(self, *args, **kwargs):
@@ -3,18 +3,24 @@ standard_library.install_aliases()
 from past.builtins import basestring  # @IgnorePep8
 import os.path  # @IgnorePep8
 import re  # @IgnorePep8
+import shutil  # @IgnorePep8
 import time  # @IgnorePep8
+import uuid  # @IgnorePep8
 import weakref  # @IgnorePep8
+from multiprocessing.pool import ThreadPool  # @IgnorePep8
 from urllib.request import urlopen  # @IgnorePep8
 import contextlib  # @IgnorePep8
 from nineml.base import DocumentLevelObject  # @IgnorePep8
 from nineml.document import Document  # @IgnorePep8
+from nineml.utils import replace_file  # @IgnorePep8
 from nineml.exceptions import (  # @IgnorePep8
     NineMLSerializationError, NineMLIOError, NineMLReloadDocumentException,
     NineMLSerializerNotImportedError)
 
 DEFAULT_VERSION = 1
 DEFAULT_FORMAT = 'xml'  # see nineml.serialization format_to_serializer.keys()
+# The default maximum number of threads used to prefetch referenced documents
+PREFETCH_THREADS = 8
 
 NINEML_BASE_NS = "http://nineml.net/9ML/"
 NINEML_V1_NS = NINEML_BASE_NS + '1.0'
@@ -30,6 +36,7 @@ UNCERTML_NS = "http://www.uncertml.org/2.0"
 import nineml  # @IgnorePep8
 from .dict import DictSerializer, DictUnserializer  # @IgnorePep8
 from .json import JSONSerializer, JSONUnserializer  # @IgnorePep8
+from .bundle import BundleSerializer, BundleUnserializer  # @IgnorePep8
 try:
     from .xml import XMLSerializer, XMLUnserializer
 except ImportError:
@@ -42,20 +49,23 @@ try:
     from .hdf5 import HDF5Serializer, HDF5Unserializer
 except ImportError:
     HDF5Serializer = HDF5Unserializer = None
+from .cache import DocumentCache  # @IgnorePep8
 
 
 ext_to_format = {
     '.xml': 'xml',
     '.yml': 'yaml',
     '.h5': 'hdf5',
-    '.json': 'json'}
+    '.json': 'json',
+    '.9mlz': 'bundle'}
 
 format_to_serializer = {
     'xml': XMLSerializer,
     'dict': DictSerializer,
     'yaml': YAMLSerializer,
     'json': JSONSerializer,
-    'hdf5': HDF5Serializer}
+    'hdf5': HDF5Serializer,
+    'bundle': BundleSerializer}
 
 
 format_to_unserializer = {
@@ -63,10 +73,36 @@ format_to_unserializer = {
     'dict': DictUnserializer,
     'yaml': YAMLUnserializer,
     'json': JSONUnserializer,
-    'hdf5': HDF5Unserializer}
+    'hdf5': HDF5Unserializer,
+    'bundle': BundleUnserializer}
 
+# The persistent cache documents are read from/saved to by default (see
+# set_document_cache)
+document_cache = None
 
-def read(url, relative_to=None, reload=False, register=True, **kwargs):  # @ReservedAssignment @IgnorePep8
+
+def set_document_cache(directory, max_size=DocumentCache.DEFAULT_MAX_SIZE):
+    """
+    Sets (or unsets) the persistent, on-disk cache that documents are
+    read from and saved to by default (see DocumentCache)
+
+    Parameters
+    ----------
+    directory : str | None
+        The directory of the cache. If None, the cache is disabled
+    max_size : int
+        The maximum total size (in bytes) of the cached documents
+    """
+    global document_cache
+    if directory is None:
+        document_cache = None
+    else:
+        document_cache = DocumentCache(directory, max_size=max_size)
+    return document_cache
+
+
+def read(url, relative_to=None, reload=False, register=True, lazy=False,  # @ReservedAssignment @IgnorePep8
+         cache=None, prefetch=False, **kwargs):
     """
     Reads a NineML document from the given url or file system path and returns
     a Document object.
@@ -86,6 +122,22 @@ def read(url, relative_to=None, reload=False, register=True, **kwargs):  # @Rese
         or not.
     register : bool
         Whether to store the document in the cache after it is read
+    lazy : bool
+        Whether to only unserialize the elements of the document as they are
+        accessed (along with the elements they reference) instead of all at
+        once. For XML files, the document-level elements are also only parsed
+        when they are accessed.
+    cache : DocumentCache | None | False
+        The persistent cache to load the document from (if it has been read
+        before) and save it to otherwise. If None, the cache set by
+        set_document_cache is used, and if False no cache is used. Only
+        applies to local files that are not read lazily.
+    prefetch : bool | int
+        Whether to parse the documents referenced (directly or indirectly) by
+        the document concurrently, in a pool of threads, before it is
+        unserialized instead of one after another as the references are
+        encountered. If an int, it specifies the maximum number of threads
+        used (otherwise PREFETCH_THREADS). Has no effect on lazy reads.
     """
     if not isinstance(url, basestring):
         raise NineMLIOError(
@@ -115,29 +167,29 @@ def read(url, relative_to=None, reload=False, register=True, **kwargs):  # @Rese
             raise NineMLReloadDocumentException()
         doc = doc_ref()
     except (KeyError, NineMLReloadDocumentException):  # Reload from file
-        # Get the unserializer based on the url extension
-        format = format_from_url(url)  # @ReservedAssignment
-        try:
-            Unserializer = format_to_unserializer[format]
-        except KeyError:
-            raise NineMLSerializationError(
-                "Unrecognised format '{}' in url '{}', can be one of '{}'"
-                .format(format, url,
-                        "', '".join(list(format_to_unserializer.keys()))))
-        if Unserializer is None:
-            raise NineMLSerializerNotImportedError(
-                "Cannot write to '{}' as {} serializer cannot be imported. "
-                "Please check the required dependencies are correctly "
-                "installed".format(url, format))
-        if file_path_re.match(url) is not None:
-            file = open(url)  # @ReservedAssignment
-        elif url_re.match(url) is not None:
-            file = urlopen(url)  # @ReservedAssignment
+        if cache is None:
+            cache = document_cache
+        if cache and not lazy and file_path_re.match(url) is not None:
+            cache_key = cache.key(url)
+            doc = cache.load(cache_key)
         else:
-            raise NineMLIOError(
-                "Unrecognised url '{}'".format(url))
-        with contextlib.closing(file):
-            doc = Unserializer(root=file, url=url, **kwargs).unserialize()
+            cache_key = doc = None
+        if doc is None:
+            unserializer = _open_unserializer(url, lazy=lazy, **kwargs)
+            if lazy:
+                doc = unserializer.document
+            else:
+                if prefetch:
+                    # Hold references to the prefetched documents until the
+                    # document has been unserialized as they are only weakly
+                    # referenced by the registry
+                    prefetched = _prefetch(  # @UnusedVariable
+                        unserializer,
+                        PREFETCH_THREADS if prefetch is True else prefetch,
+                        cache)
+                doc = unserializer.unserialize()
+            if cache_key is not None:
+                cache.save(cache_key, doc)
         if register:
             nineml.Document.registry[url] = weakref.ref(doc), mtime
     if name is not None:
@@ -147,6 +199,148 @@ def read(url, relative_to=None, reload=False, register=True, **kwargs):  # @Rese
     return nineml_obj
 
 
+def _open_unserializer(url, **kwargs):
+    """
+    Opens the document at the given (absolute) url with the unserializer
+    matching its format
+    """
+    # Get the unserializer based on the url extension
+    format = format_from_url(url)  # @ReservedAssignment
+    try:
+        Unserializer = format_to_unserializer[format]
+    except KeyError:
+        raise NineMLSerializationError(
+            "Unrecognised format '{}' in url '{}', can be one of '{}'"
+            .format(format, url,
+                    "', '".join(list(format_to_unserializer.keys()))))
+    if Unserializer is None:
+        raise NineMLSerializerNotImportedError(
+            "Cannot write to '{}' as {} serializer cannot be imported. "
+            "Please check the required dependencies are correctly "
+            "installed".format(url, format))
+    if file_path_re.match(url) is not None:
+        file = open(url)  # @ReservedAssignment
+    elif url_re.match(url) is not None:
+        file = urlopen(url)  # @ReservedAssignment
+    else:
+        raise NineMLIOError(
+            "Unrecognised url '{}'".format(url))
+    with contextlib.closing(file):
+        unserializer = Unserializer(root=file, url=url, **kwargs)
+    return unserializer
+
+
+def _prefetch(unserializer, num_threads, cache):
+    """
+    Parses the documents referenced (directly or indirectly) by the document
+    of the given unserializer concurrently, then unserializes them (in a
+    deterministic order) and adds them to the registry, so they don't need to
+    be parsed one after another as the references to them are unserialized.
+    Documents that are already in the registry or the persistent cache are
+    skipped, as are those that can't be parsed, which are left to raise their
+    errors when they are read in the usual way.
+
+    Parameters
+    ----------
+    unserializer : BaseUnserializer
+        The unserializer of the referencing document
+    num_threads : int
+        The maximum number of documents that are parsed at the same time
+    cache : DocumentCache | None | False
+        The persistent cache to load/save the prefetched documents from/to
+
+    Returns
+    -------
+    documents : list(Document)
+        The prefetched documents
+    """
+    documents = []
+    cache_keys = {}
+    visited = set([unserializer.url])
+
+    def to_parse(urls):
+        for url in urls:
+            if url in visited:
+                continue
+            visited.add(url)
+            mtime = _get_mtime(url)
+            if mtime is False:
+                continue  # Not an existing file
+            try:
+                doc_ref, loaded_mtime = nineml.Document.registry[url]
+                if doc_ref() is not None and loaded_mtime == mtime:
+                    continue
+            except KeyError:
+                pass
+            if cache and mtime is not None:
+                cache_keys[url] = cache.key(url)
+                doc = cache.load(cache_keys[url])
+                if doc is not None:
+                    nineml.Document.registry[url] = weakref.ref(doc), mtime
+                    documents.append(doc)
+                    continue
+            yield url
+
+    parsed = []
+    urls = list(to_parse(unserializer.referenced_urls()))
+    pool = ThreadPool(num_threads)
+    try:
+        while urls:
+            # The results are returned in the order of the URLs so the order
+            # the prefetched documents are unserialized in is deterministic
+            results = pool.map(_parse_referenced, urls)
+            next_urls = []
+            for url, result in zip(urls, results):
+                if result is not None:
+                    ref_unserializer, ref_urls = result
+                    parsed.append((url, ref_unserializer))
+                    next_urls.extend(to_parse(ref_urls))
+            urls = next_urls
+    finally:
+        pool.close()
+        pool.join()
+    # Register all parsed documents before unserializing any of them so
+    # references between them resolve to the prefetched documents
+    for url, ref_unserializer in parsed:
+        nineml.Document.registry[url] = (
+            weakref.ref(ref_unserializer.document), _get_mtime(url))
+    # Unserialize the most deeply nested documents first
+    for url, ref_unserializer in reversed(parsed):
+        doc = ref_unserializer.unserialize()
+        if url in cache_keys:
+            cache.save(cache_keys[url], doc)
+        documents.append(doc)
+    return documents
+
+
+def _parse_referenced(url):
+    """
+    Opens the unserializer of a referenced document and extracts the URLs it
+    references in turn, returning None if it can't be opened
+    """
+    try:
+        unserializer = _open_unserializer(url)
+        return unserializer, unserializer.referenced_urls()
+    except Exception:
+        return None
+
+
+def _get_mtime(url):
+    """
+    Returns the modification time of the file at the url as stored in the
+    document registry, None for general URLs and False if the url is neither
+    an existing file nor a valid URL
+    """
+    if file_path_re.match(url) is not None:
+        try:
+            return time.ctime(os.path.getmtime(url))
+        except OSError:
+            return False
+    elif url_re.match(url) is not None:
+        return None
+    return False
+
+
 def write(url, *nineml_objects, **kwargs):
     """
     Writes NineML objects or single document to file given by a path
@@ -161,6 +355,13 @@ def write(url, *nineml_objects, **kwargs):
         Whether to store the document in the cache after writing
     version : str | float | int
         The version to serialize the NineML objects to
+    stream : bool
+        Whether to write each document-level element to file as soon as it is
+        serialized to limit memory usage when writing large documents (only
+        supported by the XML format)
+    fragment_cache : FragmentCache | bool | None
+        The cache to reuse the serial elements of unchanged document-level
+        objects from (see BaseSerializer). Ignored when streaming
     """
     register = kwargs.pop('register', True)
     # Encapsulate the NineML element in a document if it is not already
@@ -184,12 +385,31 @@ def write(url, *nineml_objects, **kwargs):
             "Cannot write to '{}' as {} serializer cannot be "
             "imported. Please check the required dependencies are correctly "
             "installed".format(url, format))
-    with Serializer.open_file(url) as file:  # @ReservedAssignment
-        # file is passed to the serializer for serializations that store
-        # elements dynamically, such as HDF5
-        serializer = Serializer(document=document, fname=file, **kwargs)
-        serializer.serialize()
-        serializer.to_file(serializer.root, file, **kwargs)
+    if os.path.exists(url) and not os.access(url, os.W_OK):
+        raise NineMLSerializationError(
+            "Cannot write to '{}' as it is read-only".format(url))
+    # Write to a temporary file, which is moved into place once it has been
+    # written, so that a failed write doesn't destroy the previous contents
+    tmp_url = '{}.{}.tmp'.format(url, uuid.uuid4().hex)
+    file = Serializer.open_file(tmp_url)  # @ReservedAssignment
+    try:
+        with file:
+            # file is passed to the serializer for serializations that store
+            # elements dynamically, such as HDF5
+            serializer = Serializer(document=document, fname=file, **kwargs)
+            try:
+                serializer.serialize()
+                serializer.to_file(serializer.root, file, **kwargs)
+            except BaseException:
+                serializer.abort()
+                raise
+        if os.path.exists(url):
+            shutil.copymode(url, tmp_url)
+        replace_file(tmp_url, url)
+    except BaseException:
+        if os.path.exists(tmp_url):
+            os.remove(tmp_url)
+        raise
     if register:
         document._url = url
         nineml.Document.registry[url] = (weakref.ref(document),
@@ -213,6 +433,9 @@ def serialize(nineml_object, format=DEFAULT_FORMAT, version=DEFAULT_VERSION,  #
         The document to write local references to
     to_str : bool
         To serialize to a string instead of a serial element.
+    fragment_cache : FragmentCache | bool | None
+        The cache to reuse the serial elements of unchanged document-level
+        objects from (see BaseSerializer)
     """
     if isinstance(nineml_object, nineml.Document):
         if document is not None and document is not nineml_object:
@@ -221,9 +444,18 @@ def serialize(nineml_object, format=DEFAULT_FORMAT, version=DEFAULT_VERSION,  #
                 " serialize ({})".format(document, nineml_object))
         document = nineml_object
     Serializer = format_to_serializer[format]
+    fragment_cache = kwargs.pop('fragment_cache', None)
     if isinstance(nineml_object, DocumentLevelObject) and document is None:
-        document = Document(nineml_object)
-    serializer = Serializer(version=version, document=document, **kwargs)
+        if (fragment_cache not in (None, False) and
+                nineml_object.document is not None):
+            # Serialize the object in the context of its document instead of
+            # cloning it into a new one so that its cached serialization can
+            # be reused
+            document = nineml_object.document
+        else:
+            document = Document(nineml_object)
+    serializer = Serializer(version=version, document=document,
+                            fragment_cache=fragment_cache, **kwargs)
     serial_elem = serializer.visit(nineml_object, **kwargs)
     if to_str:
         serialized = serializer.to_str(serial_elem,
@@ -0,0 +1,110 @@
+from builtins import object
+import weakref
+
+
+class FragmentCache(object):
+    """
+    Caches the serial elements ("fragments") that document-level objects are
+    serialized to, so that repeated serializations of unchanged objects can
+    copy the cached fragment instead of walking the object again.
+
+    Entries are keyed by the identity of the object and a key describing the
+    serialization (format, version, options, etc...). Along with each fragment
+    the mutation stamps (see BaseNineMLObject._mutated) of all the objects
+    that were visited while serializing it are stored, and the fragment is
+    only reused while none of them have been modified since. Entries are
+    dropped when the object they were serialized from is garbage collected.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether fragments are cached and reused
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, nineml_object, key):
+        """
+        Returns the cached fragment of the object for the given key if the
+        object (or any object it depends on) hasn't been modified since it
+        was cached
+
+        Parameters
+        ----------
+        nineml_object : DocumentLevelObject
+            The object that was serialized
+        key : tuple
+            The key describing the serialization
+
+        Returns
+        -------
+        fragment : <serial-element> | None
+            The cached serial element or None if there isn't a valid one
+        dependencies : list(BaseNineMLObject) | None
+            The objects the fragment depends on
+        """
+        try:
+            ref, fragments = self._entries[id(nineml_object)]
+            fragment, deps = fragments[key]
+        except KeyError:
+            return None, None
+        if ref() is not nineml_object:
+            return None, None
+        dependencies = []
+        for dep_ref, stamp in deps:
+            dep = dep_ref()
+            # Objects that have been garbage collected were either created on
+            # the fly during the serialization (e.g. References) or removed
+            # from a container, which will have been marked as modified
+            if dep is not None:
+                if dep._mutation_stamp != stamp:
+                    del fragments[key]
+                    return None, None
+                dependencies.append(dep)
+        return fragment, dependencies
+
+    def set(self, nineml_object, key, fragment, dependencies):
+        """
+        Caches the fragment an object has been serialized to
+
+        Parameters
+        ----------
+        nineml_object : DocumentLevelObject
+            The object that was serialized
+        key : tuple
+            The key describing the serialization
+        fragment : <serial-element>
+            The serial element the object was serialized to. Should not be
+            modified after it is cached
+        dependencies : list(BaseNineMLObject)
+            The objects visited while serializing the object
+        """
+        deps = []
+        for dep in dependencies:
+            try:
+                deps.append((weakref.ref(dep), dep._mutation_stamp))
+            except TypeError:
+                pass  # Can't hold weak references to the object
+        obj_id = id(nineml_object)
+        try:
+            ref, fragments = self._entries[obj_id]
+            if ref() is not nineml_object:
+                raise KeyError(obj_id)
+        except KeyError:
+            fragments = {}
+            self._entries[obj_id] = (
+                weakref.ref(nineml_object,
+                            lambda _: self._entries.pop(obj_id, None)),
+                fragments)
+        fragments[key] = (fragment, deps)
+
+    def clear(self):
+        """
+        Removes all cached fragments
+        """
+        self._entries.clear()
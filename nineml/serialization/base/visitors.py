@@ -6,6 +6,7 @@ from future.utils import with_metaclass
 import os.path
 import re
 from abc import ABCMeta, abstractmethod
+import numpy
 from nineml.exceptions import (
     NineMLSerializationError, NineMLMissingSerializationError, NineMLNameError)
 import nineml
@@ -15,6 +16,7 @@ from nineml.annotations import (
     Annotations, PY9ML_NS, VALIDATION, DIMENSIONALITY)
 from .. import DEFAULT_VERSION, NINEML_BASE_NS
 from nineml.serialization.base.nodes import NodeToSerialize, NodeToUnserialize
+from nineml.serialization.base.fragments import FragmentCache
 from nineml.utils import is_file_handle
 
 
@@ -134,15 +136,37 @@ class BaseSerializer(with_metaclass(ABCMeta, BaseVisitor)):
     document : nineml.Document
         Document to serialize or use as a reference when serializing members
         of it
+    fragment_cache : FragmentCache | bool | None
+        The cache to store the serial elements of document-level objects in
+        and reuse them from while the objects are unchanged. If True the
+        cache shared between all serializers ('BaseSerializer.fragment_cache')
+        is used. Fragments are not cached by default
     """
 
+    # Whether the serial elements document-level objects are serialized to
+    # can be copied into other serial elements (see 'copy_elem'), in which
+    # case they can be cached in a fragment cache and reused while the objects
+    # are unchanged
+    supports_fragments = False
+
+    # The cache used by serializers that are passed 'fragment_cache=True'.
+    # Set 'fragment_cache.enabled' to False to disable caching
+    fragment_cache = FragmentCache()
+
     def __init__(self, version=DEFAULT_VERSION, document=None,
-                 preserve_order=False, **kwargs):  # @UnusedVariable @IgnorePep8
+                 preserve_order=False, fragment_cache=None, **kwargs):  # @UnusedVariable @IgnorePep8
         if document is None:
             document = nineml.Document()
         self.preserve_order = preserve_order
+        if fragment_cache is True:
+            fragment_cache = BaseSerializer.fragment_cache
+        elif fragment_cache is False:
+            fragment_cache = None
+        self._fragment_cache = fragment_cache
         super(BaseSerializer, self).__init__(version, document)
         self._root = self.create_root()
+        # Stack of lists of the objects visited while serializing fragments
+        self._fragment_deps = []
 
     def serialize(self, **options):
         """
@@ -188,6 +212,8 @@ class BaseSerializer(with_metaclass(ABCMeta, BaseVisitor)):
             assert reference is None, (
                 "'reference' kwarg can only be used with DocumentLevelObjects "
                 "not {} ({})".format(type(nineml_object), nineml_object))
+        if self._fragment_deps:
+            self._fragment_deps[-1].append(nineml_object)
         serial_elem = None
         # Write object as reference if appropriate
         if parent is not None and is_doc_level and not isinstance(
@@ -203,10 +229,22 @@ class BaseSerializer(with_metaclass(ABCMeta, BaseVisitor)):
             # Set parent to document root if not provided
             if parent is None:
                 parent = self.root
+            name = self.node_name(type(nineml_object))
+            fragment_key = None
+            if is_doc_level and not isinstance(nineml_object, Annotations):
+                fragment_key = self._fragment_key(**options)
+            if fragment_key is not None:
+                fragment, deps = self._fragment_cache.get(nineml_object,
+                                                          fragment_key)
+                if fragment is not None:
+                    if self._fragment_deps:
+                        self._fragment_deps[-1].extend(deps)
+                    return self.copy_elem(fragment, name, parent=parent,
+                                          multiple=multiple, **options)
+                self._fragment_deps.append([nineml_object])
             # Create element to hold the serialization
-            serial_elem = self.create_elem(
-                self.node_name(type(nineml_object)),
-                parent=parent, multiple=multiple, **options)
+            serial_elem = self.create_elem(name, parent=parent,
+                                           multiple=multiple, **options)
             node = NodeToSerialize(self, serial_elem)
             if self._version[0] == 1 and hasattr(nineml_object,
                                                  'serialize_node_v1'):
@@ -222,6 +260,15 @@ class BaseSerializer(with_metaclass(ABCMeta, BaseVisitor)):
             if save_annotations:
                 self.visit(nineml_object.annotations, parent=serial_elem,
                            **options)
+            if fragment_key is not None:
+                deps = self._fragment_deps.pop()
+                # Stamps are read after the serialization in case it
+                # modified any of the objects (e.g. their annotations)
+                self._fragment_cache.set(
+                    nineml_object, fragment_key,
+                    self.copy_elem(serial_elem, name, **options), deps)
+                if self._fragment_deps:
+                    self._fragment_deps[-1].extend(deps)
         return serial_elem
 
     @property
@@ -297,6 +344,75 @@ class BaseSerializer(with_metaclass(ABCMeta, BaseVisitor)):
             Serialization format-specific options for the method
         """
 
+    def set_array(self, serial_elem, name, values, **options):
+        """
+        Writes an array of numeric values into a serial element. By default
+        each value is written to a separate child element, named by ``name``,
+        with 'index' and 'value' attributes. Formats with a native
+        representation of arrays (e.g. HDF5) can override this method
+
+        Parameters
+        ----------
+        serial_elem : <serial-element>
+            The serial element (dependent on the serialization type)
+        name : str
+            The name of the child element(s) the values are stored in
+        values : numpy.ndarray | iterable(float)
+            The array of values to write
+        options : dict(str, object)
+            Serialization format-specific options for the method
+        """
+        # Convert NumPy scalars (e.g. of integer arrays) to Python numbers
+        for i, value in enumerate(numpy.asarray(values).tolist()):
+            row_elem = self.create_elem(name, parent=serial_elem,
+                                        multiple=True, **options)
+            self.set_attr(row_elem, 'index', i, **options)
+            self.set_attr(row_elem, 'value', value, **options)
+
+    def copy_elem(self, serial_elem, name, parent=None, multiple=False,
+                  **options):
+        """
+        Copies a serial element (and all its children) into a parent element.
+        Only required for formats that support fragment caching (see
+        'supports_fragments')
+
+        Parameters
+        ----------
+        serial_elem : <serial-element>
+            The serial element to copy
+        name : str
+            The name of the serial element
+        parent : <serial-element> | None
+            The element to insert the copy into. If None the copy is returned
+            without being inserted into another element
+        multiple : bool
+            Whether to allow for multiple elements of the same type (important
+            for formats such as JSON and YAML which save them in lists)
+        options : dict(str, object)
+            Serialization format-specific options for the method
+        """
+        raise NotImplementedError(
+            "{} does not support copying of serial elements"
+            .format(type(self).__name__))
+
+    def _fragment_key(self, **options):
+        """
+        Returns the key document-level objects serialized by the serializer
+        are cached under in the fragment cache, or None if they can't be
+        cached
+        """
+        if not (self.supports_fragments and
+                self._fragment_cache is not None and
+                self._fragment_cache.enabled):
+            return None
+        key = (type(self), self._version, self.document.url,
+               self.preserve_order, tuple(sorted(options.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None  # Options that can't be hashed
+        return key
+
     @abstractmethod
     def to_file(self, serial_elem, file, **options):  # @ReservedAssignment
         """
@@ -399,6 +515,14 @@ class BaseSerializer(with_metaclass(ABCMeta, BaseVisitor)):
             url = False
         return url
 
+    def abort(self):
+        """
+        Releases any resources held by the serializer (e.g. files that are
+        written to as the document is serialized) after its serialization has
+        failed
+        """
+        pass
+
     @classmethod
     def open_file(cls, url):
         return open(url, 'wb')
@@ -425,15 +549,23 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
     document : nineml.Document
         Document to serialize or use as a reference when unserializing elements
         of it
+    lazy : bool
+        Whether to avoid parsing the whole document up front when reading
+        from file. Only has an effect for formats that are able to index the
+        document-level elements of a file (i.e. XML)
     """
 
+    # The types of elements that can reference elements in other documents
+    reference_types = ('Reference', 'Definition', 'Prototype')
+
     def __init__(self, root, version=None, url=None, class_map=None, # @ReservedAssignment @IgnorePep8
-                 document=None):
+                 document=None, lazy=False):
         if class_map is None:
             class_map = {}
         if document is None:
             document = Document(unserializer=self, url=url)
         self._url = url
+        self._lazy = lazy
         # Get root elem either from kwarg or file handle
         if hasattr(root, 'url'):
             self._root = self.from_urlfile(root)
@@ -460,16 +592,20 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
             version = extracted_version
         super(BaseUnserializer, self).__init__(version, document=document)
         # Prepare elements in document for lazy loading
+        self._class_map = class_map
         self._doc_elems = {}
+        self._doc_classes = {}
+        # Resolved component types of 9MLv1 definitions keyed by (url, name)
+        self._v1_component_types = {}
+        self._annotation_elem = None
         if self.root is not None:
-            self._annotation_elem = None
-            for nineml_type, elem in self.get_all_children(self.root):
+            for nineml_type, elem in self._doc_level_children():
                 # Strip out document level annotations
                 if nineml_type == self.node_name(Annotations):
                     if self._annotation_elem is not None:
                         raise NineMLSerializationError(
                             "Multiple annotations tags found in document")
-                        self._annotation_elem = elem
+                    self._annotation_elem = elem
                     continue
                 name = self._get_elem_name(elem)
                 # Check for duplicates
@@ -477,13 +613,8 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
                     raise NineMLSerializationError(
                         "Duplicate elements for name '{}' found in document"
                         .format(name))
-                # Get the 9ML class corresponding to the element name
-                try:
-                    elem_cls = class_map[nineml_type]
-                except KeyError:
-                    elem_cls = self.get_nineml_class(nineml_type, elem)
-                self._doc_elems[name] = (elem, elem_cls)
-        self._loaded_elems = []  # keeps track of loaded doc elements
+                self._doc_elems[name] = (nineml_type, elem)
+        self._loaded_elems = set()  # keeps track of loaded doc elements
 
     def unserialize(self):
         """
@@ -507,18 +638,11 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
         name : str
             Name of the document level object to load
         """
-        try:
-            serial_elem, nineml_cls = self._doc_elems[name]
-        except KeyError:
-            raise NineMLNameError(
-                "'{}' was not found in the NineML document {} (elements in "
-                "the document were '{}').".format(
-                    name, self.url or '',
-                    "', '".join(iter(self._doc_elems.keys()))))
+        serial_elem, nineml_cls = self._get_doc_elem(name)
         nineml_object = self.visit(serial_elem, nineml_cls, **options)
         AddToDocumentVisitor(self.document, **options).visit(nineml_object,
                                                              **options)
-        self._loaded_elems.append(name)
+        self._loaded_elems.add(name)
         return nineml_object
 
     def visit(self, serial_elem, nineml_cls, allow_ref=False, **options):  # @UnusedVariable @IgnorePep8
@@ -581,6 +705,52 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
     def keys(self):
         return iter(self._doc_elems.keys())
 
+    def __contains__(self, name):
+        return name in self._doc_elems
+
+    def referenced_urls(self, **options):
+        """
+        Returns the URLs of the other documents referenced by 'Reference',
+        'Definition' or 'Prototype' elements in the document (in the order
+        they are first found), without unserializing it.
+
+        Returns
+        -------
+        urls : list(str)
+            The referenced URLs, with relative file paths resolved against the
+            URL of the document
+        """
+        urls = []
+        for serial_elem in self._referencing_elems(**options):
+            try:
+                url = self.get_attr(serial_elem, 'url', **options)
+            except KeyError:
+                continue
+            if url.startswith('.'):
+                if self.url is None:
+                    continue  # Will be caught when unserialized
+                url = os.path.abspath(os.path.join(os.path.dirname(self.url),
+                                                   url))
+            if url != self.url and url not in urls:
+                urls.append(url)
+        return urls
+
+    def _referencing_elems(self, **options):
+        """
+        Iterates over all elements of the reference types ('Reference',
+        'Definition' and 'Prototype') in the document. Formats that can locate
+        them more efficiently than walking the tree of serial elements can
+        override this method
+        """
+        stack = [self.root]
+        while stack:
+            children = list(self.get_all_children(stack.pop(), **options))
+            for nineml_type, child in reversed(children):
+                if nineml_type in self.reference_types:
+                    yield child
+                else:
+                    stack.append(child)
+
     @property
     def root(self):
         return self._root
@@ -683,6 +853,54 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
             The body of the serial element
         """
 
+    def get_array(self, serial_elem, name, **options):
+        """
+        Reads an array of numeric values written by the 'set_array' method of
+        the corresponding serializer. By default the values are read from
+        separate child elements named by ``name`` with 'index' and 'value'
+        attributes.
+
+        Parameters
+        ----------
+        serial_elem : <serial-element>
+            A serial element
+        name : str
+            The name of the child element(s) the values are stored in
+        options : dict(str, object)
+            Serialization format-specific options for the method
+
+        Returns
+        -------
+        values : list(float) | numpy.ndarray
+            The values of the array in index order
+        """
+        indices = []
+        values = []
+        for child_name, elem in self.get_all_children(serial_elem, **options):
+            if child_name != name:
+                raise NineMLSerializationError(
+                    "Unrecognised element {} found in array (expected '{}')"
+                    .format(child_name, name))
+            indices.append(int(self.get_attr(elem, 'index', **options)))
+            values.append(float(self.get_attr(elem, 'value', **options)))
+        if not indices:
+            return []
+        indices = numpy.array(indices)
+        order = numpy.argsort(indices, kind='mergesort')
+        indices = indices[order]
+        if indices[0] < 0:
+            raise NineMLSerializationError(
+                "Negative indices found in array rows")
+        duplicates = numpy.unique(indices[1:][numpy.diff(indices) == 0])
+        if len(duplicates):
+            raise NineMLSerializationError(
+                "Duplicate indices ({}) found in array rows".format(
+                    ', '.join(str(i) for i in duplicates)))
+        if indices[-1] >= len(indices):
+            raise NineMLSerializationError(
+                "Indices greater or equal to the number of array rows")
+        return numpy.array(values)[order].tolist()
+
     @abstractmethod
     def get_attr_keys(self, serial_elem, **options):
         """
@@ -774,6 +992,61 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
             The root element of the document
         """
 
+    def _doc_level_children(self):
+        """
+        Iterates over the (nineml_type, serial_elem) tuples of the elements
+        directly within the root element. Unserializers that index the
+        document instead of parsing it up front can override this method (and
+        '_parse_doc_elem') to provide placeholder elements, which only need to
+        support 'get_attr' for the 'name' (or 'symbol') attribute.
+        """
+        return self.get_all_children(self.root)
+
+    def _parse_doc_elem(self, serial_elem):
+        """
+        Converts a placeholder returned by '_doc_level_children' into a
+        serial element. Elements that have already been parsed are returned
+        unchanged
+        """
+        return serial_elem
+
+    def _get_doc_elem(self, name):
+        """
+        Returns the serial element and 9ML class of the document-level element
+        of the given name, parsing the element if required
+
+        Parameters
+        ----------
+        name : str
+            Name of the document level element
+
+        Returns
+        -------
+        serial_elem : <serial-element>
+            The serial element of the document-level element
+        nineml_cls : type
+            The class the serial element should be unserialized to
+        """
+        try:
+            nineml_type, serial_elem = self._doc_elems[name]
+        except KeyError:
+            raise NineMLNameError(
+                "'{}' was not found in the NineML document {} (elements in "
+                "the document were '{}').".format(
+                    name, self.url or '',
+                    "', '".join(iter(self._doc_elems.keys()))))
+        serial_elem = self._parse_doc_elem(serial_elem)
+        try:
+            nineml_cls = self._doc_classes[name]
+        except KeyError:
+            # Get the 9ML class corresponding to the element name
+            try:
+                nineml_cls = self._class_map[nineml_type]
+            except KeyError:
+                nineml_cls = self.get_nineml_class(nineml_type, serial_elem)
+            self._doc_classes[name] = nineml_cls
+        return serial_elem, nineml_cls
+
     def extract_version(self):
         namespace = self.get_namespace(self.root)
         try:
@@ -897,25 +1170,32 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
                                                     url))
         except KeyError:
             url = None
-        if url is not None and url != self.url:
+        if url == self.url:
+            url = None
+        # Components that share a definition (or prototype) are common so the
+        # resolved types are cached to avoid repeatedly walking the chain of
+        # references back to the component class
+        try:
+            return self._v1_component_types[(url, name)]
+        except KeyError:
+            pass
+        if url is not None:
             defn_cls = type(
-                Reference(name, self.document, url=url).target)
+                Reference(name=name, document=self.document, url=url).target)
         else:
             try:
-                elem_type, doc_elem = next(
-                    (t, e) for t, e in self.get_all_children(self.root)
-                    if self._get_elem_name(e) == name)
-            except StopIteration:
+                elem_type, doc_elem = self._doc_elems[name]
+            except KeyError:
                 raise NineMLSerializationError(
                     "Referenced '{}' component or component class is missing "
                     "from document {} ({})"
-                    .format(name, self.document.url, "', '".join(
-                        self._get_elem_name(e)
-                        for _, e in self.get_all_children(self.root))))
+                    .format(name, self.document.url,
+                            "', '".join(self._doc_elems)))
+            doc_elem = self._parse_doc_elem(doc_elem)
             if elem_type == 'ComponentClass':
                 defn_cls = self._get_v1_component_class_type(doc_elem)
             elif elem_type == 'Component':
-                return self._get_v1_component_type(doc_elem)
+                defn_cls = self._get_v1_component_type(doc_elem)
             else:
                 raise NineMLSerializationError(
                     "Referenced object '{}' in {} is not component or "
@@ -931,6 +1211,7 @@ class BaseUnserializer(with_metaclass(ABCMeta, BaseVisitor)):
             cls = nineml.RandomDistributionProperties
         else:
             assert False
+        self._v1_component_types[(url, name)] = cls
         return cls
 
 
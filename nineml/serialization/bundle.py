@@ -0,0 +1,164 @@
+from __future__ import absolute_import
+import io
+import sys
+import json
+import struct
+import zipfile
+from collections import OrderedDict
+from past.builtins import basestring
+import numpy
+from numpy.lib import format as npy_format
+from nineml.exceptions import (
+    NineMLSerializationError, NineMLSerializationNotSupportedError)
+from .json import JSONSerializer, JSONUnserializer
+
+
+# The name of the archive member the structure of the document is stored in
+DOCUMENT_MEMBER = 'document.json'
+# The key used to refer to the archive member an array is stored in
+NPY_ATTR = '@npy'
+# Size of the fixed part of the local file header of a zip member
+LOCAL_HEADER_SIZE = 30
+LOCAL_HEADER_SIGNATURE = b'PK\x03\x04'
+
+
+class BundleSerializer(JSONSerializer):
+    """
+    A Serializer class that serializes to a zip archive containing the
+    structure of the document in JSON format, with the values of arrays
+    stored in separate, uncompressed '.npy' members so they can be
+    memory-mapped when they are read
+    """
+
+    # Arrays are collected in the serializer so fragments can't be copied
+    # between serializations
+    supports_fragments = False
+
+    def __init__(self, **kwargs):
+        super(BundleSerializer, self).__init__(**kwargs)
+        self._arrays = OrderedDict()
+
+    def set_array(self, serial_elem, name, values, **options):  # @UnusedVariable @IgnorePep8
+        member = 'arrays/{}.npy'.format(len(self._arrays))
+        self._arrays[member] = numpy.asarray(values)
+        serial_elem[name] = OrderedDict([(NPY_ATTR, member)])
+
+    def to_file(self, serial_elem, file, indent=None, **options):  # @ReservedAssignment @IgnorePep8
+        with zipfile.ZipFile(file, 'w', zipfile.ZIP_STORED,
+                             allowZip64=True) as archive:
+            archive.writestr(
+                DOCUMENT_MEMBER,
+                json.dumps(self.to_elem(serial_elem, **options),
+                           indent=indent).encode('utf-8'))
+            for member, values in self._arrays.items():
+                if sys.version_info >= (3, 6):
+                    # Arrays are written directly into the archive instead of
+                    # being copied into an intermediate buffer
+                    with archive.open(member, 'w', force_zip64=True) as f:
+                        npy_format.write_array(f, values, allow_pickle=False)
+                else:
+                    # Members can only be written from buffers before
+                    # Python 3.6
+                    buff = io.BytesIO()
+                    npy_format.write_array(buff, values, allow_pickle=False)
+                    archive.writestr(member, buff.getvalue())
+
+    def to_str(self, serial_elem, **options):
+        buff = io.BytesIO()
+        self.to_file(serial_elem, buff, **options)
+        return buff.getvalue()
+
+    @classmethod
+    def open_file(cls, url):
+        return open(url, 'wb')
+
+
+class BundleUnserializer(JSONUnserializer):
+    """
+    A Unserializer class that unserializes zip archives written by the
+    BundleSerializer. Arrays stored in archives read from local files are
+    memory-mapped, so their values are only read from disk as they are
+    accessed
+    """
+
+    def get_array(self, serial_elem, name, **options):
+        encoded = serial_elem.get(name)
+        if isinstance(encoded, dict) and NPY_ATTR in encoded:
+            return self._load_array(encoded[NPY_ATTR])
+        return super(BundleUnserializer, self).get_array(serial_elem, name,
+                                                      **options)
+
+    def from_file(self, file, **options):  # @ReservedAssignment
+        # Close the file and reopen it by name so that the arrays can be
+        # memory-mapped
+        fname = file.name
+        file.close()
+        return self._open_archive(fname, **options)
+
+    def from_urlfile(self, urlfile, **options):
+        return self._open_archive(io.BytesIO(urlfile.read()), **options)
+
+    def from_str(self, string, **options):
+        return self._open_archive(io.BytesIO(string), **options)
+
+    def _open_archive(self, archive, **options):
+        """
+        Reads the document structure from the archive and records the
+        archive so the arrays can be loaded from it
+        """
+        self._archive = archive
+        try:
+            with zipfile.ZipFile(archive) as zf:
+                self._members = dict((i.filename, i) for i in zf.infolist())
+                document = json.loads(zf.read(DOCUMENT_MEMBER).decode('utf-8'))
+        except (zipfile.BadZipfile, KeyError, ValueError) as e:
+            raise NineMLSerializationError(
+                "Could not read 9ML zip archive: {}".format(e))
+        return self.from_elem(document, **options)
+
+    def _load_array(self, member):
+        try:
+            info = self._members[member]
+        except KeyError:
+            raise NineMLSerializationError(
+                "Array member '{}' is missing from 9ML zip archive"
+                .format(member))
+        if (isinstance(self._archive, basestring) and
+                info.compress_type == zipfile.ZIP_STORED):
+            return self._memmap_array(info)
+        with zipfile.ZipFile(self._archive) as zf:
+            with zf.open(member) as f:
+                return npy_format.read_array(f, allow_pickle=False)
+
+    def _memmap_array(self, info):
+        """
+        Memory-maps an uncompressed array member of the archive, using the
+        offset of its data from the local header of the member
+        """
+        with open(self._archive, 'rb') as f:
+            f.seek(info.header_offset)
+            header = f.read(LOCAL_HEADER_SIZE)
+            if header[:4] != LOCAL_HEADER_SIGNATURE:
+                raise NineMLSerializationError(
+                    "Corrupt local header of '{}' in 9ML zip archive '{}'"
+                    .format(info.filename, self._archive))
+            name_len, extra_len = struct.unpack('<HH', header[26:30])
+            f.seek(info.header_offset + LOCAL_HEADER_SIZE + name_len +
+                   extra_len)
+            version = npy_format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = (
+                    npy_format.read_array_header_1_0(f))
+            else:
+                shape, fortran_order, dtype = (
+                    npy_format.read_array_header_2_0(f))
+            offset = f.tell()
+        if dtype.hasobject:
+            raise NineMLSerializationNotSupportedError(
+                "Arrays of Python objects cannot be read from 9ML zip "
+                "archives ('{}')".format(info.filename))
+        if not numpy.prod(shape):
+            return numpy.empty(shape, dtype=dtype)  # Can't map empty arrays
+        return numpy.memmap(self._archive, dtype=dtype, mode='r',
+                            offset=offset, shape=shape,
+                            order='F' if fortran_order else 'C')
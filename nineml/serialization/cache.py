@@ -0,0 +1,223 @@
+from __future__ import absolute_import
+import os.path
+import errno
+import hashlib
+import pickle
+import copyreg
+from tempfile import mkstemp
+from sympy.core.function import UndefinedFunction
+import sympy
+import nineml
+from nineml.base import DocumentLevelObject
+from nineml.document import Document
+from nineml.utils import replace_file
+
+
+class DocumentCache(object):
+    """
+    A persistent, on-disk cache of unserialized documents that can be shared
+    between processes (e.g. workers of a parallel simulation), allowing them to
+    skip parsing and validation of documents that have been read before.
+
+    Documents are pickled into files named by a hash of the contents of the
+    file they were read from, its URL and the version of the library. Elements
+    of other documents that are referenced from a cached document are stored
+    as references (URL and name) and reread (or loaded from the cache) when
+    the document is loaded, so changes to them are picked up. The least
+    recently used entries are evicted when the total size of the cache exceeds
+    ``max_size``.
+
+    Parameters
+    ----------
+    directory : str
+        The directory to store the cached documents in. Will be created if it
+        doesn't exist
+    max_size : int
+        The maximum total size (in bytes) of the cached documents
+    """
+
+    EXT = '.pkl'
+    DEFAULT_MAX_SIZE = 2 ** 30
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        self._directory = os.path.abspath(directory)
+        self._max_size = max_size
+        try:
+            os.makedirs(self._directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+
+    def __repr__(self):
+        return "DocumentCache('{}', max_size={})".format(self._directory,
+                                                         self._max_size)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def max_size(self):
+        return self._max_size
+
+    def key(self, url):
+        """
+        Returns the key the document read from the given file is cached under
+
+        Parameters
+        ----------
+        url : str
+            The absolute path of the file the document is read from
+        """
+        hsh = hashlib.sha256()
+        hsh.update(nineml.__version__.encode('utf-8'))
+        hsh.update(b'\0')
+        hsh.update(url.encode('utf-8'))
+        hsh.update(b'\0')
+        with open(url, 'rb') as f:
+            for chunk in iter(lambda: f.read(2 ** 20), b''):
+                hsh.update(chunk)
+        return hsh.hexdigest()
+
+    def load(self, key):
+        """
+        Loads a cached document
+
+        Parameters
+        ----------
+        key : str
+            The key the document is cached under (see 'key' method)
+
+        Returns
+        -------
+        document : Document | None
+            The cached document or None if it isn't in the cache (or couldn't
+            be loaded from it)
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                document = _DocumentUnpickler(f).load()
+        except (IOError, OSError):
+            return None
+        except Exception:
+            # Cache entries that can't be loaded (e.g. truncated or referring
+            # to documents that no longer exist) are treated as misses
+            self._remove(path)
+            return None
+        try:
+            os.utime(path, None)  # Mark entry as recently used
+        except OSError:
+            pass
+        return document
+
+    def save(self, key, document):
+        """
+        Saves a document to the cache. Documents that can't be pickled are
+        silently skipped
+
+        Parameters
+        ----------
+        key : str
+            The key to cache the document under (see 'key' method)
+        document : Document
+            The (fully loaded) document to save
+        """
+        # Write to a temporary file first so that other processes never see
+        # partially written entries
+        fd, tmp_path = mkstemp(suffix='.tmp', dir=self._directory)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                _DocumentPickler(f, document).dump(document)
+            # Overwrites entries saved by other processes in the meantime
+            replace_file(tmp_path, self._path(key))
+        except Exception:
+            self._remove(tmp_path)
+            return
+        self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used entries until the total size of the
+        cache is less than max_size
+        """
+        entries = []
+        for fname in os.listdir(self._directory):
+            if not fname.endswith(self.EXT):
+                continue
+            path = os.path.join(self._directory, fname)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue  # Removed by another process
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total_size = sum(e[1] for e in entries)
+        for _, size, path in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            self._remove(path)
+            total_size -= size
+
+    def clear(self):
+        """
+        Removes all entries from the cache
+        """
+        for fname in os.listdir(self._directory):
+            if fname.endswith(self.EXT):
+                self._remove(os.path.join(self._directory, fname))
+
+    def _path(self, key):
+        return os.path.join(self._directory, key + self.EXT)
+
+    @classmethod
+    def _remove(cls, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def _reduce_undefined_function(func):
+    # Undefined SymPy functions (e.g. inline random distributions) are
+    # dynamically created classes, which can't be pickled by reference
+    return (sympy.Function, (func.__name__,))
+
+
+class _DocumentPickler(pickle.Pickler):
+    """
+    Pickles a document, storing references to elements in other documents by
+    their URL and name
+    """
+
+    def __init__(self, file, document):  # @ReservedAssignment
+        pickle.Pickler.__init__(self, file, pickle.HIGHEST_PROTOCOL)
+        self._document = document
+        # NB: Python 2 picklers ignore the dispatch table, so documents that
+        # contain inline random distributions can't be pickled and aren't
+        # cached (see 'DocumentCache.save')
+        self.dispatch_table = copyreg.dispatch_table.copy()
+        self.dispatch_table[UndefinedFunction] = _reduce_undefined_function
+
+    def persistent_id(self, obj):
+        if isinstance(obj, Document):
+            if obj is not self._document and obj.url is not None:
+                return ('document', obj.url)
+        elif isinstance(obj, DocumentLevelObject):
+            document = obj.document
+            if (document is not None and document is not self._document and
+                    document.url is not None):
+                return ('element', document.url, obj.name)
+        return None
+
+
+class _DocumentUnpickler(pickle.Unpickler):
+    """
+    Unpickles a document pickled by _DocumentPickler, reading the documents
+    that it references
+    """
+
+    def persistent_load(self, pid):
+        if pid[0] == 'document':
+            return nineml.read(pid[1])
+        else:
+            return nineml.read(pid[1])[pid[2]]
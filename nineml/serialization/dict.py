@@ -1,6 +1,9 @@
 from builtins import zip
 from nineml.exceptions import NineMLSerializationNotSupportedError
 from itertools import repeat, chain
+from copy import deepcopy
+import base64
+import numpy
 from . import NINEML_BASE_NS
 from collections import OrderedDict
 from nineml.document import Document
@@ -14,11 +17,50 @@ class DictSerializer(BaseSerializer):
     """
     A Serializer class that serializes to a dictionary of lists and attributes.
     Is used as the base class for the Pickle, JSON and YAML serializers
+
+    Parameters
+    ----------
+    array_encoding : str
+        How the values of arrays are encoded. Either 'rows' (default), which
+        writes a separate element with 'index' and 'value' attributes for each
+        value, 'list', which writes a plain list of numbers, or 'base64',
+        which writes the base64 encoding of the little-endian binary buffer of
+        the values along with its dtype
     """
 
+    array_encodings = ('rows', 'list', 'base64')
+    supports_fragments = True
+
+    def __init__(self, array_encoding='rows', **kwargs):
+        if array_encoding not in self.array_encodings:
+            raise NineMLSerializationError(
+                "Unrecognised array encoding '{}', can be one of '{}'"
+                .format(array_encoding, "', '".join(self.array_encodings)))
+        self.array_encoding = array_encoding
+        super(DictSerializer, self).__init__(**kwargs)
+
+    def _fragment_key(self, **options):
+        key = super(DictSerializer, self)._fragment_key(**options)
+        if key is not None:
+            key += (self.array_encoding,)
+        return key
+
     def create_elem(self, name, parent, namespace=None, multiple=False,  # @UnusedVariable @IgnorePep8
                     **options):  # @UnusedVariable
         elem = OrderedDict()
+        self._insert_elem(elem, name, parent, multiple)
+        if namespace is not None:
+            self.set_attr(elem, self.NS_ATTR, namespace, **options)
+        return elem
+
+    def copy_elem(self, serial_elem, name, parent=None, multiple=False,
+                  **options):  # @UnusedVariable
+        elem = deepcopy(serial_elem)
+        if parent is not None:
+            self._insert_elem(elem, name, parent, multiple)
+        return elem
+
+    def _insert_elem(self, elem, name, parent, multiple):
         if multiple:
             if name not in parent:
                 parent[name] = []
@@ -29,9 +71,6 @@ class DictSerializer(BaseSerializer):
                     "'{}' already exists in parent ({}) when creating "
                     "singleton element".format(name, parent))
             parent[name] = elem
-        if namespace is not None:
-            self.set_attr(elem, self.NS_ATTR, namespace, **options)
-        return elem
 
     def create_root(self, **options):  # @UnusedVariable
         return OrderedDict([('@namespace', self.nineml_namespace)])
@@ -42,6 +81,21 @@ class DictSerializer(BaseSerializer):
     def set_body(self, serial_elem, value, **options):  # @UnusedVariable @IgnorePep8
         self.set_attr(serial_elem, self.BODY_ATTR, value, **options)
 
+    def set_array(self, serial_elem, name, values, **options):
+        if self.array_encoding == 'rows':
+            super(DictSerializer, self).set_array(serial_elem, name, values,
+                                                  **options)
+        elif self.array_encoding == 'list':
+            serial_elem[name] = numpy.asarray(values).tolist()
+        else:
+            values = numpy.asarray(values)
+            dtype = values.dtype.newbyteorder('<')
+            serial_elem[name] = OrderedDict([
+                ('dtype', dtype.str),
+                ('base64', base64.b64encode(
+                    values.astype(dtype, copy=False).tobytes()).decode(
+                        'ascii'))])
+
     def to_file(self, serial_elem, file, **options):  # @UnusedVariable  @IgnorePep8 @ReservedAssignment
         raise NineMLSerializationNotSupportedError(
             "'dict' format cannot be written to file"
@@ -89,10 +143,11 @@ class DictUnserializer(BaseUnserializer):
         return iter(children)
 
     def get_all_children(self, parent, **options):  # @UnusedVariable
+        # NB: Lists of numbers are arrays encoded as lists (see 'get_array')
         return chain(
             ((n, e) for n, e in parent.items() if isinstance(e, dict)),
             *(zip(repeat(n), e) for n, e in parent.items()
-              if isinstance(e, list)))
+              if isinstance(e, list) and e and isinstance(e[0], dict)))
 
     def get_attr(self, serial_elem, name, **options):  # @UnusedVariable
         try:
@@ -109,6 +164,27 @@ class DictUnserializer(BaseUnserializer):
                 .format(serial_elem, name, value))
         return value
 
+    def get_array(self, serial_elem, name, **options):
+        """
+        Reads arrays encoded as plain lists of numbers or base64 encoded
+        binary buffers (see DictSerializer) in addition to the default
+        element-per-value format
+        """
+        encoded = serial_elem.get(name)
+        if isinstance(encoded, list) and not (encoded and
+                                              isinstance(encoded[0], dict)):
+            return numpy.array(encoded, dtype=float if not encoded else None)
+        elif isinstance(encoded, dict) and 'base64' in encoded:
+            try:
+                return numpy.frombuffer(base64.b64decode(encoded['base64']),
+                                        dtype=numpy.dtype(encoded['dtype']))
+            except (KeyError, TypeError, ValueError) as e:
+                raise NineMLSerializationError(
+                    "Could not decode base64 encoded array '{}': {}"
+                    .format(name, e))
+        return super(DictUnserializer, self).get_array(serial_elem, name,
+                                                       **options)
+
     def get_body(self, serial_elem, **options):  # @UnusedVariable
         try:
             body = self.get_attr(serial_elem, self.BODY_ATTR)
@@ -1,5 +1,6 @@
 from builtins import zip
 import h5py
+import numpy
 from . import NINEML_BASE_NS
 from tempfile import mkstemp
 import contextlib
@@ -17,9 +18,28 @@ from nineml.utils import is_file_handle
 class HDF5Serializer(BaseSerializer):
     """
     A Serializer class that serializes to the HDF5 format
+
+    Parameters
+    ----------
+    fname : str | file
+        The name of (or handle to) the file to write to
+    compression : str | None
+        The compression filter (e.g. 'gzip' or 'lzf') used for the datasets
+        that arrays are stored in. Compressed datasets are stored in chunks,
+        whereas uncompressed datasets are stored contiguously so they can be
+        memory-mapped when they are read
+    compression_opts : object
+        Options passed to the compression filter (e.g. the gzip level)
+    chunks : bool | tuple(int) | None
+        The chunk shape of the datasets arrays are stored in (see h5py). If
+        None, datasets are only chunked if they are compressed
     """
 
-    def __init__(self, fname, **kwargs):  # @UnusedVariable @IgnorePep8 @ReservedAssignment
+    def __init__(self, fname, compression=None, compression_opts=None,
+                 chunks=None, **kwargs):  # @UnusedVariable @IgnorePep8 @ReservedAssignment
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.chunks = chunks
         if is_file_handle(fname):
             # Close the file and reopen with the h5py File object
             file_ = fname
@@ -59,12 +79,27 @@ class HDF5Serializer(BaseSerializer):
     def set_body(self, serial_elem, value, **options):  # @UnusedVariable @IgnorePep8
         self.set_attr(serial_elem, self.BODY_ATTR, value, **options)
 
+    def set_array(self, serial_elem, name, values, **options):  # @UnusedVariable @IgnorePep8
+        """
+        Arrays are stored in native HDF5 datasets instead of a group per
+        element
+        """
+        values = numpy.asarray(values)
+        chunks = self.chunks
+        if chunks is None and self.compression is not None and len(values):
+            chunks = True
+        dataset = serial_elem.create_dataset(
+            name, data=values, chunks=chunks, compression=self.compression,
+            compression_opts=self.compression_opts)
+        dataset.attrs[self.MULT_ATTR] = False
+
     def to_file(self, serial_elem, file, **options):  # @UnusedVariable  @IgnorePep8 @ReservedAssignment
         if file.name != self._file.filename:
             raise NineMLSerializationError(
                 "Can only write elems to the file that is named in the "
                 "__init__ method as the file is written to as the elements "
                 "are serialized.")
+        self._file.flush()
 
     def to_str(self, serial_elem, **options):  # @UnusedVariable  @IgnorePep8
         raise NineMLSerializationNotSupportedError(
@@ -103,6 +138,8 @@ class HDF5Unserializer(BaseUnserializer):
         return iter(children.values())
 
     def get_all_children(self, parent, **options):  # @UnusedVariable
+        if isinstance(parent, h5py.Dataset):
+            return iter([])  # Arrays stored in datasets don't have children
         return chain(
             ((n, e) for n, e in parent.items() if not e.attrs[self.MULT_ATTR]),
             *(zip(repeat(n), iter(e.values())) for n, e in parent.items()
@@ -111,6 +148,28 @@ class HDF5Unserializer(BaseUnserializer):
     def get_attr(self, serial_elem, name, **options):  # @UnusedVariable
         return serial_elem.attrs[name]
 
+    def get_array(self, serial_elem, name, **options):
+        """
+        Reads arrays stored in HDF5 datasets. Contiguous datasets are
+        memory-mapped so the values are only read from disk as they are
+        accessed, while chunked (e.g. compressed) datasets are read in a single
+        operation. Arrays stored in the row-per-group format used by previous
+        versions are also supported.
+        """
+        dataset = serial_elem.get(name)
+        if not isinstance(dataset, h5py.Dataset):
+            return super(HDF5Unserializer, self).get_array(serial_elem, name,
+                                                           **options)
+        offset = dataset.id.get_offset()
+        if (offset is not None and dataset.chunks is None and
+                dataset.compression is None and not dataset.external):
+            values = numpy.memmap(dataset.file.filename, mode='r',
+                                  dtype=dataset.dtype, shape=dataset.shape,
+                                  offset=offset)
+        else:
+            values = dataset[()]
+        return values
+
     def get_body(self, serial_elem, **options):  # @UnusedVariable
         try:
             return serial_elem.attrs[self.BODY_ATTR]
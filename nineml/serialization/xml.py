@@ -1,4 +1,7 @@
 import re
+from copy import deepcopy
+from collections import namedtuple
+from xml.parsers import expat
 from future.utils import native_str_to_bytes, bytes_to_native_str
 from lxml import etree
 from lxml.builder import ElementMaker
@@ -21,19 +24,199 @@ def strip_xmlns(tag_name):
     return xmlns_re.match(tag_name).group(2)
 
 
+def strip_prefix(qname):
+    return qname.rpartition(':')[2]
+
+
 def value_str(value):
     # Ensure all decimal places are preserved for floats
     return repr(value) if isinstance(value, float) else str(value)
 
 
+# Placeholder for a document-level element that has been indexed but not yet
+# parsed. Only the attributes of the element are stored (for name lookups)
+# along with the byte range it occupies in the file
+IndexedElement = namedtuple('IndexedElement', 'tag attrib start end')
+
+
+class XMLOffsetIndex(object):
+    """
+    Records the byte offsets of the document-level elements in an XML file
+    in a single pass with the (non-validating) expat parser, without building
+    an element tree. Each document-level element can then be parsed on its
+    own when it is required.
+
+    Parameters
+    ----------
+    fname : str
+        Path to the XML file to index
+    """
+
+    def __init__(self, fname):
+        self._fname = fname
+        self._elements = []
+        self._depth = 0
+        self._root_tag = None
+        self._prolog_end = None
+        self._current = None
+        self._parser = expat.ParserCreate()
+        self._parser.StartElementHandler = self._start
+        self._parser.EndElementHandler = self._end
+        try:
+            with open(fname, 'rb') as f:
+                self._parser.ParseFile(f)
+        except (expat.ExpatError, IOError) as e:
+            raise NineMLSerializationError(
+                "Could not read URL or file path '{}': \n{}"
+                .format(fname, e))
+        finally:
+            # Break reference cycle between the parser and the handlers
+            self._parser = None
+        # Read the document prolog and root start tag, which are prepended
+        # to each element when it is parsed so the namespace declarations,
+        # encoding and entities of the document are preserved.
+        if self._prolog_end is not None:
+            with open(fname, 'rb') as f:
+                self._prolog = f.read(self._prolog_end)
+        else:
+            self._prolog = None  # Empty document
+        self._epilog = native_str_to_bytes('</{}>'.format(self._root_tag))
+
+    def _start(self, tag, attrib):
+        if self._depth == 0:
+            self._root_tag = tag
+        elif self._depth == 1:
+            offset = self._parser.CurrentByteIndex
+            self._close_current(offset)
+            if self._prolog_end is None:
+                self._prolog_end = offset
+            self._current = (tag, attrib, offset)
+        self._depth += 1
+
+    def _end(self, tag):  # @UnusedVariable
+        self._depth -= 1
+        if self._depth == 0:
+            self._close_current(self._parser.CurrentByteIndex)
+
+    def _close_current(self, offset):
+        # Elements are taken to extend up to the start of the next element
+        # (or the closing root tag), which may include trailing whitespace
+        # and comments
+        if self._current is not None:
+            tag, attrib, start = self._current
+            self._elements.append(IndexedElement(tag, attrib, start, offset))
+            self._current = None
+
+    @property
+    def elements(self):
+        return iter(self._elements)
+
+    def root(self):
+        """
+        Returns an empty root element with the same tag and namespace
+        declarations as the indexed document
+        """
+        if self._prolog is None:
+            return etree.parse(self._fname).getroot()
+        return etree.fromstring(self._prolog + self._epilog)
+
+    def parse(self, indexed_elem):
+        """
+        Parses an indexed element from the file
+
+        Parameters
+        ----------
+        indexed_elem : IndexedElement
+            The indexed element to parse
+
+        Returns
+        -------
+        elem : etree.Element
+            The parsed element
+        """
+        with open(self._fname, 'rb') as f:
+            f.seek(indexed_elem.start)
+            fragment = f.read(indexed_elem.end - indexed_elem.start)
+        try:
+            root = etree.fromstring(self._prolog + fragment + self._epilog)
+        except etree.LxmlError as e:
+            raise NineMLSerializationError(
+                "Could not parse '{}' element in '{}': \n{}"
+                .format(indexed_elem.tag, self._fname, e))
+        return next(e for e in root.getchildren()
+                    if not isinstance(e, etree._Comment))
+
+
 class XMLSerializer(BaseSerializer):
-    "Serializer class for the XML format"
+    """
+    Serializer class for the XML format
+
+    Parameters
+    ----------
+    fname : str | file | None
+        The name of (or handle to) the file to write to. Only required when
+        streaming
+    stream : bool
+        Whether to write each document-level element to the file as soon as
+        it is serialized and then discard its serial element, so that the
+        memory required is bounded by the size of the largest element instead
+        of the whole document. Note that when streaming, document-level
+        elements redeclare the default namespace and are not indented within
+        the root element when pretty printed
+    pretty_print : bool
+        Whether to pretty print the streamed elements
+    xml_declaration : bool
+        Whether to write the XML declaration at the start of the streamed file
+    encoding : str
+        The encoding of the streamed file
+    """
 
     supports_bodies = True
+    supports_fragments = True
 
-    def __init__(self, version=DEFAULT_VERSION, document=None, **kwargs):  # @UnusedVariable @IgnorePep8
+    def __init__(self, version=DEFAULT_VERSION, document=None, fname=None,
+                 stream=False, pretty_print=True, xml_declaration=True,
+                 encoding='UTF-8', **kwargs):  # @UnusedVariable @IgnorePep8
         super(XMLSerializer, self).__init__(version=version, document=document,
                                             **kwargs)
+        self._stream = None
+        if stream:
+            if fname is None:
+                raise NineMLSerializationError(
+                    "The file to write to ('fname') needs to be provided to "
+                    "stream the serialization")
+            self._fname = fname
+            self._pretty_print = pretty_print
+            # Caching the fragments would keep copies of all the elements
+            # that are streamed to file in memory
+            self._fragment_cache = None
+            # The context managers of the incremental writer are entered here
+            # and exited in 'to_file' after the document has been serialized,
+            # or in 'abort' if the serialization fails
+            self._xmlfile = etree.xmlfile(fname, encoding=encoding)
+            self._stream = self._xmlfile.__enter__()
+            self._stream_root = None
+            try:
+                if xml_declaration:
+                    self._stream.write_declaration()
+                self._stream_root = self._stream.element(
+                    self.root.tag, nsmap=self.root.nsmap)
+                self._stream_root.__enter__()
+                if pretty_print:
+                    self._stream.write('\n')
+            except Exception:
+                self.abort()
+                raise
+
+    def visit(self, nineml_object, parent=None, **kwargs):
+        serial_elem = super(XMLSerializer, self).visit(
+            nineml_object, parent=parent, **kwargs)
+        if self._stream is not None and (parent is None or
+                                         parent is self.root):
+            # Write the document-level element to file and free it
+            self._stream.write(serial_elem, pretty_print=self._pretty_print)
+            self.root.remove(serial_elem)
+        return serial_elem
 
     def create_elem(self, name, parent, namespace=None, **options):  # @UnusedVariable @IgnorePep8
         elem = self.E(namespace)(name)
@@ -43,6 +226,16 @@ class XMLSerializer(BaseSerializer):
     def create_root(self):
         return self.E()(Document.nineml_type)
 
+    def copy_elem(self, serial_elem, name, parent=None, multiple=False,  # @UnusedVariable @IgnorePep8
+                  **options):  # @UnusedVariable
+        elem = deepcopy(serial_elem)
+        # Strip the tail whitespace the element may have been given when it
+        # was pretty printed
+        elem.tail = None
+        if parent is not None:
+            parent.append(elem)
+        return elem
+
     def set_attr(self, serial_elem, name, value, **options):  # @UnusedVariable
         serial_elem.attrib[name] = value_str(value)
 
@@ -58,12 +251,46 @@ class XMLSerializer(BaseSerializer):
 
     def to_file(self, serial_elem, file, pretty_print=True,  # @ReservedAssignment @IgnorePep8
                 xml_declaration=True, encoding='UTF-8', **kwargs):  # @UnusedVariable  @IgnorePep8
+        if self._stream is not None:
+            if file is not self._fname:
+                raise NineMLSerializationError(
+                    "Can only write to the file that is named in the "
+                    "__init__ method when streaming as the elements are "
+                    "written to it as they are serialized.")
+            if serial_elem is not self.root:
+                raise NineMLSerializationError(
+                    "Only the root element can be written to file when "
+                    "streaming")
+            # Close the root element and flush the remaining output
+            self._stream_root.__exit__(None, None, None)
+            self._xmlfile.__exit__(None, None, None)
+            self._stream = None
+            return
         etree.ElementTree(serial_elem).write(file, encoding=encoding,
                                              pretty_print=pretty_print,
                                              xml_declaration=xml_declaration)
 
+    def abort(self):
+        """
+        Closes the incremental writer of a streamed serialization that has
+        failed. The partially written file is left to the caller to remove
+        """
+        if self._stream is not None:
+            self._stream = None
+            exc_info = (NineMLSerializationError,
+                        NineMLSerializationError("Serialization aborted"),
+                        None)
+            try:
+                if self._stream_root is not None:
+                    self._stream_root.__exit__(*exc_info)
+            finally:
+                self._xmlfile.__exit__(*exc_info)
+
     def to_str(self, serial_elem, pretty_print=False,  # @ReservedAssignment @IgnorePep8
                xml_declaration=False, encoding='UTF-8', **kwargs):  # @UnusedVariable  @IgnorePep8
+        if self._stream is not None:
+            raise NineMLSerializationError(
+                "Cannot convert streamed serialization to a string")
         return bytes_to_native_str(
             etree.tostring(serial_elem, encoding=encoding,
                            pretty_print=pretty_print,
@@ -80,6 +307,7 @@ class XMLUnserializer(BaseUnserializer):
 
     def __init__(self, root, version=None,  # @ReservedAssignment @IgnorePep8
                  url=None, document=None, **kwargs):
+        self._index = None
         super(XMLUnserializer, self).__init__(
             root, version=version, url=url, document=document, **kwargs)
         if self.root is not None:
@@ -129,6 +357,11 @@ class XMLUnserializer(BaseUnserializer):
         return extract_xmlns(serial_elem.tag)
 
     def from_file(self, file):  # @ReservedAssignment
+        if self._lazy:
+            # Index the document-level elements instead of parsing the whole
+            # file so they can be parsed separately when they are loaded
+            self._index = XMLOffsetIndex(file.name)
+            return self._index.root()
         try:
             xml = etree.parse(file)
         except (etree.LxmlError, IOError) as e:
@@ -150,3 +383,23 @@ class XMLUnserializer(BaseUnserializer):
 
     def from_elem(self, serial_elem, **options):  # @UnusedVariable
         return serial_elem
+
+    def _referencing_elems(self, **options):  # @UnusedVariable
+        if self._index is not None:
+            # Only the document-level elements that have been parsed are
+            # available when reading lazily
+            elems = (self._parse_doc_elem(e) for e in self._index.elements)
+        else:
+            elems = [self.root]
+        tags = ['{*}' + t for t in self.reference_types]
+        return (e for elem in elems for e in elem.iter(*tags))
+
+    def _doc_level_children(self):
+        if self._index is None:
+            return super(XMLUnserializer, self)._doc_level_children()
+        return ((strip_prefix(e.tag), e) for e in self._index.elements)
+
+    def _parse_doc_elem(self, serial_elem):
+        if isinstance(serial_elem, IndexedElement):
+            serial_elem = self._index.parse(serial_elem)
+        return serial_elem
@@ -7,6 +7,7 @@ import operator
 from sympy import Symbol
 import sympy
 import math
+import numpy
 from nineml.base import AnnotatedNineMLObject, DocumentLevelObject
 from nineml.exceptions import (
     NineMLUsageError, NineMLDimensionError, NineMLValueError,
@@ -30,21 +31,38 @@ class Dimension(AnnotatedNineMLObject, DocumentLevelObject):
 
     _trailing_numbers_re = re.compile(r'(.*)(\d+)$')
 
+    # Flyweight registry of the exponent tuples of all dimensions. Dimensions
+    # with the same exponents share the same tuple, so they can (usually) be
+    # compared by identity
+    _interned = {}
+
     def __init__(self, name, dimensions=None, **kwargs):
         self._name = validate_identifier(name)
         AnnotatedNineMLObject.__init__(self)
         DocumentLevelObject.__init__(self)
         if dimensions is not None:
             assert len(dimensions) == 7, "Incorrect dimension length"
-            self._dims = tuple(dimensions)
+            dims = tuple(dimensions)
         else:
-            self._dims = tuple(kwargs.pop(d, 0)
-                               for d in self.dimension_symbols)
+            dims = tuple(kwargs.pop(d, 0) for d in self.dimension_symbols)
         assert not len(kwargs), "Unrecognised kwargs ({})".format(kwargs)
+        self._dims = self._interned.setdefault(dims, dims)
+
+    def __eq__(self, other):
+        # Equivalent to the EqualityChecker, which ignores names (and
+        # annotations by default), but compares the exponents directly
+        try:
+            return (type(other) is type(self) and
+                    (other._dims is self._dims or other._dims == self._dims))
+        except AttributeError:
+            return False
 
     def __ne__(self, other):
         return not (self == other)
 
+    def __hash__(self):
+        return hash(self._dims)
+
     def __repr__(self):
         return ("Dimension(name='{}'{})".format(
             self.name, ''.join(' {}={}'.format(n, p) if p != 0 else ''
@@ -156,18 +174,26 @@ class Dimension(AnnotatedNineMLObject, DocumentLevelObject):
 
     def __mul__(self, other):
         "self * other"
-        return Dimension(self.make_name([self.name, other.name]),
-                         dimensions=tuple(s + o for s, o in zip(self, other)))
+        return _derived(
+            ('*', self.name, self._dims, other.name, other._dims),
+            lambda: Dimension(
+                self.make_name([self.name, other.name]),
+                dimensions=tuple(s + o for s, o in zip(self, other))))
 
     def __truediv__(self, other):
         "self / expr"
-        return Dimension(self.make_name([self.name], [other.name]),
-                         dimensions=tuple(s - o for s, o in zip(self, other)))
+        return _derived(
+            ('/', self.name, self._dims, other.name, other._dims),
+            lambda: Dimension(
+                self.make_name([self.name], [other.name]),
+                dimensions=tuple(s - o for s, o in zip(self, other))))
 
     def __pow__(self, power):
         "self ** expr"
-        return Dimension(self.make_name([self.name], power=power),
-                         dimensions=tuple(s * power for s in self))
+        return _derived(
+            ('**', self.name, self._dims, power),
+            lambda: Dimension(self.make_name([self.name], power=power),
+                              dimensions=tuple(s * power for s in self)))
 
     def __div__(self, other):
         return self.__truediv__(other)
@@ -245,11 +271,27 @@ class Dimension(AnnotatedNineMLObject, DocumentLevelObject):
                 powers[str(expr.args[0])] = expr.args[1]
             else:
                 powers[str(expr)] = 1
+        unrecognised = set(powers) - set(self.dimension_symbols)
+        if unrecognised:
+            raise NineMLUsageError(
+                "Unrecognised dimension symbol(s) {}"
+                .format(', '.join(sorted(unrecognised))))
+        return self.from_powers(
+            tuple(powers.get(s, 0) for s in self.dimension_symbols))
+
+    @classmethod
+    def from_powers(cls, powers):
+        """
+        Creates a dimension from the powers of each of the base dimensions
+        (in the order of 'dimension_symbols'), naming it after them
+        """
+        if not any(powers):
+            return dimensionless
         name_num = []
         name_den = []
-        for sym, p in powers.items():
-            name = self.dimension_names[next(
-                i for i, s in enumerate(self.dimension_symbols) if s == sym)]
+        for name, p in zip(cls.dimension_names, powers):
+            if not p:
+                continue
             if abs(p) > 1:
                 name += str(abs(p))
             if p > 0:
@@ -261,7 +303,7 @@ class Dimension(AnnotatedNineMLObject, DocumentLevelObject):
             if name:
                 name += '_'
             name += 'per_' + '_'.join(name_den)
-        return Dimension(name, **powers)
+        return Dimension(name, dimensions=powers)
 
     @property
     def origin(self):
@@ -278,6 +320,10 @@ class Unit(AnnotatedNineMLObject, DocumentLevelObject):
     nineml_attr = ('name', 'power', 'offset')
     nineml_child = {'dimension': Dimension}
 
+    # Flyweight registry of the (exponents, power, offset) tuples that define
+    # the equality of units (see Dimension._interned)
+    _interned = {}
+
     def __init__(self, name, dimension, power, offset=0.0):
         self._name = validate_identifier(name)
         AnnotatedNineMLObject.__init__(self)
@@ -286,10 +332,24 @@ class Unit(AnnotatedNineMLObject, DocumentLevelObject):
         self._dimension = dimension
         self._power = power
         self._offset = offset
+        key = (dimension._dims, power, offset)
+        self._key = self._interned.setdefault(key, key)
+
+    def __eq__(self, other):
+        # Equivalent to the EqualityChecker, which ignores names (and
+        # annotations by default), but compares the defining tuples directly
+        try:
+            return (type(other) is type(self) and
+                    (other._key is self._key or other._key == self._key))
+        except AttributeError:
+            return False
 
     def __ne__(self, other):
         return not (self == other)
 
+    def __hash__(self):
+        return hash(self._key)
+
     def __repr__(self):
         return ("Unit(name='{}', dimension='{}', power={}{})"
                 .format(self.name, self.dimension.name, self.power,
@@ -322,6 +382,7 @@ class Unit(AnnotatedNineMLObject, DocumentLevelObject):
         """
         assert self.dimension == dimension, "dimensions do not match"
         self._dimension = dimension
+        self._mutated()
 
     @property
     def power(self):
@@ -357,9 +418,11 @@ class Unit(AnnotatedNineMLObject, DocumentLevelObject):
                 raise NineMLUsageError(
                     "Can't multiply units with nonzero offsets ({} and {})"
                     .format(self, other))
-            return Unit(Dimension.make_name([self.name, other.name]),
-                        dimension=self.dimension * other.dimension,
-                        power=(self.power + other.power))
+            return _derived(
+                ('*', self.name, self._key, other.name, other._key),
+                lambda: Unit(Dimension.make_name([self.name, other.name]),
+                             dimension=self.dimension * other.dimension,
+                             power=(self.power + other.power)))
         except AttributeError:
             return Quantity(other, self)
 
@@ -370,9 +433,11 @@ class Unit(AnnotatedNineMLObject, DocumentLevelObject):
                 raise NineMLUsageError(
                     "Can't divide units with nonzero offsets ({} and {})"
                     .format(self, other))
-            return Unit(Dimension.make_name([self.name], [other.name]),
-                        dimension=self.dimension / other.dimension,
-                        power=(self.power - other.power))
+            return _derived(
+                ('/', self.name, self._key, other.name, other._key),
+                lambda: Unit(Dimension.make_name([self.name], [other.name]),
+                             dimension=self.dimension / other.dimension,
+                             power=(self.power - other.power)))
         except AttributeError:
             if isinstance(other, (float, int)):
                 inverted = 1.0 / other
@@ -386,9 +451,11 @@ class Unit(AnnotatedNineMLObject, DocumentLevelObject):
             raise NineMLUsageError(
                 "Can't raise units to power with nonzero offsets ({})"
                 .format(self))
-        return Unit(Dimension.make_name([self.name], power=power),
-                    dimension=(self.dimension ** power),
-                    power=(self.power * power))
+        return _derived(
+            ('**', self.name, self._key, power),
+            lambda: Unit(Dimension.make_name([self.name], power=power),
+                         dimension=(self.dimension ** power),
+                         power=(self.power * power)))
 
     def __rmul__(self, other):
         return self.__mul__(other)
@@ -403,6 +470,26 @@ class Unit(AnnotatedNineMLObject, DocumentLevelObject):
         return self.__rtruediv__(other)
 
 
+# Flyweight registry of the dimensions and units derived by arithmetic
+# operations, so that repeated operations on the same dimensions/units (e.g.
+# in parameter sweeps) return the same canonical instance instead of
+# constructing a new one each time. The registry is cleared if it grows past
+# its maximum size
+_derived_registry = {}
+DERIVED_REGISTRY_MAX_SIZE = 10000
+
+
+def _derived(key, create):
+    try:
+        return _derived_registry[key]
+    except KeyError:
+        derived = create()
+        if len(_derived_registry) >= DERIVED_REGISTRY_MAX_SIZE:
+            _derived_registry.clear()
+        _derived_registry[key] = derived
+        return derived
+
+
 class Quantity(AnnotatedNineMLObject):
 
     """
@@ -469,6 +556,39 @@ class Quantity(AnnotatedNineMLObject):
             raise NineMLUsageError(
                 "Cannot get item from random distribution")
 
+    def sample(self, n, seed=None, stream=None):
+        """
+        Expands the value of the quantity into an array of n values (in the
+        units of the quantity), drawing them from the random distribution if
+        the quantity is random (see RandomDistributionValue.sample)
+
+        Parameters
+        ----------
+        n : int
+            The number of values
+        seed : int | numpy.random.Generator | None
+            The seed of the random generator (only used by random values)
+        stream : str | int | tuple(str | int) | None
+            Identifies an independent stream of random numbers, e.g. the name
+            of the population the values are drawn for (only used by random
+            values)
+
+        Returns
+        -------
+        values : numpy.ndarray
+            The values of the quantity
+        """
+        if self.value.is_random():
+            return self.value.sample(n, seed=seed, stream=stream)
+        elif self.value.is_array():
+            if len(self.value) != n:
+                raise NineMLUsageError(
+                    "Cannot expand array quantity of length {} to {} values"
+                    .format(len(self.value), n))
+            return self.value.values
+        else:
+            return numpy.full(n, self.value.value)
+
     def set_units(self, units):
         if units.dimension != self.units.dimension:
             raise NineMLDimensionError(
@@ -476,6 +596,7 @@ class Quantity(AnnotatedNineMLObject):
                 .format(self.units.dimension, units.dimension))
         self._value = self.in_units(units)
         self._units = units
+        self._mutated()
 
     def in_units(self, units):
         """
@@ -633,6 +754,105 @@ class Quantity(AnnotatedNineMLObject):
                      'UnitCurrent': 'i', 'UnitLuminousIntensity': 'j',
                      'UnitSubstance': 'n', 'UnitTemperature': 'k'}
 
+
+class UnitConverter(object):
+    """
+    Converts the values of quantities into a target unit system in bulk, e.g.
+    to pass all the properties of a component to a simulator. The scaling
+    of each unit into the target system is calculated once and reused for all
+    quantities in that unit.
+
+    Units with offsets are interpreted as SI_value = value * 10 ** power +
+    offset.
+
+    Parameters
+    ----------
+    units : dict(Dimension, Unit) | 'SI' | None
+        The units to convert quantities of each dimension into. Quantities of
+        dimensions that are not in the mapping (or all quantities if 'SI' or
+        None) are converted into SI units
+    """
+
+    def __init__(self, units=None):
+        if units is None or units == 'SI':
+            units = {}
+        elif not isinstance(units, dict):
+            raise NineMLUsageError(
+                "Target units must be 'SI' or a dictionary mapping dimensions "
+                "to units ({})".format(units))
+        for dimension, unit in units.items():
+            if unit.dimension != dimension:
+                raise NineMLDimensionError(
+                    "Target units for '{}' dimension ('{}') have a different "
+                    "dimension ('{}')".format(dimension.name, unit.name,
+                                              unit.dimension.name))
+        self._units = dict(units)
+        self._scalings = {}
+
+    def target_units(self, dimension):
+        """
+        The units quantities of the given dimension are converted into (None
+        for SI units)
+        """
+        return self._units.get(dimension)
+
+    def scaling(self, units):
+        """
+        Returns the factor and offset with which values in the given units are
+        converted to the target units, i.e. value * factor + offset
+        """
+        try:
+            return self._scalings[units._key]
+        except KeyError:
+            target = self._units.get(units.dimension)
+            if target is None:
+                power, offset = 0, 0.0
+            else:
+                power, offset = target.power, target.offset
+            scaling = (10.0 ** (units.power - power),
+                       (units.offset - offset) / 10.0 ** power)
+            self._scalings[units._key] = scaling
+            return scaling
+
+    def convert(self, quantity, size=None, seed=None, stream=None):
+        """
+        Converts the value of a quantity into the target units
+
+        Parameters
+        ----------
+        quantity : Quantity
+            The quantity to convert
+        size : int | None
+            The number of values to draw if the quantity is random (see
+            Quantity.sample)
+        seed : int | numpy.random.Generator | None
+            The seed used to draw random values
+        stream : str | int | tuple(str | int) | None
+            Identifies the stream random values are drawn from
+
+        Returns
+        -------
+        value : float | numpy.ndarray
+            The converted value (an array for array and random values)
+        """
+        factor, offset = self.scaling(quantity.units)
+        value = quantity.value
+        if value.is_single():
+            return value.value * factor + offset
+        if value.is_random():
+            if size is None:
+                raise NineMLUsageError(
+                    "Cannot convert random value {} without a size to sample "
+                    "it with".format(value))
+            values = value.sample(size, seed=seed, stream=stream)
+        else:
+            values = value.values
+        converted = values * factor
+        if offset:
+            converted += offset
+        return converted
+
+
 # ----------------- #
 # Common dimensions #
 # ----------------- #
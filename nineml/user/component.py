@@ -63,6 +63,7 @@ class Property(BaseULObject):
         quantity = Quantity.parse(quantity)
         self._name = validate_identifier(name)
         self._quantity = quantity
+        quantity._parent = self
 
     def __iter__(self):
         """For convenient tuple expansion"""
@@ -84,6 +85,8 @@ class Property(BaseULObject):
                 "({}), needs to have dimension {}".format(
                     self.name, qty, qty.units.dimension, self.units.dimension))
         self._quantity = qty
+        qty._parent = self
+        self._mutated()
 
     @property
     def value(self):
@@ -126,6 +129,7 @@ class Property(BaseULObject):
 
     def set_units(self, units):
         self.quantity._units = units
+        self._mutated()
 
 
 class Component(with_metaclass(
@@ -207,6 +211,7 @@ class Component(with_metaclass(
     @name.setter
     def name(self, name):
         self._name = validate_identifier(name)
+        self._mutated()
 
     @abstractmethod
     def get_nineml_type(self):
@@ -254,6 +259,8 @@ class Component(with_metaclass(
                 .format(prop.name, prop.units.dimension.name,
                         param.dimension.name))
         self._properties[prop.name] = prop
+        prop._parent = self
+        self._mutated()
 
     @property
     def attributes_with_units(self):
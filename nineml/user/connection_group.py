@@ -1,5 +1,6 @@
-from builtins import zip
 from abc import ABCMeta, abstractmethod
+from itertools import chain
+import numpy
 from . import BaseULObject
 from nineml.abstraction.connectionrule import (
     explicit_connection_rule, one_to_one_connection_rule)
@@ -7,6 +8,7 @@ from nineml.user.port_connections import EventPortConnection
 from nineml.user.connectionrule import (
     ConnectionRuleProperties, Connectivity, BaseConnectivity)
 from nineml.units import Quantity
+from nineml.values import ArrayValue
 from nineml.abstraction.ports import (
     SendPort, ReceivePort, EventPort, AnalogPort, Port)
 from nineml.user.component_array import ComponentArray
@@ -101,28 +103,35 @@ class BaseConnectionGroup(
                 name=name + '_connectivity',
                 definition=one_to_one_connection_rule)
         else:
+            if projection.connectivity.lib_type == 'Explicit':
+                pre_inds, post_inds = (
+                    projection.connectivity.explicit_indices())
+            else:
+                pre_inds, post_inds = numpy.fromiter(
+                    chain.from_iterable(projection.connections()),
+                    dtype=ArrayValue.INDEX_DTYPES[-1]).reshape(-1, 2).T
             if (port_conn.sender_role == 'pre' and
                     port_conn.receiver_role == 'post'):
-                source_inds, dest_inds = list(zip(*projection.connections()))
+                source_inds, dest_inds = pre_inds, post_inds
             elif (port_conn.sender_role == 'post' and
                   port_conn.receiver_role == 'pre'):
-                source_inds, dest_inds = list(zip(*(
-                    (d, s) for s, d in projection.connections())))
+                source_inds, dest_inds = post_inds, pre_inds
             elif port_conn.sender_role == 'pre':
-                source_inds, dest_inds = list(zip(*(
-                    (s, i) for i, (s, _) in enumerate(
-                        sorted(projection.connections())))))
+                source_inds = numpy.sort(pre_inds, kind='mergesort')
+                dest_inds = numpy.arange(len(source_inds))
             elif port_conn.receiver_role == 'post':
-                source_inds, dest_inds = list(zip(*(
-                    (i, d) for i, (_, d) in enumerate(
-                        sorted(projection.connections())))))
+                dest_inds = post_inds[numpy.lexsort((post_inds, pre_inds))]
+                source_inds = numpy.arange(len(dest_inds))
             else:
                 assert False
             conn_props = ConnectionRuleProperties(
                 name=name + '_connectivity',
                 definition=explicit_connection_rule,
-                properties={'sourceIndices': source_inds,
-                            'destinationIndices': dest_inds})
+                properties={
+                    'sourceIndices': ArrayValue.from_indices(
+                        source_inds, compact=True),
+                    'destinationIndices': ArrayValue.from_indices(
+                        dest_inds, compact=True)})
         # FIXME: This will need to change in version 2, when each connection
         #        has its own delay
         if port_conn.sender_role == 'pre':
@@ -8,7 +8,9 @@ from itertools import repeat
 from random import Random, randint
 from nineml.base import BaseNineMLObject
 from nineml.exceptions import NineMLUsageError, NineMLUsageError
-from nineml.user.component import Component
+from nineml.user.component import Component, Property
+from nineml.units import Quantity
+from nineml.values import ArrayValue
 from future.utils import with_metaclass
 
 
@@ -18,9 +20,39 @@ class ConnectionRuleProperties(Component):
     """
     nineml_type = 'ConnectionRuleProperties'
 
+    # Properties of explicit connection rules that hold the indices of the
+    # connected cells, which are stored in integer arrays
+    index_properties = ('sourceIndices', 'destinationIndices')
+
+    def __init__(self, name, definition, properties={}):
+        super(ConnectionRuleProperties, self).__init__(name, definition,
+                                                       properties)
+        for prop in list(self.properties):
+            self._properties[prop.name] = self._as_index_property(prop)
+
     def get_nineml_type(self):
         return self.nineml_type
 
+    def set(self, prop):
+        super(ConnectionRuleProperties, self).set(
+            self._as_index_property(prop))
+
+    def _as_index_property(self, prop):
+        """
+        Converts the values of index properties of explicit connection rules
+        to integer arrays
+        """
+        if (self.lib_type == 'Explicit' and
+                prop.name in self.index_properties and
+                not prop.value.is_random()):
+            value = prop.value
+            if value.is_single():
+                value = [value.value]
+            prop = Property(prop.name,
+                            Quantity(ArrayValue.from_indices(value),
+                                     prop.units))
+        return prop
+
     @property
     def standard_library(self):
         return self.component_class.standard_library
@@ -168,9 +200,27 @@ class Connectivity(BaseConnectivity):
         return ((i, i) for i in range(self._source_size))
 
     def _explicit_connection_list(self):  # @UnusedVariable
-        return zip(
-            self._rule_properties.property('sourceIndices').value.values,
-            self._rule_properties.property('destinationIndices').value.values)
+        return zip(*self.explicit_indices())
+
+    def explicit_indices(self):
+        """
+        Returns the integer arrays of source and destination indices of an
+        explicit connection rule without copying them (e.g. for handing them
+        over to a simulator)
+
+        Returns
+        -------
+        source_indices : numpy.ndarray
+            The indices of the sources of each connection
+        destination_indices : numpy.ndarray
+            The indices of the destinations of each connection
+        """
+        if self.lib_type != 'Explicit':
+            raise NineMLUsageError(
+                "Cannot get explicit indices of '{}' connectivity"
+                .format(self.lib_type))
+        return tuple(self._rule_properties.property(n).value.values
+                     for n in ConnectionRuleProperties.index_properties)
 
     def _probabilistic_connectivity(self):  # @UnusedVariable
         # Reinitialize the connectivity generator with the same RNG so that
@@ -1,9 +1,11 @@
+from collections import OrderedDict
 from itertools import chain
 from nineml.user.component import Property, Component, Prototype, Definition
 from nineml.exceptions import (
     NineMLUsageError, NineMLNameError, name_error, NineMLUnitMismatchError)
 from nineml.base import (
     ContainerObject, DynamicPortsObject)
+from nineml.units import UnitConverter
 
 
 class Initial(Property):
@@ -141,6 +143,7 @@ class DynamicsProperties(Component, DynamicPortsObject):
                 .format(regime_name, self.component_class.name,
                         "', '".join(self.component_class.regime_names)))
         self._initial_regime = regime_name
+        self._mutated()
 
     def set(self, prop):
         try:
@@ -159,6 +162,8 @@ class DynamicsProperties(Component, DynamicPortsObject):
                     .format(prop.name, prop.units.dimension.name,
                             state_variable.dimension.name))
             self._initial_values[prop.name] = prop
+            prop._parent = self
+            self._mutated()
 
     @property
     def initial_value_names(self):
@@ -179,6 +184,42 @@ class DynamicsProperties(Component, DynamicPortsObject):
                 v.value.distribution.properties for v in self.initial_values
                 if v.value.is_random()])
 
+    def values_in_units(self, units=None, size=None, seed=None,
+                        stream=None):
+        """
+        Converts all properties and initial values into a target unit system
+        in a single pass (see UnitConverter), e.g. to pass them to a
+        simulator.
+
+        Parameters
+        ----------
+        units : dict(Dimension, Unit) | 'SI' | UnitConverter | None
+            The units to convert the values of each dimension into. Dimensions
+            that are not in the mapping are converted into SI units
+        size : int | None
+            The number of values to draw for random values. If None, random
+            values raise an error
+        seed : int | numpy.random.Generator | None
+            The seed used to draw random values
+        stream : str | int | tuple(str | int) | None
+            Identifies the stream random values are drawn from (e.g. the name
+            of a population)
+
+        Returns
+        -------
+        values : OrderedDict(str, float | numpy.ndarray)
+            The converted values of the properties followed by the initial
+            values, keyed by their names
+        """
+        if not isinstance(units, UnitConverter):
+            units = UnitConverter(units)
+        return OrderedDict(
+            (p.name, units.convert(p.quantity, size=size, seed=seed,
+                                   stream=(stream, p.name)
+                                   if stream is not None else p.name))
+            for p in chain(sorted(self.properties, key=lambda p: p.name),
+                           sorted(self.initial_values, key=lambda p: p.name)))
+
     def elements(self, local=False):
         """
         Overrides the elements method in ContainerObject base class to allow
@@ -1,5 +1,6 @@
 import re
 import math
+from collections import OrderedDict
 from itertools import chain
 from .component import Property
 import nineml.units as un
@@ -114,6 +115,33 @@ class Network(BaseULObject, DocumentLevelObject, ContainerObject):
             components.extend(p.all_components())
         return components
 
+    def values_in_units(self, units=None, seed=None):
+        """
+        Converts the properties and initial values of the cells of all
+        populations in the network into a target unit system (see
+        Population.values_in_units). The scaling of each unit is calculated
+        once for the whole network.
+
+        Parameters
+        ----------
+        units : dict(Dimension, Unit) | 'SI' | UnitConverter | None
+            The units to convert the values of each dimension into. Dimensions
+            that are not in the mapping are converted into SI units
+        seed : int | None
+            The seed used to draw random values
+
+        Returns
+        -------
+        values : OrderedDict(str, OrderedDict(str, float | numpy.ndarray))
+            The converted values of each population keyed by the population
+            name
+        """
+        if not isinstance(units, un.UnitConverter):
+            units = un.UnitConverter(units)
+        return OrderedDict((p.name, p.values_in_units(units, seed=seed))
+                           for p in sorted(self.populations,
+                                           key=lambda p: p.name))
+
     def resample_connectivity(self, *args, **kwargs):
         for projection in self.projections:
             projection.resample_connectivity(*args, **kwargs)
@@ -54,6 +54,7 @@ class Population(BaseULObject, DocumentLevelObject, DynamicPortsObject):
     @size.setter
     def size(self, size):
         self._size = int(size)
+        self._mutated()
 
     @property
     def cell(self):
@@ -88,6 +89,30 @@ class Population(BaseULObject, DocumentLevelObject, DynamicPortsObject):
     def attributes_with_units(self):
         return chain(*[c.attributes_with_units for c in self.all_components()])
 
+    def values_in_units(self, units=None, seed=None):
+        """
+        Converts all properties and initial values of the cell into a target
+        unit system in a single pass (see DynamicsProperties.values_in_units).
+        Random values are expanded into arrays of the size of the population,
+        drawn from a stream specific to the population.
+
+        Parameters
+        ----------
+        units : dict(Dimension, Unit) | 'SI' | UnitConverter | None
+            The units to convert the values of each dimension into. Dimensions
+            that are not in the mapping are converted into SI units
+        seed : int | None
+            The seed used to draw random values
+
+        Returns
+        -------
+        values : OrderedDict(str, float | numpy.ndarray)
+            The converted values keyed by the names of the properties and
+            initial values
+        """
+        return self.cell.values_in_units(units, size=self.size, seed=seed,
+                                         stream=self.name)
+
     def serialize_node(self, node, **options):
         node.attr('name', self.name, **options)
         node.attr('Size', self.size, in_body=True, **options)
@@ -4,8 +4,10 @@ library.
 """
 from __future__ import absolute_import
 
-from .path import join_norm, restore_sys_path, is_file_handle
-from .equality import nearly_equal, xml_equal
+from .path import (
+    join_norm, restore_sys_path, is_file_handle, replace_file)
+from .equality import (
+    nearly_equal, nearly_equal_arrays, round_mantissas, xml_equal)
 from .validation import (
     check_inferred_against_declared, validate_identifier,
     assert_no_duplicates)
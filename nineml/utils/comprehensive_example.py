@@ -5,6 +5,7 @@ comprehensive testing over all 9ML elements
 from __future__ import absolute_import
 from past.builtins import basestring
 import pkgutil
+import numpy
 from collections import defaultdict
 from itertools import chain
 import nineml
@@ -535,7 +536,8 @@ def add_with_sub_elements(element):
     Recursively adds 9ML elements from the example document to a dictionary
     sorted by 9ML types
     """
-    if isinstance(element, (basestring, Document)) or element in loading:
+    if (isinstance(element, (basestring, Document, numpy.ndarray,
+                             numpy.dtype)) or element in loading):
         return
     if not isinstance(element, (dict, list, tuple, int, float, str,
                                 sympy.Basic, Connectivity)):
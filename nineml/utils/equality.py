@@ -3,6 +3,7 @@ from builtins import zip
 import re
 import math
 from logging import getLogger
+import numpy
 
 logger = getLogger('NineML')
 
@@ -17,6 +18,87 @@ def nearly_equal(float1, float2, places=15):
     return (round(mantissa1, places) == round(mantissa2, places) and
             exp1 == exp2)
 
+
+def round_mantissas(values, places=15):
+    """
+    Vectorized version of the rounding used by `nearly_equal`, which splits
+    each value into its mantissa and exponent and rounds the mantissa to the
+    given number of decimal places. The rounded mantissas are identical to
+    those returned by the built-in 'round' function.
+
+    Parameters
+    ----------
+    values : numpy.ndarray | iterable(float)
+        The values to round
+    places : int
+        The number of decimal places to round the mantissas to
+
+    Returns
+    -------
+    mantissas : numpy.ndarray(float)
+        The rounded mantissas
+    exponents : numpy.ndarray(int)
+        The (binary) exponents
+    """
+    mantissas, exponents = numpy.frexp(numpy.asarray(values, dtype=float))
+    # The scaled mantissas need to be exactly representable as integers
+    if 0 <= places <= 15:
+        scale = 10.0 ** places
+        with numpy.errstate(invalid='ignore'):
+            abs_mantissas = numpy.abs(mantissas)
+            scaled = abs_mantissas * scale
+            # The fraction that is rounded away is calculated from the exact
+            # product of the mantissa and the scale (i.e. including the error
+            # of the floating point multiplication) so that the rounding
+            # direction matches that of the built-in 'round'
+            whole = numpy.floor(scaled)
+            fraction = ((scaled - whole) +
+                        _product_error(abs_mantissas, scale, scaled))
+            rounded = numpy.copysign((whole + (fraction > 0.5)) / scale,
+                                     mantissas)
+            # Ties (rounded to even by 'round') and non-finite values
+            fallback = ~(numpy.abs(fraction - 0.5) > 2.0 ** -50)
+    else:
+        rounded = numpy.empty_like(mantissas)
+        fallback = numpy.ones(mantissas.shape, dtype=bool)
+    for i in numpy.flatnonzero(fallback):
+        rounded.flat[i] = round(float(mantissas.flat[i]), places)
+    return rounded, exponents
+
+
+def nearly_equal_arrays(values1, values2, places=15):
+    """
+    Vectorized version of `nearly_equal` that determines whether all the
+    values in two arrays are nearly equal
+    """
+    values1 = numpy.asarray(values1)
+    values2 = numpy.asarray(values2)
+    if values1.shape != values2.shape:
+        return False
+    if numpy.array_equal(values1, values2):
+        return True  # Exactly equal values are also nearly equal
+    mantissas1, exponents1 = round_mantissas(values1, places)
+    mantissas2, exponents2 = round_mantissas(values2, places)
+    return bool(numpy.array_equal(exponents1, exponents2) and
+                numpy.array_equal(mantissas1, mantissas2))
+
+
+def _product_error(a, b, product):
+    """
+    The rounding error of the floating point product of a and b (Dekker's
+    TwoProduct algorithm)
+    """
+    a_high, a_low = _split(a)
+    b_high, b_low = _split(b)
+    return (((a_high * b_high - product) + a_high * b_low +
+             a_low * b_high) + a_low * b_low)
+
+
+def _split(a):
+    c = 134217729.0 * a  # 2 ** 27 + 1
+    high = c - (c - a)
+    return high, a - high
+
 # Extracts the xmlns from an lxml element tag
 xmlns_re = re.compile(r'\{(.*)\}(.*)')
 
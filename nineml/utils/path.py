@@ -2,6 +2,7 @@ from __future__ import absolute_import
 from io import IOBase
 from future.utils import PY3
 from os.path import normpath, join
+import os
 import sys
 
 
@@ -29,3 +30,15 @@ def is_file_handle(handle):
         return isinstance(handle, IOBase)
     else:
         return isinstance(handle, file)
+
+
+def replace_file(src, dst):
+    """
+    Moves the file at 'src' to 'dst', overwriting 'dst' atomically if it
+    exists. On Python 2, which doesn't have 'os.replace', existing files can't
+    be overwritten on Windows.
+    """
+    if PY3:
+        os.replace(src, dst)
+    else:
+        os.rename(src, dst)
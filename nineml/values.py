@@ -1,20 +1,23 @@
 from __future__ import division
 from future import standard_library
 standard_library.install_aliases()
-from builtins import zip  # @IgnorePep8
 from .base import AnnotatedNineMLObject  # @IgnorePep8
 from abc import ABCMeta  # @IgnorePep8
 from urllib.request import urlopen  # @IgnorePep8
+from io import BytesIO  # @IgnorePep8
+import os.path  # @IgnorePep8
 import contextlib  # @IgnorePep8
+import weakref  # @IgnorePep8
 import collections  # @IgnorePep8
+import zlib  # @IgnorePep8
 import sympy  # @IgnorePep8
 import itertools  # @IgnorePep8
-from operator import itemgetter  # @IgnorePep8
 import numpy  # @IgnorePep8
 import nineml  # @IgnorePep8
 from nineml.exceptions import (  # @IgnorePep8
     NineMLUsageError, NineMLValueError, NineMLSerializationError)
 from future.utils import with_metaclass  # @IgnorePep8
+from past.builtins import basestring  # @IgnorePep8
 
 # =============================================================================
 # Operator argument decorators
@@ -246,103 +249,394 @@ class ArrayValue(BaseValue):
 
     DataFile = collections.namedtuple('DataFile', 'url mimetype, columnName')
 
-    def __init__(self, values, datafile=None):
+    # Holds arrays loaded from external data files so they can be shared
+    # between all ArrayValues that reference the same file
+    data_registry = {}
+
+    # Mimetypes and file extensions of the binary formats that are
+    # memory-mapped instead of being read into memory
+    BINARY_FORMATS = {'application/x-npy': 'npy',
+                      'application/npy': 'npy',
+                      'application/octet-stream': 'raw',
+                      '.npy': 'npy',
+                      '.bin': 'raw',
+                      '.raw': 'raw'}
+
+    # The data type of the values in 'raw' binary files
+    RAW_DTYPE = numpy.dtype('<f8')
+
+    # The data types the values can be stored in and the one used when values
+    # aren't provided as a NumPy array of one of these types
+    DTYPES = tuple(numpy.dtype(t) for t in ('float32', 'float64', 'int32',
+                                            'int64'))
+    DEFAULT_DTYPE = numpy.dtype('float64')
+
+    # The data types used to store integer indices (e.g. of the cells connected
+    # by an explicit connection rule), in order of preference
+    INDEX_DTYPES = (numpy.dtype('int32'), numpy.dtype('int64'))
+
+    # Whether the values are indices, which are checked to be non-negative
+    # integers when they are loaded from an external data file
+    _indices = False
+
+    def __init__(self, values=None, datafile=None, relative_to=None,
+                 dtype=None):
+        """
+        Parameters
+        ----------
+        values : numpy.ndarray | iterable(float) | None
+            The values of the array. Not required if a data file is provided
+        datafile : tuple(str, str, str) | None
+            The URL, mimetype and column name of an external data file the
+            values are loaded from when they are first accessed
+        relative_to : str | None
+            The directory relative data file paths are resolved against
+        dtype : numpy.dtype | str | None
+            The data type the values are stored in (one of float32, float64,
+            int32 or int64). If None, the data type of the values is kept if
+            they are provided as a NumPy array of one of these types,
+            otherwise float64 is used
+        """
         super(ArrayValue, self).__init__()
-        try:
-            self._values = values.astype(float)  # If NumPy array
-        except AttributeError:
-            try:
-                self._values = [float(v) for v in values]
-            except (TypeError, ValueError):
-                raise NineMLValueError(
-                    "Values provided to ArrayValue ({}) could not be "
-                    "converted to a list of floats"
-                    .format(type(values)))
+        self._dtype = self._check_dtype(dtype)
         if datafile is None:
             self._datafile = None
         else:
             self._datafile = self.DataFile(*datafile)
+        self._relative_to = relative_to
+        if values is None:
+            if self._datafile is None:
+                raise NineMLValueError(
+                    "Either values or a data file need to be provided to "
+                    "ArrayValue")
+            self._values = None  # Loaded when first accessed
+        else:
+            self._values = self._convert_values(values, self._dtype)
+
+    @classmethod
+    def _check_dtype(cls, dtype):
+        if dtype is None:
+            return None
+        try:
+            dtype = numpy.dtype(dtype)
+        except TypeError:
+            dtype = None
+        if dtype is None or dtype not in cls.DTYPES:
+            raise NineMLValueError(
+                "Unsupported data type for ArrayValue ({}), can be one of "
+                "'{}'".format(dtype, "', '".join(str(t) for t in cls.DTYPES)))
+        return dtype
+
+    @classmethod
+    def _convert_values(cls, values, dtype=None):
+        """
+        Converts the values to a contiguous 1D NumPy array of the given data
+        type. Arrays that are already contiguous and of the right type (e.g.
+        memory-mapped arrays) are used as is without being copied.
+        """
+        if dtype is None:
+            dtype = getattr(values, 'dtype', None)
+            # NB: NumPy treats None as float64 in dtype comparisons
+            if dtype is None or dtype not in cls.DTYPES:
+                dtype = cls.DEFAULT_DTYPE
+        try:
+            values = numpy.require(values, dtype=dtype, requirements='C')
+        except (TypeError, ValueError):
+            values = None
+        if values is None or values.ndim != 1:
+            raise NineMLValueError(
+                "Values provided to ArrayValue could not be converted to a "
+                "1D array of {}".format(dtype))
+        return values
+
+    @classmethod
+    def from_indices(cls, indices, compact=False):
+        """
+        Creates an ArrayValue that stores integer indices in int32 (or int64
+        if the largest index doesn't fit into int32). Indices that are already
+        stored in a contiguous int32 or int64 array are used without copying
+        them unless ``compact`` is set.
+
+        Parameters
+        ----------
+        indices : ArrayValue | numpy.ndarray | iterable(int)
+            The indices to store. Floating point values are accepted if they
+            are integral
+        compact : bool
+            Whether int64 indices are converted to int32 if they fit into it
+
+        Returns
+        -------
+        array_value : ArrayValue
+            The array value holding the indices
+        """
+        if isinstance(indices, ArrayValue) and indices.datafile is not None:
+            # Keep the reference to the external data file, the values are
+            # checked and converted to int64 when they are loaded
+            values = indices._values
+            if values is not None:
+                cls._check_indices(values)
+            array_value = cls(values=values, datafile=indices.datafile,
+                              relative_to=indices._relative_to,
+                              dtype=cls.INDEX_DTYPES[-1])
+            array_value._indices = True
+            return array_value
+        indices, dtype = cls._check_indices(indices, compact=compact)
+        return cls(indices, dtype=dtype)
+
+    @classmethod
+    def _check_indices(cls, indices, compact=False):
+        """
+        Checks that the indices are non-negative integers and returns them as
+        a NumPy array along with the data type they should be stored in (see
+        'from_indices')
+        """
+        try:
+            indices = numpy.asarray(indices)
+        except (TypeError, ValueError):
+            indices = None
+        if (indices is None or indices.ndim != 1 or
+                indices.dtype.kind not in 'uif'):
+            raise NineMLValueError(
+                "Indices provided to ArrayValue could not be converted to a "
+                "1D array of integers")
+        if indices.dtype in cls.INDEX_DTYPES and not (
+                compact and indices.dtype != cls.INDEX_DTYPES[0]):
+            dtype = indices.dtype
+        else:
+            if not len(indices):
+                dtype = cls.INDEX_DTYPES[0]
+            else:
+                if indices.dtype.kind == 'f' and not numpy.array_equal(
+                        indices, numpy.floor(indices)):
+                    raise NineMLValueError(
+                        "Indices provided to ArrayValue are not integers")
+                max_index = indices.max()
+                dtype = next(
+                    (t for t in cls.INDEX_DTYPES
+                     if max_index <= numpy.iinfo(t).max), None)
+                if dtype is None:
+                    raise NineMLValueError(
+                        "Indices provided to ArrayValue are too large ({}) to "
+                        "be stored in an integer array".format(max_index))
+        if len(indices) and indices.min() < 0:
+            raise NineMLValueError(
+                "Indices provided to ArrayValue are negative")
+        return indices, dtype
 
     @property
     def values(self):
+        if self._values is None:
+            values = self.load_datafile(
+                self._datafile.url, mimetype=self._datafile.mimetype,
+                column_name=self._datafile.columnName,
+                relative_to=self._relative_to)
+            if self._indices:
+                values, _ = self._check_indices(values)
+            self._values = self._convert_values(values, self._dtype)
         return self._values
 
+    @property
+    def dtype(self):
+        return self.values.dtype
+
+    @property
+    def datafile(self):
+        return self._datafile
+
+    @property
+    def loaded(self):
+        """
+        Whether the values of an ArrayValue that references an external data
+        file have been loaded yet
+        """
+        return self._values is not None
+
     @property
     def key(self):
         # TODO: Should put a hash on the end of this to make it unique
-        return str('_'.join(str(v) for v in self._values[:10]))
+        return str('_'.join(str(v) for v in self.values[:10]))
 
     def is_array(self):
         return True
 
     def __iter__(self):
-        return iter(self._values)
+        return iter(self.values)
 
     def __getitem__(self, index):
-        return self._values[index]
+        return self.values[index]
 
     def __len__(self):
-        return len(self._values)
+        return len(self.values)
 
     def __repr__(self):
         return "ArrayValue({}{})".format(
-            ', '.join(str(v) for v in self._values[:5]),
+            ', '.join(str(v) for v in self.values[:5]),
             ('...' if len(self) >= 5 else ''))
 
+    def __array__(self, dtype=None, copy=None):
+        # 'copy' follows the NumPy 2 protocol: True always copies, False
+        # never copies (raising ValueError if a copy is required) and None
+        # only copies if required
+        values = self.values
+        if dtype is not None and numpy.dtype(dtype) != values.dtype:
+            if copy is False:
+                raise ValueError(
+                    "Unable to avoid copy while converting ArrayValue of {} "
+                    "to {}".format(values.dtype, numpy.dtype(dtype)))
+            return values.astype(dtype)
+        if copy:
+            return values.copy()
+        return values
+
     def inverse(self):
+        return ArrayValue(1.0 / self.values)
+
+    @classmethod
+    def load_datafile(cls, url, mimetype=None, column_name=None,
+                      relative_to=None):
+        """
+        Loads the values stored in an external data file. Binary formats
+        (NumPy '.npy' files and raw little-endian float64 files) are
+        memory-mapped, whereas text formats are parsed, using the first row as
+        the column names if it is non-numeric. Loaded arrays are held in a
+        registry keyed on the URL and modification time of the file so that
+        the same buffer is shared between all ArrayValues that reference it.
+
+        Parameters
+        ----------
+        url : str
+            The URL or file path of the data file
+        mimetype : str | None
+            The mimetype of the data file. If None (or not recognised) the
+            format is determined from the file extension
+        column_name : str | None
+            The name of the column to select from the data file (a field of a
+            structured '.npy' array or a column header of a text file)
+        relative_to : str | None
+            The directory relative file paths are resolved against
+
+        Returns
+        -------
+        values : numpy.ndarray
+            The values of the array (or selected column)
+        """
+        serialization = nineml.serialization
+        if serialization.file_path_re.match(url) is not None:
+            if url.startswith('.'):
+                url = os.path.abspath(os.path.join(
+                    relative_to if relative_to is not None else os.getcwd(),
+                    url))
+            mtime = os.path.getmtime(url)
+            is_local = True
+        elif serialization.url_re.match(url) is not None:
+            mtime = None  # Cannot load mtime of a general URL
+            is_local = False
+        else:
+            raise NineMLValueError(
+                "'{}' is not a valid URL or file path for an external data "
+                "file (NB: relative file paths must start with './')"
+                .format(url))
+        data_format = cls.BINARY_FORMATS.get(
+            mimetype, cls.BINARY_FORMATS.get(
+                os.path.splitext(url)[1].lower(), 'text'))
+        try:  # Try to use previously loaded data
+            data_ref, loaded_mtime, loaded_format = cls.data_registry[url]
+            data = data_ref()
+            if (data is None or loaded_mtime != mtime or
+                    loaded_format != data_format):
+                raise KeyError(url)
+        except KeyError:
+            if data_format == 'npy':
+                if is_local:
+                    data = numpy.load(url, mmap_mode='r')
+                else:
+                    with contextlib.closing(urlopen(url)) as f:
+                        data = numpy.load(BytesIO(f.read()))
+            elif data_format == 'raw':
+                if is_local:
+                    data = numpy.memmap(url, dtype=cls.RAW_DTYPE, mode='r')
+                else:
+                    with contextlib.closing(urlopen(url)) as f:
+                        data = numpy.frombuffer(f.read(), dtype=cls.RAW_DTYPE)
+            else:
+                with contextlib.closing(
+                        open(url, 'rb') if is_local else urlopen(url)) as f:
+                    data = cls._parse_text_data(
+                        f.read().decode('utf-8'), mimetype, url)
+            cls.data_registry[url] = weakref.ref(data), mtime, data_format
+        if column_name is not None:
+            if data.dtype.names is None:
+                raise NineMLValueError(
+                    "Cannot select column '{}' from data file '{}' as it does "
+                    "not have named columns".format(column_name, url))
+            try:
+                data = data[column_name]
+            except ValueError:
+                raise NineMLValueError(
+                    "Column '{}' was not found in data file '{}' (found "
+                    "'{}')".format(column_name, url,
+                                   "', '".join(data.dtype.names)))
+        return data
+
+    @classmethod
+    def _parse_text_data(cls, text, mimetype, url):
+        if mimetype == 'text/csv' or url.lower().endswith('.csv'):
+            delimiter = ','
+        else:
+            delimiter = None
+        lines = text.splitlines()
         try:
-            return ArrayValue(1.0 / self._values)
-        except AttributeError:
-            return ArrayValue(1.0 / v for v in self._values)
+            first_row = next(l for l in lines
+                             if l.strip() and not l.lstrip().startswith('#'))
+        except StopIteration:
+            return numpy.empty(0)
+        try:
+            [float(v) for v in first_row.split(delimiter)]
+        except ValueError:
+            # Use the first row as the column names
+            table = numpy.atleast_1d(numpy.genfromtxt(
+                lines, delimiter=delimiter, names=True, dtype=float,
+                autostrip=True))
+            # The columns are stored contiguously in a single buffer (as
+            # sub-array fields of a 0D structured array) so that the selected
+            # columns can be referenced without copying them, and keep the
+            # buffer alive in the data registry
+            columns = numpy.empty((), dtype=[(n, float, table.shape)
+                                             for n in table.dtype.names])
+            for name in table.dtype.names:
+                columns[name] = table[name]
+            return columns
+        return numpy.loadtxt(lines, delimiter=delimiter)
 
     def serialize_node(self, node, **options):  # @UnusedVariable
         if self._datafile is None:
-            for i, value in enumerate(self._values):
-                row_elem = node.visitor.create_elem(
-                    'ArrayValueRow', parent=node.serial_element, multiple=True,
-                    **options)
-                node.visitor.set_attr(row_elem, 'index', i)
-                node.visitor.set_attr(row_elem, 'value', value)
+            node.visitor.set_array(node.serial_element, 'ArrayValueRow',
+                                   self.values, **options)
         else:
-            node.attr('url', self.url, **options)
-            node.attr('mimetype', self.mimetype, **options)
-            node.attr('columnName', self.columnName, **options)
+            node.attr('url', self._datafile.url, **options)
+            node.attr('mimetype', self._datafile.mimetype, **options)
+            if self._datafile.columnName is not None:
+                node.attr('columnName', self._datafile.columnName, **options)
 
     @classmethod
     def unserialize_node(cls, node, **options):  # @UnusedVariable
-        if node.name == 'ExternalArrayValue':
-            url = node.attr('url', **options)
-            with contextlib.closing(urlopen(url)) as f:
-                # FIXME: Should use a non-numpy version of this load function
-                values = numpy.loadtxt(f)
-            return cls(values, (node.attr('url', **options),
-                                node.attr('mimetype', **options),
-                                node.attr('columnName', **options)))
+        if (node.name == 'ExternalArrayValue' or 'url' in
+                node.visitor.get_attr_keys(node.serial_element, **options)):
+            # The values are only loaded from the data file when accessed
+            if node.visitor.url is not None:
+                relative_to = os.path.dirname(node.visitor.url)
+            else:
+                relative_to = None
+            return cls(datafile=(node.attr('url', **options),
+                                 node.attr('mimetype', **options),
+                                 node.attr('columnName', default=None,
+                                           **options)),
+                       relative_to=relative_to)
         else:
-            rows = []
-            for name, elem in node.visitor.get_all_children(
-                    node.serial_element, **options):
-                if name != 'ArrayValueRow':
-                    raise NineMLSerializationError(
-                        "Unrecognised element {} found in ArrayValue"
-                        .format(name))
-                rows.append((
-                    int(node.visitor.get_attr(elem, 'index', **options)),
-                    float(node.visitor.get_attr(elem, 'value', **options))))
-                node.unprocessed_children.discard('ArrayValueRow')
-            sorted_rows = sorted(rows, key=itemgetter(0))
-            indices, values = list(zip(*sorted_rows))
-            if indices[0] < 0:
-                raise NineMLSerializationError(
-                    "Negative indices found in array rows")
-            if len(list(itertools.groupby(indices))) != len(indices):
-                groups = [list(g) for g in itertools.groupby(indices)]
-                raise NineMLSerializationError(
-                    "Duplicate indices ({}) found in array rows".format(
-                        ', '.join(str(g[0]) for g in groups if len(g) > 1)))
-            if indices[-1] >= len(indices):
-                raise NineMLSerializationError(
-                    "Indices greater or equal to the number of array rows")
+            values = node.visitor.get_array(node.serial_element,
+                                            'ArrayValueRow', **options)
+            node.unprocessed_children.discard('ArrayValueRow')
             return cls(values)
 
     # =========================================================================
@@ -351,7 +645,7 @@ class ArrayValue(BaseValue):
     # =========================================================================
 
     def _sympy_(self):
-        return sympy.Matrix(self._values)
+        return sympy.Matrix(self.values)
 
     def __float__(self):
         raise TypeError(
@@ -359,31 +653,19 @@ class ArrayValue(BaseValue):
 
     @parse_float_operand
     def __add__(self, num):
-        try:
-            return ArrayValue(self._values + num)  # if numpy array
-        except TypeError:
-            return ArrayValue([float(v + num) for v in self._values])
+        return ArrayValue(self.values + num)
 
     @parse_float_operand
     def __sub__(self, num):
-        try:
-            return ArrayValue(self._values - num)  # if numpy array
-        except TypeError:
-            return ArrayValue([float(v - num) for v in self._values])
+        return ArrayValue(self.values - num)
 
     @parse_float_operand
     def __mul__(self, num):
-        try:
-            return ArrayValue(self._values * num)  # if numpy array
-        except TypeError:
-            return ArrayValue([float(v * num) for v in self._values])
+        return ArrayValue(self.values * num)
 
     @parse_float_operand
     def __truediv__(self, num):
-        try:
-            return ArrayValue(self._values.__truediv__(num))  # if numpy array
-        except AttributeError:
-            return ArrayValue([float(v / num) for v in self._values])
+        return ArrayValue(self.values / num)
 
     @parse_float_operand
     def __div__(self, num):
@@ -391,45 +673,29 @@ class ArrayValue(BaseValue):
 
     @parse_float_operand
     def __pow__(self, power):
-        try:
-            return ArrayValue(self._values ** power)  # if numpy array
-        except TypeError:
-            return ArrayValue([float(v ** power) for v in self._values])
+        return ArrayValue(self.values ** power)
 
     @parse_float_operand
     def __floordiv__(self, num):
-        try:
-            return ArrayValue(self._values // num)  # if numpy array
-        except TypeError:
-            return ArrayValue([float(v // num) for v in self._values])
+        return ArrayValue(self.values // num)
 
     @parse_float_operand
     def __mod__(self, num):
-        try:
-            return ArrayValue(self._values % num)  # if numpy array
-        except TypeError:
-            return ArrayValue([float(v % num) for v in self._values])
+        return ArrayValue(self.values % num)
 
     def __radd__(self, num):
         return self.__add__(num)
 
     @parse_float_operand
     def __rsub__(self, num):
-        try:
-            return ArrayValue(num - self._values)  # if numpy array
-        except TypeError:
-            return ArrayValue([float(num - v) for v in self._values])
+        return ArrayValue(num - self.values)
 
     def __rmul__(self, num):
         return self.__mul__(num)
 
     @parse_float_operand
     def __rtruediv__(self, num):
-        try:
-            return ArrayValue(self._values.__rtruediv__(num))  # if np
-        except AttributeError:
-            return ArrayValue([float(num.__truediv__(v))
-                               for v in self._values])
+        return ArrayValue(num / self.values)
 
     @parse_float_operand
     def __rdiv__(self, num):
@@ -437,64 +703,40 @@ class ArrayValue(BaseValue):
 
     @parse_float_operand
     def __rpow__(self, num):
-        try:
-            return ArrayValue(self._values.__rpow__(num))  # if numpy array
-        except AttributeError:
-            return ArrayValue([float(num ** v) for v in self._values])
+        return ArrayValue(num ** self.values)
 
     @parse_float_operand
     def __rfloordiv__(self, num):
-        try:
-            return ArrayValue(self._values.__rfloordiv__(num))  # if numpy arr.
-        except AttributeError:
-            return ArrayValue([float(num // v) for v in self._values])
+        return ArrayValue(num // self.values)
 
     @parse_float_operand
     def __rmod__(self, num):
-        try:
-            return ArrayValue(self._values.__rmod__(num))  # if numpy array
-        except AttributeError:
-            return ArrayValue([float(num % v) for v in self._values])
+        return ArrayValue(num % self.values)
 
     def __neg__(self):
-        try:
-            return ArrayValue(self._values.__neg__())  # if numpy array
-        except AttributeError:
-            return ArrayValue([-v for v in self._values])
+        return ArrayValue(-self.values)
 
     def __abs__(self):
-        try:
-            return ArrayValue(self._values.__abs__())
-        except AttributeError:
-            return ArrayValue([abs(v) for v in self._values])
+        return ArrayValue(numpy.abs(self.values))
+
+    def __round__(self, n=0):
+        return ArrayValue(numpy.round(self.values, n))
 
     @parse_float_operand
     def __lt__(self, other):
-        try:
-            return ArrayValue(self._values.__lt__(other))
-        except AttributeError:
-            return ArrayValue([v < other for v in self._values])
+        return ArrayValue(self.values < other)
 
     @parse_float_operand
     def __le__(self, other):
-        try:
-            return ArrayValue(self._values.__le__(other))
-        except AttributeError:
-            return ArrayValue([v <= other for v in self._values])
+        return ArrayValue(self.values <= other)
 
     @parse_float_operand
     def __ge__(self, other):
-        try:
-            return ArrayValue(self._values.__ge__(other))
-        except AttributeError:
-            return ArrayValue([v >= other for v in self._values])
+        return ArrayValue(self.values >= other)
 
     @parse_float_operand
     def __gt__(self, other):
-        try:
-            return ArrayValue(self._values.__gt__(other))
-        except AttributeError:
-            return ArrayValue([v > other for v in self._values])
+        return ArrayValue(self.values > other)
 
 
 class RandomDistributionValue(BaseValue):
@@ -540,6 +782,34 @@ class RandomDistributionValue(BaseValue):
         types
         """
         self._generator = generator_cls(self.distribution)
+        self._mutated()
+
+    def sample(self, n, seed=None, stream=None):
+        """
+        Draws a batch of samples from the distribution using the NumPy random
+        generator method that corresponds to the 'standard_library' URL of its
+        definition (see ``DISTRIBUTION_SAMPLERS``). The values of the
+        distribution's properties are passed to the generator as they are
+        (i.e. in the units they are specified in).
+
+        Parameters
+        ----------
+        n : int
+            The number of samples to draw
+        seed : int | numpy.random.Generator | None
+            The seed of the random generator, or the generator itself. If
+            None, the generator is seeded from fresh entropy
+        stream : str | int | tuple(str | int) | None
+            Identifies an independent, reproducible stream of random numbers
+            drawn from the same seed (e.g. the name of a population)
+
+        Returns
+        -------
+        samples : numpy.ndarray
+            The drawn samples
+        """
+        return sample_distribution(self.distribution, n,
+                                   random_generator(seed, stream))
 
     def __repr__(self):
         return ("RandomDistributionValue({})".format(self.distribution.name))
@@ -555,3 +825,152 @@ class RandomDistributionValue(BaseValue):
         distribution = node.child(nineml.RandomDistributionProperties,
                                   allow_ref=True, **options)
         return cls(distribution)
+
+
+# =============================================================================
+# Sampling of random distributions
+# =============================================================================
+
+
+def random_generator(seed=None, stream=None):
+    """
+    Creates a NumPy random generator for the given seed and stream. Streams
+    drawn from the same seed are statistically independent and reproducible.
+
+    Parameters
+    ----------
+    seed : int | numpy.random.Generator | None
+        The seed of the random generator, or the generator itself. If None,
+        the generator is seeded from fresh entropy. Streams of a generator
+        are derived from the seed sequence it was created from, so they are
+        the same as the streams of that seed
+    stream : str | int | tuple(str | int) | None
+        Identifies the stream of random numbers (e.g. the name of a
+        population)
+
+    Returns
+    -------
+    generator : numpy.random.Generator
+        The random generator
+    """
+    if not hasattr(numpy.random, 'default_rng'):
+        raise NineMLUsageError(
+            "Sampling random values requires NumPy >= 1.17 (found {})"
+            .format(numpy.__version__))
+    if stream is None:
+        spawn_key = ()
+    else:
+        if not isinstance(stream, tuple):
+            stream = (stream,)
+        spawn_key = tuple(
+            zlib.crc32(k.encode('utf-8')) if isinstance(k, basestring)
+            else int(k) for k in stream)
+    if isinstance(seed, numpy.random.Generator):
+        if stream is None:
+            return seed
+        bit_generator = seed.bit_generator
+        # 'seed_seq' was only made public in NumPy 1.25
+        seed_seq = getattr(bit_generator, 'seed_seq',
+                           getattr(bit_generator, '_seed_seq', None))
+        if isinstance(seed_seq, numpy.random.SeedSequence):
+            return numpy.random.default_rng(numpy.random.SeedSequence(
+                seed_seq.entropy, spawn_key=seed_seq.spawn_key + spawn_key,
+                pool_size=seed_seq.pool_size))
+        # Generators that weren't created from a seed sequence seed their
+        # streams from their own output
+        seed = int(seed.integers(2 ** 63))
+    return numpy.random.default_rng(
+        numpy.random.SeedSequence(seed, spawn_key=spawn_key))
+
+
+def sample_distribution(distribution, n, generator):
+    """
+    Draws samples from a random distribution component
+
+    Parameters
+    ----------
+    distribution : RandomDistributionProperties
+        The random distribution component to sample
+    n : int
+        The number of samples to draw
+    generator : numpy.random.Generator
+        The random generator to draw the samples with
+
+    Returns
+    -------
+    samples : numpy.ndarray
+        The drawn samples
+    """
+    lib_type = distribution.standard_library[
+        len(nineml.abstraction.RandomDistribution.standard_library_basepath):]
+    try:
+        sampler = DISTRIBUTION_SAMPLERS[lib_type]
+    except KeyError:
+        raise NineMLUsageError(
+            "Sampling of '{}' distributions (used by '{}') is not supported"
+            .format(lib_type, distribution.name))
+    return numpy.asarray(sampler(generator, n,
+                                 _DistributionParameters(distribution)))
+
+
+class _DistributionParameters(object):
+    """
+    Provides the values of the properties of a random distribution by name,
+    accepting alternative names for the same parameter
+    """
+
+    def __init__(self, distribution):
+        self._distribution = distribution
+        self._values = dict((p.name, float(p.value))
+                            for p in distribution.properties)
+
+    def __contains__(self, name):
+        return name in self._values
+
+    def __getitem__(self, names):
+        if not isinstance(names, tuple):
+            names = (names,)
+        try:
+            return next(self._values[n] for n in names if n in self._values)
+        except StopIteration:
+            raise NineMLUsageError(
+                "'{}' distribution '{}' requires a '{}' property".format(
+                    self._distribution.standard_library,
+                    self._distribution.name, "' or '".join(names)))
+
+
+# Maps the names of the UncertML distributions onto functions that draw
+# samples from them with a NumPy random generator. Multivariate distributions
+# (dirichlet and multinomial) are not supported
+DISTRIBUTION_SAMPLERS = {
+    'bernoulli': lambda rng, n, p: rng.binomial(
+        1, p['probability', 'probabilities'], n),
+    'beta': lambda rng, n, p: rng.beta(p['alpha'], p['beta'], n),
+    'binomial': lambda rng, n, p: rng.binomial(
+        int(p['numberOfTrials']),
+        p['probabilityOfSuccess', 'probability'], n),
+    'cauchy': lambda rng, n, p: (
+        p['location'] + p['scale'] * rng.standard_cauchy(n)),
+    'chi-square': lambda rng, n, p: rng.chisquare(p['degreesOfFreedom'], n),
+    'exponential': lambda rng, n, p: rng.exponential(1.0 / p['rate'], n),
+    'f': lambda rng, n, p: rng.f(p['numerator'], p['denominator'], n),
+    'gamma': lambda rng, n, p: rng.gamma(p['shape'], p['scale'], n),
+    'geometric': lambda rng, n, p: rng.geometric(p['probability'], n),
+    'hypergeometric': lambda rng, n, p: rng.hypergeometric(
+        int(p['numberOfSuccesses']),
+        int(p['populationSize'] - p['numberOfSuccesses']),
+        int(p['numberOfTrials']), n),
+    'laplace': lambda rng, n, p: rng.laplace(p['location'], p['scale'], n),
+    'logistic': lambda rng, n, p: rng.logistic(p['location'], p['scale'], n),
+    'log-normal': lambda rng, n, p: rng.lognormal(p['logScale'], p['shape'],
+                                                  n),
+    'negative-binomial': lambda rng, n, p: rng.negative_binomial(
+        p['numberOfFailures'], p['probability'], n),
+    'normal': lambda rng, n, p: rng.normal(
+        p['mean'], (numpy.sqrt(p['variance']) if 'variance' in p
+                    else p['stddev', 'standardDeviation']), n),
+    'pareto': lambda rng, n, p: p['scale'] * (1.0 + rng.pareto(p['shape'],
+                                                               n)),
+    'poisson': lambda rng, n, p: rng.poisson(p['rate'], n),
+    'uniform': lambda rng, n, p: rng.uniform(p['minimum'], p['maximum'], n),
+    'weibull': lambda rng, n, p: p['scale'] * rng.weibull(p['shape'], n)}
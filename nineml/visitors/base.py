@@ -14,6 +14,15 @@ class OrderedDefaultOrderedDictDict(OrderedDict):
 Context = namedtuple('Context', ('parent', 'parent_cls', 'parent_result',
                                  'attr_name', 'dct'))
 
+# The methods a visitor class calls for the objects of a NineML class and the
+# child (name, type) pairs and children types of the NineML class
+Dispatch = namedtuple('Dispatch', ('action', 'post_action', 'child',
+                                   'children'))
+
+# Dispatch tables of the visitor classes, keyed by visitor class and NineML
+# class (see BaseVisitor._dispatch)
+_dispatch_tables = {}
+
 
 class BaseVisitor(object):
     """
@@ -39,15 +48,16 @@ class BaseVisitor(object):
         # explicitly provided. This allows classes to be visited as if they
         # were base classes (e.g. Dynamics instead of MultiDynamics)
         nineml_cls = self._get_nineml_cls(obj, nineml_cls)
+        dispatch = self._dispatch(nineml_cls)
         # Run the 'action_<obj-nineml_type>' method on the visited object
         try:
             result = self.action(obj, nineml_cls=nineml_cls, **kwargs)
             # Add the container object to the list of scopes
-            for child_name, child_type in nineml_cls.nineml_child.items():
+            for child_name, child_type in dispatch.child:
                 self.visit_child(child_name, child_type, obj,
                                  nineml_cls, result, **kwargs)
             # Visit children of the object
-            for children_type in nineml_cls.nineml_children:
+            for children_type in dispatch.children:
                 self.visit_children(children_type, obj, nineml_cls, result,
                                     **kwargs)
         except NineMLDontVisitChildrenException as e:
@@ -70,11 +80,9 @@ class BaseVisitor(object):
         return results
 
     def action(self, obj, nineml_cls, **kwargs):
-        try:
-            method = getattr(self, 'action_' + nineml_cls.nineml_type.lower())
-        except AttributeError:
-            method = self.default_action
-        return method(obj, nineml_cls=nineml_cls, **kwargs)
+        return self._dispatch(nineml_cls).action(self, obj,
+                                                 nineml_cls=nineml_cls,
+                                                 **kwargs)
 
     def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
         """
@@ -84,6 +92,27 @@ class BaseVisitor(object):
         assert False, ("No default action provided, so can't action {} ({})"
                        .format(nineml_cls, obj))
 
+    def _dispatch(self, nineml_cls):
+        """
+        Returns the dispatch table entry of the visitor's class for the NineML
+        class, which is looked up once per pair of classes instead of for
+        every visited object
+        """
+        try:
+            return _dispatch_tables[(type(self), nineml_cls)]
+        except KeyError:
+            visitor_cls = type(self)
+            type_name = nineml_cls.nineml_type.lower()
+            dispatch = Dispatch(
+                getattr(visitor_cls, 'action_' + type_name,
+                        visitor_cls.default_action),
+                getattr(visitor_cls, 'post_action_' + type_name,
+                        getattr(visitor_cls, 'default_post_action', None)),
+                tuple(nineml_cls.nineml_child.items()),
+                tuple(nineml_cls.nineml_children))
+            _dispatch_tables[(visitor_cls, nineml_cls)] = dispatch
+            return dispatch
+
     def _get_nineml_cls(self, obj, nineml_cls):
         if nineml_cls is None:
             nineml_cls = (self.as_class
@@ -101,14 +130,8 @@ class BasePreAndPostVisitor(BaseVisitor):
         return pre_result, post_result
 
     def post_action(self, obj, pre_result, nineml_cls, **kwargs):
-        try:
-            method = getattr(self, ('post_action_' +
-                                    nineml_cls.nineml_type.lower()))
-        except AttributeError:
-            method = self.default_post_action
-        return method(obj, pre_result, nineml_cls=nineml_cls,
-                      **kwargs)
-
+        return self._dispatch(nineml_cls).post_action(
+            self, obj, pre_result, nineml_cls=nineml_cls, **kwargs)
 
     def default_post_action(self, obj, pre_result, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
         """
@@ -130,14 +153,15 @@ class BaseChildResultsVisitor(BaseVisitor):
         # explicitly provided. This allows classes to be visited as if they
         # were base classes (e.g. Dynamics instead of MultiDynamics)
         nineml_cls = self._get_nineml_cls(obj, nineml_cls)
+        dispatch = self._dispatch(nineml_cls)
         # Add the container object to the list of scopes
         child_results = {}
-        for child_name, child_type in nineml_cls.nineml_child.items():
+        for child_name, child_type in dispatch.child:
             child_results[child_name] = self.visit_child(
                 child_name, child_type, obj, nineml_cls, **kwargs)
         # Visit children of the object
         children_results = {}
-        for children_type in nineml_cls.nineml_children:
+        for children_type in dispatch.children:
             children_results[children_type] = self.visit_children(
                 children_type, obj, **kwargs)
         # Run the 'action_<obj-nineml_type>' method on the visited object
@@ -215,15 +239,16 @@ class BaseDualVisitor(BaseVisitor):
         # explicitly provided. This allows classes to be visited as if they
         # were base classes (e.g. Dynamics instead of MultiDynamics)
         nineml_cls = self._get_nineml_cls(obj1, obj2, nineml_cls)
+        dispatch = self._dispatch(nineml_cls)
         # Run the 'action_<obj-nineml_type>' method on the visited object
         result = self.action(obj1, obj2, nineml_cls=nineml_cls, **kwargs)
         # Add the container object to the list of scopes
-        for child_name, child_type in nineml_cls.nineml_child.items():
+        for child_name, child_type in dispatch.child:
             self.visit_child(child_name, child_type, obj1, obj2,
                              parent_cls=nineml_cls, parent_result=result,
                              **kwargs)
         # Visit children of the object
-        for children_type in nineml_cls.nineml_children:
+        for children_type in dispatch.children:
             self.visit_children(children_type, obj1, obj2,
                                 parent_cls=nineml_cls, parent_result=result,
                                 **kwargs)
@@ -264,19 +289,19 @@ class BaseDualVisitor(BaseVisitor):
         if keys1 != keys2:
             self._raise_keys_mismatch_exception(children_type, parent1,
                                                 parent2)
+        accessor1 = parent1._member_accessor(children_type)
+        accessor2 = parent2._member_accessor(children_type)
         for key in keys1:
-            child1 = parent1._member_accessor(children_type)(key)
-            child2 = parent2._member_accessor(children_type)(key)
+            child1 = accessor1(key)
+            child2 = accessor2(key)
             results.append(self.visit(
                 child1, child2, nineml_cls=children_type, **kwargs))
         return results
 
     def action(self, obj1, obj2, nineml_cls, **kwargs):
-        try:
-            method = getattr(self, 'action_' + nineml_cls.nineml_type.lower())
-        except AttributeError:
-            method = self.default_action
-        return method(obj1, obj2, nineml_cls=nineml_cls, **kwargs)
+        return self._dispatch(nineml_cls).action(self, obj1, obj2,
+                                                 nineml_cls=nineml_cls,
+                                                 **kwargs)
 
     def default_action(self, obj1, obj2, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
         """
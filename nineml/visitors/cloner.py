@@ -67,6 +67,11 @@ class Cloner(BaseChildResultsVisitor):
                        children_results, **kwargs):  # @UnusedVariable @IgnorePep8
         init_args = {}
         for attr_name in nineml_cls.nineml_attr:
+            if attr_name == 'rhs':
+                # Expressions are passed as the RHS so that their source
+                # strings are shared with the clone without parsing them
+                init_args[attr_name] = obj
+                continue
             try:
                 init_args[attr_name] = getattr(obj, attr_name)
             except NineMLNotBoundException:
@@ -116,3 +121,21 @@ class Cloner(BaseChildResultsVisitor):
         to in the containing container.
         """
         return copy(reference)
+
+    def action_arrayvalue(self, array_value, nineml_cls, child_results,
+                          children_results, **kwargs):  # @UnusedVariable
+        """
+        ArrayValues that reference external data files keep the reference
+        and are cloned without loading their values if they haven't been
+        already. Writeable values are copied (keeping their data type) so the
+        clone doesn't share a mutable buffer with the original, whereas
+        read-only ones (e.g. memory-mapped data files) are shared
+        """
+        values = array_value._values
+        if values is not None and values.flags.writeable:
+            values = values.copy()
+        clone = nineml_cls(values=values, datafile=array_value.datafile,
+                           relative_to=array_value._relative_to,
+                           dtype=array_value._dtype)
+        clone._indices = array_value._indices
+        return clone
@@ -1,8 +1,10 @@
 from builtins import zip
 import math
+import numpy
 import sympy
 from itertools import chain
 from .base import BaseVisitor, BaseDualVisitor, DualWithContextMixin
+from nineml.utils.equality import nearly_equal_arrays, round_mantissas
 from nineml.exceptions import (NineMLDualVisitException,
                                NineMLDualVisitValueException,
                                NineMLDualVisitTypeException,
@@ -14,6 +16,13 @@ from nineml.exceptions import (NineMLDualVisitException,
 
 NEARLY_EQUAL_PLACES_DEFAULT = 15
 
+# Memos of the results of the expensive tiers of the RHS equality checks,
+# keyed by the pair of expressions compared, and of the expanded forms of the
+# expressions hashed. They are simply cleared when they exceed MEMO_SIZE
+MEMO_SIZE = 10000
+_rhs_equality_memo = {}
+_expanded_rhs_memo = {}
+
 
 class EqualityChecker(BaseDualVisitor):
 
@@ -76,10 +85,8 @@ class EqualityChecker(BaseDualVisitor):
             self._raise_value_exception('value', val1, val2, nineml_cls)
 
     def action_arrayvalue(self, val1, val2, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
-        if len(val1.values) != len(val2.values):
-            self._raise_value_exception('values', val1, val2, nineml_cls)
-        if any(self._not_nearly_equal(s, o)
-               for s, o in zip(val1.values, val2.values)):
+        if not nearly_equal_arrays(val1.values, val2.values,
+                                   places=self.nearly_equal_places):
             self._raise_value_exception('values', val1, val2, nineml_cls)
 
     def action_unit(self, unit1, unit2, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
@@ -97,14 +104,82 @@ class EqualityChecker(BaseDualVisitor):
             if attr != 'abs_index':
                 self._check_attr(branch1, branch2, attr, nineml_cls)
 
+    # The number of random points the RHS expressions are evaluated at and
+    # the precision and relative tolerance they are evaluated with
+    num_probes = 3
+    probe_precision = 30
+    probe_tolerance = 1e-12
+
     def _check_rhs(self, expr1, expr2, nineml_cls):
-        try:
-            expr_eq = (sympy.expand(expr1.rhs - expr2.rhs) == 0)
-        except TypeError:
-            expr_eq = sympy.Equivalent(expr1.rhs, expr2.rhs) == sympy.true
-        if not expr_eq:
+        if not self._rhs_equal(expr1, expr2):
             self._raise_value_exception('rhs', expr1, expr2, nineml_cls)
 
+    def _rhs_equal(self, expr1, expr2):
+        """
+        Checks whether the RHS of two expressions are equal in increasingly
+        expensive tiers: identical source strings (which avoids parsing them),
+        identical or structurally equal sympy expressions, a difference that
+        sympy simplifies to a number on construction, numeric probing at
+        random points, which can only show they are not equal, and finally
+        expanding their difference. The result of the last two tiers is
+        memoized for the pair of expressions.
+        """
+        source = expr1._rhs_source
+        if source is not None and source == expr2._rhs_source:
+            return True
+        rhs1 = expr1.rhs
+        rhs2 = expr2.rhs
+        if rhs1 is rhs2 or rhs1 == rhs2:
+            return True
+        try:
+            return _rhs_equality_memo[(rhs1, rhs2)]
+        except KeyError:
+            pass
+        try:
+            diff = sympy.sympify(rhs1 - rhs2)
+        except TypeError:  # Boolean expressions
+            expr_eq = sympy.Equivalent(rhs1, rhs2) == sympy.true
+        else:
+            if diff.is_Number:  # The difference has already been simplified
+                expr_eq = diff == 0
+            else:
+                expr_eq = (not self._probes_differ(rhs1, rhs2) and
+                           sympy.expand(diff) == 0)
+        if len(_rhs_equality_memo) >= MEMO_SIZE:
+            _rhs_equality_memo.clear()
+        _rhs_equality_memo[(rhs1, rhs2)] = expr_eq
+        _rhs_equality_memo[(rhs2, rhs1)] = expr_eq
+        return expr_eq
+
+    def _probes_differ(self, rhs1, rhs2):
+        """
+        Evaluates the expressions at random points (from a fixed seed) and
+        returns True if they differ at any of them. Returns False if they
+        agree or can't be evaluated (e.g. contain random distributions)
+        """
+        rhs1 = sympy.sympify(rhs1)
+        rhs2 = sympy.sympify(rhs2)
+        symbols = sorted(rhs1.free_symbols | rhs2.free_symbols, key=str)
+        rng = numpy.random.RandomState(len(symbols))
+        for _ in range(self.num_probes):
+            # Positive values avoid the domain errors of logs and roots
+            point = dict((s, sympy.Float(v, self.probe_precision))
+                         for s, v in zip(symbols,
+                                         rng.uniform(0.5, 1.5, len(symbols))))
+            try:
+                val1 = complex(rhs1.xreplace(point).evalf(
+                    self.probe_precision))
+                val2 = complex(rhs2.xreplace(point).evalf(
+                    self.probe_precision))
+            except (TypeError, ValueError, AttributeError):
+                return False
+            if not (numpy.isfinite(val1) and numpy.isfinite(val2)):
+                continue
+            if abs(val1 - val2) > self.probe_tolerance * max(
+                    1.0, abs(val1), abs(val2)):
+                return True
+        return False
+
     def _check_attr(self, obj1, obj2, attr_name, nineml_cls):
         try:
             attr1 = getattr(obj1, attr_name)
@@ -146,9 +221,17 @@ class Hasher(BaseVisitor):
 
     def hash(self, nineml_obj):
         self._hash = None
+        self._root = nineml_obj
         self.visit(nineml_obj)
         return self._hash
 
+    def visit(self, obj, nineml_cls=None, **kwargs):
+        # Let descendants that can be shared with other containers know to
+        # clear the cached hash of the root object when they are modified
+        if obj is not self._root and not self._root.temporary:
+            obj._add_referrer(self._root)
+        return super(Hasher, self).visit(obj, nineml_cls=nineml_cls, **kwargs)
+
     def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
         for attr_name in nineml_cls.nineml_attr:
             try:
@@ -179,15 +262,25 @@ class Hasher(BaseVisitor):
         self._hash_value(val.value)
 
     def action_arrayvalue(self, val, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
-        for v in val.values:
-            self._hash_value(v)
+        # Hash a digest of the buffer of rounded values (adding 0.0 to
+        # normalise negative zeros, which are equal to positive zeros)
+        mantissas, exponents = round_mantissas(val.values,
+                                               self.nearly_equal_places)
+        rounded = numpy.ldexp(mantissas, exponents) + 0.0
+        self._hash_attr(hash(rounded.tobytes()))
 
     def _hash_rhs(self, rhs, **kwargs):  # @UnusedVariable
         try:
-            rhs = sympy.expand(rhs)
-        except:
-            pass
-        self._hash_attr(rhs)
+            expanded = _expanded_rhs_memo[rhs]
+        except KeyError:
+            try:
+                expanded = sympy.expand(rhs)
+            except:
+                expanded = rhs
+            if len(_expanded_rhs_memo) >= MEMO_SIZE:
+                _expanded_rhs_memo.clear()
+            _expanded_rhs_memo[rhs] = expanded
+        self._hash_attr(expanded)
 
     def action_unit(self, unit, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
         # Ignore name
@@ -1,15 +1,118 @@
+from builtins import object
 from .base import BaseVisitorWithContext
 from ..base import DocumentLevelObject
 from nineml.exceptions import (NineMLDuplicateObjectError,
                                NineMLDontVisitChildrenException)
 
 
-class NoDuplicatedObjectsValidator(BaseVisitorWithContext):
+class BaseValidator(object):
+    """
+    Mixin for visitors that check a validation rule over a NineML object.
 
-    def __init__(self, nineml_obj, **kwargs):  # @UnusedVariable
+    Checks on individual elements are made in the 'action_<nineml-type>'
+    methods and checks that require all the elements to have been visited in
+    'finalise'. The rule is checked when the validator is constructed unless
+    'defer' is set, in which case the validator just sets up its state so it
+    can be checked along with other validators in a single traversal of the
+    object (see FusedValidator).
+    """
+
+    def _validate(self, nineml_obj, defer):
+        if not defer:
+            self.visit(nineml_obj)
+            self.finalise()
+
+    def finalise(self):
+        """
+        Checks made after all the elements of the object have been visited
+        """
+        pass
+
+
+class FusedValidator(BaseVisitorWithContext):
+    """
+    Checks a set of validators on a NineML object in a single traversal,
+    dispatching each visited element to the action methods of all of them.
+
+    Errors raised by a validator while the object is traversed are held back
+    and the validator isn't passed any more elements. After the traversal the
+    validators are finalised in the order they are provided and the first
+    error is raised, so errors are the same as if the validators were checked
+    one after the other. Validators that raise NineMLDontVisitChildrenException
+    are not passed the children of the element they raised it for.
+
+    Parameters
+    ----------
+    nineml_obj : BaseNineMLObject
+        The object to validate
+    validator_classes : list(type)
+        The classes of the validators to check (derived from BaseValidator),
+        which are constructed with the object, 'defer=True' and kwargs
+    as_class : type
+        The class to visit the object as (see BaseVisitor.as_class)
+    """
+
+    def __init__(self, nineml_obj, validator_classes, as_class=None,
+                 **kwargs):
         BaseVisitorWithContext.__init__(self)
-        self.all_objects = {}
+        if as_class is not None:
+            self.as_class = as_class
+        self.validators = [cls(nineml_obj, defer=True, **kwargs)
+                           for cls in validator_classes]
+        # Validators that keep track of the context of the visited elements
+        # share the context stack of the fused traversal
+        for validator in self.validators:
+            if hasattr(validator, 'contexts'):
+                validator.contexts = self.contexts
+        self._active = self.validators
+        self._errors = {}
         self.visit(nineml_obj)
+        for validator in self.validators:
+            error = self._errors.get(id(validator))
+            if error is not None:
+                raise error
+            validator.finalise()
+
+    def visit(self, obj, nineml_cls=None, **kwargs):
+        nineml_cls = self._get_nineml_cls(obj, nineml_cls)
+        active = self._active
+        self._active = [v for v in active
+                        if self._action(v, obj, nineml_cls, **kwargs)]
+        try:
+            if self._active:
+                dispatch = self._dispatch(nineml_cls)
+                for child_name, child_type in dispatch.child:
+                    self.visit_child(child_name, child_type, obj, nineml_cls,
+                                     None, **kwargs)
+                for children_type in dispatch.children:
+                    self.visit_children(children_type, obj, nineml_cls, None,
+                                        **kwargs)
+        finally:
+            self._active = active
+
+    def _action(self, validator, obj, nineml_cls, **kwargs):
+        """
+        Calls the action method of the validator for the element and returns
+        whether the validator should be passed the children of the element
+        """
+        if id(validator) in self._errors:
+            return False
+        try:
+            validator.action(obj, nineml_cls=nineml_cls, **kwargs)
+        except NineMLDontVisitChildrenException:
+            return False
+        except Exception as e:
+            self._errors[id(validator)] = e
+            return False
+        return True
+
+
+class NoDuplicatedObjectsValidator(BaseValidator, BaseVisitorWithContext):
+
+    def __init__(self, nineml_obj, defer=False, **kwargs):  # @UnusedVariable
+        BaseVisitorWithContext.__init__(self)
+        self.all_objects = {}
+        self._validate(nineml_obj, defer)
 
     def default_action(self, nineml_obj, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
         if nineml_obj.temporary or isinstance(nineml_obj, DocumentLevelObject):
@@ -0,0 +1,101 @@
+"""
+Benchmarks the resolution and validation of the dimensions of the component
+classes in the 'examples' directory, which dominates the time taken to
+validate Dynamics classes.
+"""
+from __future__ import print_function, division
+import os.path
+import ast
+import timeit
+from itertools import chain
+from argparse import ArgumentParser
+from past.utils import old_div
+from nineml import abstraction as al, user as ul, units as un
+from nineml.abstraction.dynamics.visitors.queriers import (
+    DynamicsDimensionResolver)
+from nineml.abstraction.dynamics.visitors.validators.general import (
+    DimensionalityDynamicsValidator)
+
+
+examples_dir = os.path.join(os.path.dirname(__file__), '..', 'examples')
+
+
+def load_examples():
+    """
+    Loads the Dynamics classes created by the (argument-less) 'create_*'
+    functions of the examples. Only the function definitions are executed, as
+    some of the example scripts import modules that are no longer available
+    """
+    classes = []
+    for dpath, _, fnames in sorted(os.walk(examples_dir)):
+        for fname in sorted(fnames):
+            if not fname.endswith('.py'):
+                continue
+            path = os.path.join(dpath, fname)
+            with open(path) as f:
+                try:
+                    module = ast.parse(f.read(), path)
+                except SyntaxError as e:
+                    print("Skipping '{}' ({})".format(fname, e))
+                    continue
+            module.body = [n for n in module.body
+                           if isinstance(n, ast.FunctionDef) and
+                           n.name.startswith('create_')]
+            namespace = {'al': al, 'ul': ul, 'un': un, 'old_div': old_div}
+            exec(compile(module, path, 'exec'), namespace)
+            for name, func in sorted(namespace.items()):
+                if not name.startswith('create_'):
+                    continue
+                try:
+                    obj = func()
+                except TypeError:  # Requires arguments (e.g. networks)
+                    continue
+                if isinstance(obj, al.Dynamics):
+                    classes.append(obj)
+    return classes
+
+
+def element_names(component_class):
+    return list(chain(component_class.parameter_names,
+                      component_class.state_variable_names,
+                      component_class.alias_names,
+                      component_class.analog_receive_port_names,
+                      component_class.analog_reduce_port_names))
+
+
+def resolve(component_class):
+    resolver = DynamicsDimensionResolver(component_class)
+    for name in element_names(component_class):
+        resolver.dimension_of(name)
+
+
+def resolve_cached(component_class):
+    # Reuses the dimension resolver cached by the component class
+    for name in element_names(component_class):
+        component_class.dimension_of(name)
+
+
+def validate(component_class):
+    DimensionalityDynamicsValidator(component_class)
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--number', type=int, default=20,
+                    help="Number of times to process each class")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+print("{:>28} {:>14} {:>14} {:>14}".format(
+    'class', 'resolve (ms)', 'cached (ms)', 'validate (ms)'))
+totals = [0.0, 0.0, 0.0]
+for component_class in load_examples():
+    times = []
+    for func in (resolve, resolve_cached, validate):
+        elapsed = min(timeit.repeat(lambda: func(component_class),
+                                    number=args.number, repeat=args.repeats))
+        times.append(1e3 * elapsed / args.number)
+    totals = [t + s for t, s in zip(totals, times)]
+    print("{:>28} {:>14.3f} {:>14.3f} {:>14.3f}".format(
+        component_class.name, *times))
+print("{:>28} {:>14.3f} {:>14.3f} {:>14.3f}".format('total', *totals))
@@ -0,0 +1,102 @@
+"""
+Benchmarks the time taken to parse typical right-hand-side expressions and
+to read documents containing many component classes that share them, with and
+without the process-wide cache of parsed expression strings.
+"""
+from __future__ import print_function, division
+import os.path
+import shutil
+import tempfile
+import time
+import timeit
+from argparse import ArgumentParser
+import nineml
+from nineml import abstraction as al, units as un
+from nineml.abstraction.expressions.parser import Parser
+
+
+EXPRESSIONS = ['alpha*V*V + beta*V + zeta - U + Isyn / C_m', 'a*(b*V - U)',
+               'V > theta', 'U + d', '-v/tau', 'v > v_threshold',
+               '(V > theta) & (U < d)', 'exp(-t/tau) * pow(a, 2)']
+
+
+def create_izhikevich(name):
+    return al.Dynamics(
+        name=name,
+        regimes=[
+            al.Regime(
+                name="subthreshold_regime",
+                time_derivatives=[
+                    "dV/dt = alpha*V*V + beta*V + zeta - U + Isyn / C_m",
+                    "dU/dt = a*(b*V - U)"],
+                transitions=[al.On("V > theta",
+                                   do=["V = c", "U = U + d",
+                                       al.OutputEvent('spike')],
+                                   to='subthreshold_regime')])],
+        ports=[al.AnalogSendPort("V", un.voltage),
+               al.AnalogReducePort("Isyn", un.current, operator="+")],
+        parameters=[
+            al.Parameter('theta', un.voltage),
+            al.Parameter('a', un.per_time),
+            al.Parameter('b', un.per_time),
+            al.Parameter('c', un.voltage),
+            al.Parameter('d', un.voltage / un.time),
+            al.Parameter('C_m', un.capacitance),
+            al.Parameter('alpha', un.dimensionless / (un.voltage * un.time)),
+            al.Parameter('beta', un.per_time),
+            al.Parameter('zeta', un.voltage / un.time)],
+        state_variables=[
+            al.StateVariable('V', un.voltage),
+            al.StateVariable('U', un.voltage / un.time)])
+
+
+def time_parse(number, repeats, cache_size):
+    Parser.configure_cache(cache_size)
+    Parser.clear_cache()
+    elapsed = min(timeit.repeat(
+        lambda: [Parser().parse(e) for e in EXPRESSIONS],
+        number=number, repeat=repeats))
+    return 1e6 * elapsed / (number * len(EXPRESSIONS))
+
+
+def time_read(url, num_repeats, cache_size):
+    Parser.configure_cache(cache_size)
+    times = []
+    for _ in range(num_repeats):
+        Parser.clear_cache()
+        start = time.time()
+        doc = nineml.read(url, reload=True)
+        times.append(time.time() - start)
+        del doc
+    return min(times)
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000],
+                    help="Numbers of component classes in the documents")
+parser.add_argument('--number', type=int, default=100,
+                    help="Number of times to parse each expression")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+print("Parse time per expression (us): uncached {:.1f}, cached {:.1f}\n"
+      .format(time_parse(args.number, args.repeats, 0),
+              time_parse(args.number, args.repeats,
+                         Parser.DEFAULT_CACHE_SIZE)))
+
+tmp_dir = tempfile.mkdtemp()
+try:
+    print("{:>10} {:>14} {:>14} {:>10}".format(
+        'classes', 'uncached (s)', 'cached (s)', 'hit rate'))
+    for size in args.sizes:
+        url = os.path.join(tmp_dir, 'parse{}.xml'.format(size))
+        nineml.write(url, *(create_izhikevich('Izhikevich{}'.format(i))
+                            for i in range(size)))
+        uncached = time_read(url, args.repeats, 0)
+        cached = time_read(url, args.repeats, Parser.DEFAULT_CACHE_SIZE)
+        info = Parser.cache_info()
+        print("{:>10} {:>14.3f} {:>14.3f} {:>10.3f}".format(
+            size, uncached, cached, info.hits / (info.hits + info.misses)))
+finally:
+    shutil.rmtree(tmp_dir)
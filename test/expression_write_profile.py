@@ -0,0 +1,142 @@
+"""
+Benchmarks loading documents of Izhikevich-like classes (either by reading
+them from file or building them in Python without validating them) and
+writing them out again. Unmodified expressions are written either from the
+process-wide cache of the canonical forms of their source strings or by
+printing each one from its sympy form, as they were before expressions kept
+their source strings.
+
+The cache only avoids printing the same source string more than once. Its
+gains therefore come from expressions that are repeated within or between
+documents. Unique expressions are still printed when they are first written.
+Almost all of them have already been parsed by the time they are written, by
+the validation of the classes they belong to or by the queries made when the
+classes are constructed (see the 'parsed' column).
+"""
+from __future__ import print_function, division
+import os.path
+import shutil
+import tempfile
+import time
+from itertools import chain
+from argparse import ArgumentParser
+import nineml
+from nineml import abstraction as al, units as un
+from nineml.abstraction.expressions import Expression
+from nineml.abstraction.expressions.parser import Parser, _ParseCache
+
+
+def create_izhikevich(name, suffix='', validate=True):
+    def n(symbol):
+        return symbol + suffix
+    return al.Dynamics(
+        name=name,
+        regimes=[
+            al.Regime(
+                name="subthreshold_regime",
+                time_derivatives=[
+                    "d{V}/dt = {alpha}*{V}*{V} + {beta}*{V} + {zeta} - {U} + "
+                    "{Isyn} / {C_m}".format(
+                        V=n('V'), alpha=n('alpha'), beta=n('beta'),
+                        zeta=n('zeta'), U=n('U'), Isyn=n('Isyn'),
+                        C_m=n('C_m')),
+                    "d{U}/dt = {a}*({b}*{V} - {U})".format(
+                        U=n('U'), a=n('a'), b=n('b'), V=n('V'))],
+                transitions=[al.On("{} > {}".format(n('V'), n('theta')),
+                                   do=["{} = {}".format(n('V'), n('c')),
+                                       "{U} = {U} + {d}".format(U=n('U'),
+                                                                d=n('d')),
+                                       al.OutputEvent('spike')],
+                                   to='subthreshold_regime')])],
+        ports=[al.AnalogSendPort(n("V"), un.voltage),
+               al.AnalogReducePort(n("Isyn"), un.current, operator="+")],
+        parameters=[
+            al.Parameter(n('theta'), un.voltage),
+            al.Parameter(n('a'), un.per_time),
+            al.Parameter(n('b'), un.per_time),
+            al.Parameter(n('c'), un.voltage),
+            al.Parameter(n('d'), un.voltage / un.time),
+            al.Parameter(n('C_m'), un.capacitance),
+            al.Parameter(n('alpha'),
+                         un.dimensionless / (un.voltage * un.time)),
+            al.Parameter(n('beta'), un.per_time),
+            al.Parameter(n('zeta'), un.voltage / un.time)],
+        state_variables=[
+            al.StateVariable(n('V'), un.voltage),
+            al.StateVariable(n('U'), un.voltage / un.time)],
+        validate=validate)
+
+
+def expressions(doc):
+    for dynamics in doc.values():
+        if not isinstance(dynamics, al.Dynamics):
+            continue
+        for regime in dynamics.regimes:
+            for expr in chain(regime.time_derivatives, regime.aliases):
+                yield expr
+            for transition in regime.transitions:
+                for expr in transition.state_assignments:
+                    yield expr
+        for expr in dynamics.aliases:
+            yield expr
+
+
+def time_write(load, url, canonical_cache):
+    """
+    Times loading the document (by reading it or building its classes) and
+    writing it to file
+    """
+    Expression._canonical_cache = canonical_cache
+    times = []
+    for _ in range(args.repeats):
+        Parser.clear_cache()
+        canonical_cache._parsed.clear()
+        start = time.time()
+        doc = load()
+        parsed = [e.is_parsed for e in expressions(doc)]
+        loaded = time.time()
+        nineml.write(url, doc, register=False)
+        times.append((time.time() - start, time.time() - loaded))
+        del doc
+    return [min(t) for t in zip(*times)], sum(parsed) / len(parsed)
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100],
+                    help="Numbers of component classes in the documents")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+default_cache = Expression._canonical_cache
+tmp_dir = tempfile.mkdtemp()
+out_url = os.path.join(tmp_dir, 'out.xml')
+try:
+    print("{:>8} {:>7} {:>7} {:>22} {:>22} {:>7}".format(
+        '', '', '', 'load + write (s)', 'write (s)', ''))
+    print("{:>8} {:>7} {:>7} {:>10} {:>11} {:>10} {:>11} {:>7}".format(
+        'classes', 'exprs', 'load', 'uncached', 'cached', 'uncached',
+        'cached', 'parsed'))
+    for size in args.sizes:
+        for exprs in ('shared', 'unique'):
+            def build():
+                return nineml.Document(*(
+                    create_izhikevich('Izhikevich{}'.format(i),
+                                      (str(i) if exprs == 'unique' else ''),
+                                      validate=False)
+                    for i in range(size)), validate=False)
+            in_url = os.path.join(tmp_dir, 'in{}{}.xml'.format(size, exprs))
+            nineml.write(in_url, build())
+            for load_name, load in (
+                    ('read', lambda: nineml.read(in_url, reload=True)),
+                    ('build', build)):
+                uncached, _ = time_write(load, out_url, _ParseCache(0))
+                cached, parsed = time_write(
+                    load, out_url, _ParseCache(Parser.DEFAULT_CACHE_SIZE))
+                print("{:>8} {:>7} {:>7} {:>10.3f} {:>11.3f} {:>10.3f} "
+                      "{:>11.3f} {:>7.2f}".format(
+                          size, exprs, load_name, uncached[0], cached[0],
+                          uncached[1], cached[1], parsed))
+finally:
+    Expression._canonical_cache = default_cache
+    shutil.rmtree(tmp_dir)
@@ -0,0 +1,61 @@
+"""
+Benchmarks hashing the objects in the comprehensive example (e.g. when they
+are put into sets or used as dictionary keys) with their structural hashes
+cached and recomputed on every call, and after modifying one of their
+expressions (which clears the cached hashes of all of its ancestors)
+"""
+from __future__ import print_function, division
+import timeit
+from itertools import chain
+from argparse import ArgumentParser
+import sympy
+from nineml.utils.comprehensive_example import instances_of_all_types
+from nineml.visitors.equality import Hasher
+
+
+def hash_uncached(objects):
+    def run():
+        for obj in objects:
+            Hasher().hash(obj)
+    return run
+
+
+def hash_cached(objects):
+    def run():
+        for obj in objects:
+            hash(obj)
+    return run
+
+
+def hash_modified(objects):
+    time_derivatives = [
+        next(chain.from_iterable(r.time_derivatives for r in o.regimes), None)
+        if hasattr(o, 'regimes') else None for o in objects]
+
+    def run():
+        for obj, td in zip(objects, time_derivatives):
+            if td is not None:
+                td.rhs = td.rhs * sympy.Integer(1)
+            hash(obj)
+    return run
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--number', type=int, default=20,
+                    help="Number of times to hash the objects")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+objects = [
+    obj for type_name in ('Dynamics', 'ConnectionRule', 'RandomDistribution',
+                          'DynamicsProperties', 'Population', 'Projection')
+    for _, obj in sorted(instances_of_all_types.get(type_name, {}).items())]
+
+print("Hashing {} objects (ms per pass)\n".format(len(objects)))
+print("{:>10} {:>12}".format('scenario', 'time (ms)'))
+for name, make_run in (('uncached', hash_uncached), ('cached', hash_cached),
+                       ('modified', hash_modified)):
+    elapsed = min(timeit.repeat(make_run(objects), number=args.number,
+                                repeat=args.repeats))
+    print("{:>10} {:>12.3f}".format(name, 1e3 * elapsed / args.number))
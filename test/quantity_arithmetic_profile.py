@@ -0,0 +1,42 @@
+"""
+Benchmarks the arithmetic, comparison and unit conversion operations of
+Quantity objects, which are dominated by the comparison of their dimensions
+and units, e.g. when sweeping over parameter values.
+"""
+from __future__ import print_function, division
+import timeit
+from argparse import ArgumentParser
+import nineml.units as un
+from nineml.units import Quantity
+
+
+a = Quantity(1.5, un.mV)
+b = Quantity(2.0, un.V)
+c = Quantity(3.0, un.ms)
+d = Quantity(0.5, un.nA)
+
+OPERATIONS = [
+    ('add', lambda: a + b),
+    ('subtract', lambda: a - b),
+    ('compare', lambda: a < b),
+    ('multiply', lambda: a * c),
+    ('divide', lambda: a / d),
+    ('power', lambda: c ** 2),
+    ('in_units', lambda: b.in_units(un.mV)),
+    ('dimension ==', lambda: a.units.dimension == b.units.dimension),
+    ('unit ==', lambda: a.units == un.mV),
+    ('unit hash', lambda: hash(un.mV))]
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--number', type=int, default=10000,
+                    help="Number of times to run each operation")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+print("{:>14} {:>16}".format('operation', 'per op (us)'))
+for name, operation in OPERATIONS:
+    elapsed = min(timeit.repeat(operation, number=args.number,
+                                repeat=args.repeats))
+    print("{:>14} {:>16.2f}".format(name, 1e6 * elapsed / args.number))
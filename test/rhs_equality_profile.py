@@ -0,0 +1,132 @@
+"""
+Benchmarks the comparison and hashing of the Dynamics classes in the
+comprehensive example against modified clones of themselves, using the tiered
+RHS equality check (and memoized expansions when hashing) and the previous
+check, which expanded the difference of every pair of expressions compared.
+Sympy's own cache is cleared before each comparison unless memoized.
+"""
+from __future__ import print_function, division
+import timeit
+from itertools import chain
+from argparse import ArgumentParser
+import sympy
+from sympy.core.cache import clear_cache
+from nineml.utils.comprehensive_example import instances_of_all_types
+from nineml.visitors.equality import (
+    EqualityChecker, Hasher, _rhs_equality_memo, _expanded_rhs_memo)
+
+
+class ExpandingEqualityChecker(EqualityChecker):
+
+    def _check_rhs(self, expr1, expr2, nineml_cls):
+        try:
+            expr_eq = (sympy.expand(expr1.rhs - expr2.rhs) == 0)
+        except TypeError:
+            expr_eq = sympy.Equivalent(expr1.rhs, expr2.rhs) == sympy.true
+        if not expr_eq:
+            self._raise_value_exception('rhs', expr1, expr2, nineml_cls)
+
+
+class ExpandingHasher(Hasher):
+
+    def _hash_rhs(self, rhs, **kwargs):  # @UnusedVariable
+        try:
+            rhs = sympy.expand(rhs)
+        except:
+            pass
+        self._hash_attr(rhs)
+
+
+def expressions(dynamics):
+    return list(chain(
+        dynamics.aliases,
+        chain.from_iterable(chain(
+            r.time_derivatives, r.aliases,
+            (oc.trigger for oc in r.on_conditions),
+            chain.from_iterable(t.state_assignments for t in r.transitions))
+            for r in dynamics.regimes)))
+
+
+def resaved(dynamics):
+    "Clone with the RHS set from sympy (i.e. without their source strings)"
+    clone = dynamics.clone(validate=False)
+    for expr in expressions(clone):
+        expr.rhs = expr.rhs
+    return clone
+
+
+def expanded(dynamics):
+    "Clone with RHS that are only equal to the original after expansion"
+    clone = dynamics.clone(validate=False)
+    for expr in expressions(clone):
+        try:
+            expr.rhs = sympy.expand(expr.rhs * 2) / 2
+        except TypeError:  # Triggers
+            pass
+    return clone
+
+
+def modified(dynamics):
+    "Clone with one time derivative that differs from the original"
+    clone = dynamics.clone(validate=False)
+    for regime in clone.regimes:
+        for td in regime.time_derivatives:
+            td.rhs = td.rhs * (1 + sympy.Symbol('t'))
+            return clone
+    return None
+
+
+def time_check(checker, obj1, obj2, memoize):
+    def check():
+        if not memoize:
+            _rhs_equality_memo.clear()
+            clear_cache()
+        checker.check(obj1, obj2)
+    return min(timeit.repeat(check, number=args.number,
+                             repeat=args.repeats)) / args.number
+
+
+def time_hash(hasher, obj, memoize):
+    def hash_obj():
+        if not memoize:
+            _expanded_rhs_memo.clear()
+            clear_cache()
+        hasher.hash(obj)
+    return min(timeit.repeat(hash_obj, number=args.number,
+                             repeat=args.repeats)) / args.number
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--number', type=int, default=5,
+                    help="Number of times to compare each pair of classes")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+classes = [d for _, d in sorted(instances_of_all_types['Dynamics'].items())]
+totals = {}
+for dynamics in classes:
+    for scenario, make in (('clone', lambda d: d.clone(validate=False)),
+                           ('resaved', resaved), ('expanded', expanded),
+                           ('modified', modified)):
+        other = make(dynamics)
+        if other is None:
+            continue
+        times = [time_check(ExpandingEqualityChecker(), dynamics, other,
+                            False),
+                 time_check(EqualityChecker(), dynamics, other, False),
+                 time_check(EqualityChecker(), dynamics, other, True)]
+        totals[scenario] = [t + s for t, s in zip(
+            totals.get(scenario, [0.0] * 3), times)]
+    times = [time_hash(ExpandingHasher(), dynamics, False),
+             time_hash(Hasher(), dynamics, False),
+             time_hash(Hasher(), dynamics, True)]
+    totals['hash'] = [t + s for t, s in zip(totals.get('hash', [0.0] * 3),
+                                            times)]
+
+print("Total over {} Dynamics classes (ms)".format(len(classes)))
+print("{:>10} {:>14} {:>14} {:>14}".format('scenario', 'expand', 'tiered',
+                                           'memoized'))
+for scenario in ('clone', 'resaved', 'expanded', 'modified', 'hash'):
+    print("{:>10} {:>14.3f} {:>14.3f} {:>14.3f}".format(
+        scenario, *(1e3 * t for t in totals[scenario])))
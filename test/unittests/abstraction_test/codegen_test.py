@@ -0,0 +1,135 @@
+import unittest
+import numpy
+from nineml.abstraction import (
+    Dynamics, Regime, Alias, On, OutputEvent, AnalogSendPort,
+    AnalogReducePort, Parameter, StateVariable, Constant)
+from nineml.abstraction.dynamics.codegen import DynamicsCodeGenerator
+from nineml import units as un
+
+
+class DynamicsCodeGenerator_test(unittest.TestCase):
+
+    def setUp(self):
+        DynamicsCodeGenerator.clear_cache()
+        self.dynamics = Dynamics(
+            name='Izhikevich',
+            regimes=[
+                Regime(
+                    name='subthreshold',
+                    time_derivatives=[
+                        'dV/dt = alpha * V2 + beta * V + zeta - U + Iout',
+                        'dU/dt = a * (b * V - U) + V2'],
+                    transitions=[On('V > theta',
+                                    do=['V = c', 'U = U + d + V2',
+                                        OutputEvent('spike')],
+                                    to='subthreshold')]),
+                Regime(
+                    name='refractory',
+                    time_derivatives=['dU/dt = a * (b * V - U)'],
+                    aliases=[Alias('V2', '2 * V')],
+                    transitions=[On('t > tau', to='subthreshold')])],
+            aliases=['V2 := V * V * zeta_scale', 'Iout := Isyn / C_m'],
+            constants=[Constant('zeta_scale', 1.5, un.unitless)],
+            ports=[AnalogSendPort('V', un.voltage),
+                   AnalogReducePort('Isyn', un.current, operator='+')],
+            parameters=['theta', 'a', 'b', 'c', 'd', 'C_m', 'alpha', 'beta',
+                        'zeta', 'tau'],
+            state_variables=['V', 'U'], validate=False)
+        self.values = {
+            'V': numpy.linspace(-1.0, 1.0, 5), 'U': 0.5, 'Isyn': 2.0,
+            'C_m': 4.0, 'a': 0.1, 'alpha': 0.2, 'b': 0.3, 'beta': 0.4,
+            'c': 0.5, 'd': 0.6, 'theta': 0.0, 'zeta': 0.7, 'tau': 2.0,
+            't': 1.0, 'zeta_scale': 1.5}
+        # The value of the alias in the 'subthreshold' regime
+        self.values['V2'] = self.values['V'] ** 2 * 1.5
+        self.values['Iout'] = self.values['Isyn'] / self.values['C_m']
+
+    def test_outputs(self):
+        code = self.dynamics.generate_code()
+        self.assertEqual(list(code), ['refractory', 'subthreshold'])
+        sub = code['subthreshold']
+        self.assertEqual(sub.outputs,
+                         ('dU_dt', 'dV_dt', 'Iout', 'V2', 'trigger0',
+                          'oncondition0_U', 'oncondition0_V'))
+        self.assertEqual(
+            sub.inputs, ('C_m', 'Isyn', 'U', 'V', 'a', 'alpha', 'b', 'beta',
+                         'c', 'd', 'theta', 'zeta'))
+        results = dict(zip(sub.outputs, sub.numpy_kernel(
+            **dict((i, self.values[i]) for i in sub.inputs))))
+        regime = self.dynamics.regime('subthreshold')
+        for td in regime.time_derivatives:
+            self.assertTrue(numpy.allclose(
+                results['d{}_dt'.format(td.variable)],
+                td.rhs_as_python_func(**self._values_of(td))))
+        on_condition = next(regime.on_conditions)
+        self.assertTrue(numpy.array_equal(
+            results['trigger0'],
+            on_condition.trigger.rhs_as_python_func(
+                **self._values_of(on_condition.trigger))))
+        for sa in on_condition.state_assignments:
+            self.assertTrue(numpy.allclose(
+                results['oncondition0_' + sa.lhs],
+                sa.rhs_as_python_func(**self._values_of(sa))))
+        # Regime aliases override those of the class
+        refractory = code['refractory']
+        results = dict(zip(refractory.outputs, refractory.numpy_kernel(
+            **dict((i, self.values[i]) for i in refractory.inputs))))
+        self.assertTrue(numpy.allclose(results['V2'], 2 * self.values['V']))
+        self.assertEqual(results['dV_dt'], 0)
+
+    def test_common_subexpressions(self):
+        sub = self.dynamics.generate_code()['subthreshold']
+        # The alias shared by both time derivatives and the state assignment
+        # is only evaluated once
+        self.assertEqual(sub.c_code.count('1.5'), 1)
+        self.assertEqual(sub.numpy_code.count('1.5'), 1)
+        self.assertIn('int *trigger0', sub.c_code)
+
+    def test_cache(self):
+        code = self.dynamics.generate_code()
+        self.assertEqual(DynamicsCodeGenerator.cache_info()[:2], (0, 1))
+        clone = self.dynamics.clone(validate=False)
+        self.assertIs(clone.generate_code()['subthreshold'],
+                      code['subthreshold'])
+        self.assertEqual(DynamicsCodeGenerator.cache_info()[:2], (1, 1))
+        next(self.dynamics.regime('refractory').time_derivatives).rhs = 'a'
+        self.assertIsNot(self.dynamics.generate_code()['refractory'],
+                         code['refractory'])
+        self.assertEqual(DynamicsCodeGenerator.cache_info()[:2], (1, 2))
+
+    def test_cache_collision(self):
+        code = self.dynamics.generate_code()
+        other = self.dynamics.clone(validate=False)
+        other.name = 'Other'
+        # Simulate a hash collision between different classes
+        other._cached_hash = hash(self.dynamics)
+        other_code = other.generate_code()
+        self.assertIsNot(other_code['subthreshold'], code['subthreshold'])
+        self.assertEqual(other_code['subthreshold'].function_name,
+                         'Other_subthreshold')
+
+    def test_randoms(self):
+        dynamics = Dynamics(
+            name='Random',
+            regimes=[Regime(name='R', transitions=[
+                On('t > T', do=['X = random.uniform()',
+                                'Y = random.uniform()'])])],
+            state_variables=[StateVariable('X'), StateVariable('Y')],
+            parameters=[Parameter('T', un.time)], validate=False)
+        code = dynamics.generate_code()['R']
+        # Each random distribution is drawn separately
+        self.assertEqual(code.c_code.count('random_uniform_('), 2)
+        outputs = dict(zip(code.outputs, code.numpy_kernel(
+            T=numpy.zeros(100), t=1.0)))
+        self.assertEqual(outputs['oncondition0_X'].shape, (100,))
+        self.assertFalse(numpy.array_equal(outputs['oncondition0_X'],
+                                           outputs['oncondition0_Y']))
+        # Samples can be drawn from a given random generator
+        seeded = [dict(zip(code.outputs, code.numpy_kernel(
+            T=numpy.zeros(10), t=1.0, _rng=numpy.random.default_rng(1))))
+            for _ in range(2)]
+        self.assertTrue(numpy.array_equal(seeded[0]['oncondition0_X'],
+                                          seeded[1]['oncondition0_X']))
+
+    def _values_of(self, expr):
+        return dict((n, self.values[n]) for n in expr.rhs_symbol_names)
@@ -1,7 +1,12 @@
 from __future__ import division
 from itertools import groupby
+import os.path
+import shutil
+import tempfile
 import unittest
 import random
+import numpy
+import nineml
 import nineml.units as un
 from nineml.utils.comprehensive_example import conA
 from nineml.abstraction.connectionrule import (
@@ -9,6 +14,8 @@ from nineml.abstraction.connectionrule import (
     explicit_connection_rule, probabilistic_connection_rule,
     random_fan_in_connection_rule, random_fan_out_connection_rule)
 from nineml.user.connectionrule import (ConnectionRuleProperties, Connectivity)
+from nineml.exceptions import (
+    NineMLValueError, NineMLSerializerNotImportedError)
 
 # Fix seed to remove stochasticity from probabilistic connectivity
 random.seed(12345)
@@ -83,3 +90,44 @@ class Connectivity_test(unittest.TestCase):
         num_conns = len(list(connectivity.connections()))
         self.assertAlmostEqual(num_conns / size ** 2, p, 2)
 
+
+
+class ExplicitIndices_test(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.props = ConnectionRuleProperties(
+            'explicit_props', explicit_connection_rule,
+            {'sourceIndices': [0.0, 0.0, 1.0, 3.0, 5.0],
+             'destinationIndices': numpy.array([2, 4, 2, 4, 5])})
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_integer_arrays(self):
+        self.assertEqual(self.props.property('sourceIndices').value.dtype,
+                         numpy.int32)
+        # Integer arrays are used without being copied
+        self.assertEqual(
+            self.props.property('destinationIndices').value.dtype,
+            numpy.int64)
+        connectivity = Connectivity(self.props, 6, 6)
+        src, dest = connectivity.explicit_indices()
+        self.assertIs(src, self.props.property('sourceIndices').value.values)
+        self.assertEqual(list(dest), [2, 4, 2, 4, 5])
+        self.assertRaises(
+            NineMLValueError, ConnectionRuleProperties, 'explicit',
+            explicit_connection_rule,
+            {'sourceIndices': [0.5, 1.0], 'destinationIndices': [1, 2]})
+
+    def test_roundtrip(self):
+        for ext in ('.xml', '.json', '.yml', '.h5', '.9mlz'):
+            url = os.path.join(self._tmp_dir, 'explicit' + ext)
+            try:
+                nineml.write(url, explicit_connection_rule, self.props)
+            except NineMLSerializerNotImportedError:
+                continue
+            reread = nineml.read(url)['explicit_props']
+            self.assertEqual(reread, self.props, ext)
+            for prop in reread.properties:
+                self.assertEqual(prop.value.dtype.kind, 'i', ext)
@@ -6,8 +6,13 @@ from nineml import units as un
 from nineml.abstraction.expressions import (
     ExpressionWithSimpleLHS)
 import sympy
+from threading import Thread
 from nineml.abstraction.expressions.utils import (
     is_single_symbol, str_expr_replacement)
+from nineml.abstraction.expressions.parser import Parser
+from nineml.abstraction.dynamics import Trigger
+from nineml.exceptions import NineMLUsageError, NineMLMathParseError
+import numpy
 
 
 class Expression_test(unittest.TestCase):
@@ -235,6 +240,131 @@ class SympyToC89_test(unittest.TestCase):
         self.assertEqual(expr.rhs_cstr, 'random_exponential_(a)')
 
 
+class PythonFunc_test(unittest.TestCase):
+
+    def test_vectorized(self):
+        e = Expression('a*(b*V - U) + exp(-t/tau)')
+        func = e.rhs_as_python_func
+        V = numpy.linspace(-70.0, -50.0, 100)
+        U = numpy.linspace(-14.0, -10.0, 100)
+        result = func(V=V, U=U, a=0.02, b=0.2, t=1.0, tau=10.0)
+        self.assertEqual(result.shape, (100,))
+        self.assertTrue(numpy.allclose(
+            result, 0.02 * (0.2 * V - U) + numpy.exp(-0.1)))
+        self.assertAlmostEqual(
+            func(V=V[0], U=U[0], a=0.02, b=0.2, t=1.0, tau=10.0), result[0])
+        self.assertRaises(NineMLUsageError, func, V=V, U=U)
+
+    def test_cached(self):
+        e = Expression('x + 1')
+        func = e.rhs_as_python_func
+        self.assertIs(e.rhs_as_python_func, func)
+        e.rhs = 'x + 2'
+        self.assertIsNot(e.rhs_as_python_func, func)
+        self.assertEqual(e.rhs_as_python_func(x=1), 3)
+
+    def test_piecewise_and_triggers(self):
+        x, y = sympy.symbols('x y')
+        e = Expression('y')
+        e.subs(y, sympy.Piecewise((x, x > 0), (-2 * x, True)))
+        func = e.rhs_as_python_func
+        self.assertEqual(func(x=-1.0), 2.0)
+        self.assertTrue(numpy.array_equal(func(x=numpy.arange(-2.0, 3.0)),
+                                          [4.0, 2.0, 0.0, 1.0, 2.0]))
+        func = Trigger('(V > theta) && (U < d)').rhs_as_python_func
+        self.assertTrue(numpy.array_equal(
+            func(V=numpy.arange(4), U=numpy.array([0, 2, 0, 2]), theta=1,
+                 d=1), [False, False, True, False]))
+        self.assertTrue(func(V=2, U=0, theta=1, d=1))
+        trigger = Trigger('t > t_next || t > t_next2')
+        func = trigger.crossing_time_expr.rhs_as_python_func
+        self.assertTrue(numpy.array_equal(
+            func(t_next=numpy.array([1.0, 5.0]),
+                 t_next2=numpy.array([3.0, 2.0])), [1.0, 2.0]))
+
+    def test_random(self):
+        func = Expression('random.uniform() + x').rhs_as_python_func
+        x = numpy.arange(1000.0)
+        result = func(x=x)
+        self.assertEqual(result.shape, (1000,))
+        self.assertTrue(numpy.all((result >= x) & (result < x + 1.0)))
+        self.assertGreater(len(numpy.unique(result - x)), 1)
+        self.assertEqual(numpy.ndim(func(x=1.0)), 0)
+        result = Expression('random.exponential(rate)').rhs_as_python_func(
+            rate=numpy.full(10000, 4.0))
+        self.assertAlmostEqual(result.mean(), 0.25, places=1)
+
+    def test_random_generator(self):
+        func = Expression('random.normal() + x').rhs_as_python_func
+        x = numpy.arange(10.0)
+        result = func(x=x, rng=numpy.random.default_rng(1))
+        self.assertTrue(numpy.array_equal(
+            result, func(x=x, rng=numpy.random.default_rng(1))))
+        self.assertFalse(numpy.array_equal(
+            result, func(x=x, rng=numpy.random.default_rng(2))))
+        # Symbols named 'rng' take precedence over the generator
+        self.assertEqual(Expression('rng + 1').rhs_as_python_func(rng=1.0),
+                         2.0)
+
+
+class ParseCache_test(unittest.TestCase):
+
+    def setUp(self):
+        self.max_size = Parser.cache_info().max_size
+        Parser.clear_cache()
+
+    def tearDown(self):
+        Parser.configure_cache(self.max_size)
+        Parser.clear_cache()
+
+    def test_hits_and_misses(self):
+        expr = Parser().parse('a * x + b')
+        self.assertEqual(Parser.cache_info()[:2], (0, 1))
+        # Whitespace is normalised before the cache is checked
+        self.assertIs(Parser().parse('a * x  +\tb'), expr)
+        self.assertEqual(Parser.cache_info()[:2], (1, 1))
+        self.assertEqual(Expression('a * x + b').rhs, expr)
+        self.assertEqual(Parser.cache_info()[:2], (2, 1))
+        # Single symbols are not parsed or cached
+        Parser().parse('a')
+        self.assertEqual(Parser.cache_info(), (2, 1, self.max_size, 1))
+
+    def test_eviction(self):
+        Parser.configure_cache(2)
+        for expr_str in ('a + b', 'a + c', 'a + b', 'a + d'):
+            Parser().parse(expr_str)
+        self.assertEqual(Parser.cache_info(), (1, 3, 2, 2))
+        # 'a + c' is the least recently used so should have been evicted
+        Parser().parse('a + b')
+        Parser().parse('a + c')
+        self.assertEqual(Parser.cache_info(), (2, 4, 2, 2))
+
+    def test_disable(self):
+        Parser.configure_cache(0)
+        self.assertEqual(Parser().parse('v > v_threshold'),
+                         Parser().parse('v > v_threshold'))
+        self.assertEqual(Parser.cache_info(), (0, 0, 0, 0))
+        self.assertRaises(ValueError, Parser.configure_cache, -1)
+
+    def test_threads(self):
+        expr_strs = ['-v / tau_{}'.format(i % 10) for i in range(200)]
+        results = []
+
+        def parse():
+            results.append([Parser().parse(e) for e in expr_strs])
+
+        threads = [Thread(target=parse) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for result in results:
+            self.assertEqual(result, results[0])
+        hits, misses, _, size = Parser.cache_info()
+        self.assertEqual(hits + misses, 800)
+        self.assertEqual(size, 10)
+
+
 class SympifyTest(unittest.TestCase):
 
     def test_sympify(self):
@@ -246,6 +376,56 @@ class SympifyTest(unittest.TestCase):
                                                    units=un.unitless)))
 
 
+class LazyParse_test(unittest.TestCase):
+
+    def test_deferred(self):
+        alias = Alias('a', 'lazy_b *  lazy_c + 1')
+        self.assertFalse(alias.is_parsed)
+        # Canonical form is the same as for an expression set from sympy
+        self.assertEqual(alias.rhs_xml,
+                         Alias('a', Parser().parse('lazy_b*lazy_c + 1')
+                               ).rhs_xml)
+        alias = Alias('a', 'lazy_b *  lazy_c + 1')
+        self.assertEqual(alias, Alias('a', 'lazy_c*lazy_b + 1'))
+        self.assertTrue(alias.is_parsed)
+        self.assertEqual(
+            set(alias.rhs_symbols),
+            set(sympy.symbols('lazy_b lazy_c')))
+        # Single symbols are cheap so are parsed straight away
+        self.assertTrue(Alias('a', 'lazy_b').is_parsed)
+
+    def test_syntax_checked(self):
+        # Malformed expressions are rejected when they are set
+        self.assertRaises(NineMLMathParseError, Alias, 'a', 'lazy_b +* lazy_c')
+        self.assertRaises(NineMLMathParseError, Alias, 'a', '(lazy_b + 1')
+        # 9ML logical operators are accepted without parsing the expression
+        alias = Alias('a', 'lazy_b > 1 && (lazy_c = 2 || !(lazy_d < 3))')
+        self.assertFalse(alias.is_parsed)
+
+    def test_modification(self):
+        alias = Alias('a', 'lazy_d + lazy_e')
+        self.assertEqual(alias.rhs_xml, 'lazy_d + lazy_e')
+        alias.subs('lazy_e', 'lazy_f')
+        self.assertEqual(alias.rhs_xml, 'lazy_d + lazy_f')
+        alias.rhs_name_transform_inplace({'lazy_d': 'lazy_g'})
+        self.assertEqual(alias.rhs_xml, 'lazy_f + lazy_g')
+        alias.rhs = 'lazy_d + lazy_e'
+        self.assertFalse(alias.is_parsed)
+        self.assertEqual(alias.rhs_xml, 'lazy_d + lazy_e')
+
+    def test_clone(self):
+        alias = Alias('a', 'lazy_h / lazy_i')
+        clone = alias.clone()
+        self.assertFalse(clone.is_parsed)
+        self.assertEqual(clone, alias)
+
+    def test_trigger(self):
+        trigger = Trigger('lazy_j >= lazy_k')
+        self.assertEqual(trigger.rhs, sympy.StrictGreaterThan(
+            *sympy.symbols('lazy_j lazy_k')))
+        self.assertEqual(trigger.rhs_xml, 'lazy_j > lazy_k')
+
+
 class Rationals_test(unittest.TestCase):
 
     def test_xml(self):
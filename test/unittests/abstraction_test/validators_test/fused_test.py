@@ -0,0 +1,118 @@
+import unittest
+from nineml.abstraction import (
+    Dynamics, Regime, On, StateVariable, Parameter)
+from nineml.abstraction.ports import AnalogSendPort, AnalogReceivePort
+from nineml.abstraction.dynamics.visitors.base import BaseDynamicsVisitor
+from nineml.abstraction.dynamics.visitors.validators.base import (
+    DynamicsValidator)
+from nineml.abstraction.dynamics.visitors.validators.general import (
+    DimensionalityDynamicsValidator)
+from nineml.visitors.validators import BaseValidator, FusedValidator
+from nineml.exceptions import NineMLDontVisitChildrenException
+from nineml import units as un
+
+
+class ElementCounter(BaseValidator, BaseDynamicsVisitor):
+
+    def __init__(self, component_class, defer=False, **kwargs):  # @UnusedVariable @IgnorePep8
+        BaseDynamicsVisitor.__init__(self)
+        self.counts = {}
+        self.finalised = False
+        self._validate(component_class, defer)
+
+    def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
+        self.counts[nineml_cls.nineml_type] = (
+            self.counts.get(nineml_cls.nineml_type, 0) + 1)
+
+    def finalise(self):
+        self.finalised = True
+
+
+class RegimePruningCounter(ElementCounter):
+
+    def action_regime(self, regime, nineml_cls, **kwargs):
+        self.default_action(regime, nineml_cls, **kwargs)
+        raise NineMLDontVisitChildrenException()
+
+
+class FusedValidator_test(unittest.TestCase):
+
+    def _make_dynamics(self, regimes=None, aliases=(), ports=None,
+                       state_variables=None):
+        if regimes is None:
+            regimes = [Regime('dSV1/dt = -SV1 / P1', name='R1')]
+        if ports is None:
+            ports = [AnalogSendPort('SV1', dimension=un.voltage)]
+        if state_variables is None:
+            state_variables = [StateVariable('SV1', dimension=un.voltage)]
+        return Dynamics(
+            name='D', regimes=regimes, aliases=list(aliases),
+            state_variables=state_variables,
+            parameters=[Parameter('P1', dimension=un.time)],
+            ports=ports, validate=False)
+
+    def _sequential_error(self, component_class):
+        try:
+            for validator_cls in (DynamicsValidator.validator_classes +
+                                  (DimensionalityDynamicsValidator,)):
+                validator_cls(component_class)
+        except Exception as e:
+            return e
+        return None
+
+    def _fused_error(self, component_class):
+        try:
+            DynamicsValidator.validate_componentclass(component_class)
+        except Exception as e:
+            return e
+        return None
+
+    def test_same_errors(self):
+        for component_class in (
+                # Valid
+                self._make_dynamics(aliases=['A1 := SV1 * 2']),
+                # Regime graph with islands
+                self._make_dynamics(regimes=[
+                    Regime('dSV1/dt = -SV1 / P1', name='R1'),
+                    Regime(name='R2')]),
+                # Recursive aliases
+                self._make_dynamics(aliases=['A1 := A2', 'A2 := A1']),
+                # Analog send port without a matching alias or state variable
+                self._make_dynamics(ports=[
+                    AnalogSendPort('SV2', dimension=un.voltage)]),
+                # Mismatching dimensions
+                self._make_dynamics(regimes=[
+                    Regime('dSV1/dt = -SV1 * P1', name='R1')]),
+                # Recursive aliases and mismatching dimensions, where the
+                # error of the validator checked first takes precedence
+                self._make_dynamics(
+                    regimes=[Regime('dSV1/dt = -SV1 * P1', name='R1')],
+                    aliases=['A1 := A2', 'A2 := A1']),
+                # Local name conflict (and no send port)
+                self._make_dynamics(ports=[
+                    AnalogReceivePort('SV1', dimension=un.voltage)])):
+            sequential = self._sequential_error(component_class)
+            fused = self._fused_error(component_class)
+            self.assertEqual(type(fused), type(sequential))
+            self.assertEqual(str(fused), str(sequential))
+
+    def test_single_traversal(self):
+        component_class = self._make_dynamics(
+            regimes=[Regime('dSV1/dt = -SV1 / P1', name='R1',
+                            transitions=[On('SV1 > P1', to='R2')]),
+                     Regime(name='R2', transitions=[On('SV1 < P1', to='R1')])])
+        standalone = ElementCounter(component_class)
+        pruned_standalone = RegimePruningCounter(component_class)
+        fused = FusedValidator(component_class,
+                               [ElementCounter, RegimePruningCounter],
+                               as_class=Dynamics)
+        counter, pruning_counter = fused.validators
+        self.assertEqual(counter.counts, standalone.counts)
+        self.assertEqual(counter.counts['Regime'], 2)
+        self.assertEqual(counter.counts['OnCondition'], 2)
+        # Children of the regimes aren't passed to the pruning validator
+        self.assertEqual(pruning_counter.counts, pruned_standalone.counts)
+        self.assertEqual(pruning_counter.counts['Regime'], 2)
+        self.assertNotIn('OnCondition', pruning_counter.counts)
+        self.assertTrue(counter.finalised)
+        self.assertTrue(pruning_counter.finalised)
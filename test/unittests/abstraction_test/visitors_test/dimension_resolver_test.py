@@ -35,3 +35,20 @@ class DynamicsRequiredDefinitions_test(unittest.TestCase):
         self.assertEquals(self.a.dimension_of('A1'), un.current)
         self.assertEquals(self.a.dimension_of('A2'), un.charge)
         self.assertEquals(self.a.dimension_of('A3'), un.dimensionless)
+
+    def test_rational_exponents(self):
+        b = Dynamics(
+            name='B',
+            aliases=['A1 := sqrt(P1)', 'A2 := P2 ** 2 / P1'],
+            parameters=[Parameter('P1', dimension=un.voltage ** 2),
+                        Parameter('P2', dimension=un.voltage)],
+            validate=False)
+        self.assertEquals(b.dimension_of('A1'), un.voltage)
+        self.assertEquals(b.dimension_of('A2'), un.dimensionless)
+
+    def test_cached_resolver_invalidation(self):
+        self.assertEquals(self.a.dimension_of('A3'), un.dimensionless)
+        self.a.remove(self.a.alias('A3'))
+        self.a.add(Alias('A3', 'P1 * P5'))
+        self.assertEquals(self.a.dimension_of('A3'),
+                          un.voltage * un.current ** 2 / un.length)
@@ -0,0 +1,59 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+import zipfile
+import numpy
+import nineml
+from nineml.serialization.bundle import (
+    BundleSerializer, BundleUnserializer, DOCUMENT_MEMBER)
+from nineml.utils.comprehensive_example import dynC, dynPropC
+
+
+class TestBundle(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_roundtrip(self):
+        url = os.path.join(self._tmp_dir, 'bundle.9mlz')
+        nineml.write(url, dynC, dynPropC, version=2.0)
+        with zipfile.ZipFile(url) as zf:
+            members = zf.infolist()
+        self.assertEqual(members[0].filename, DOCUMENT_MEMBER)
+        # Arrays should be stored uncompressed in separate members
+        self.assertTrue(any(m.filename.endswith('.npy') for m in members))
+        self.assertTrue(all(m.compress_type == zipfile.ZIP_STORED
+                            for m in members))
+        reread = nineml.read(url, reload=True)['dynPropC']
+        self.assertEqual(list(reread.properties), list(dynPropC.properties))
+        array = next(p.value for p in reread.properties
+                     if p.value.nineml_type == 'ArrayValue')
+        self.assertIsInstance(array.values, numpy.memmap)
+
+    def test_dtypes(self):
+        serializer = BundleSerializer()
+        values = [numpy.arange(10, dtype='>i4'), numpy.linspace(-1, 1, 7),
+                  numpy.empty(0)]
+        for i, vals in enumerate(values):
+            elem = serializer.create_elem('ArrayValue{}'.format(i),
+                                          parent=serializer.root)
+            serializer.set_array(elem, 'ArrayValueRow', vals)
+        url = os.path.join(self._tmp_dir, 'arrays.9mlz')
+        with open(url, 'wb') as f:
+            serializer.to_file(serializer.root, f)
+        for from_str in (False, True):
+            unserializer = BundleUnserializer(root=None, version=2.0)
+            if from_str:
+                root = unserializer.from_str(
+                    serializer.to_str(serializer.root))
+            else:
+                root = unserializer.from_file(open(url))
+            for i, vals in enumerate(values):
+                decoded = unserializer.get_array(
+                    root['ArrayValue{}'.format(i)], 'ArrayValueRow')
+                self.assertEqual(decoded.dtype, vals.dtype)
+                self.assertTrue(numpy.array_equal(decoded, vals))
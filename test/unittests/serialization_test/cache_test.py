@@ -0,0 +1,80 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+import nineml
+from nineml.serialization import DocumentCache
+from nineml.utils.comprehensive_example import (
+    instances_of_all_types, dynC, dynPropC)
+
+
+class TestDocumentCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.cache = DocumentCache(os.path.join(self._tmp_dir, 'cache'))
+        self.url = os.path.join(self._tmp_dir, 'doc.xml')
+        self.doc = next(iter(instances_of_all_types['NineML'].values()))
+        nineml.write(self.url, self.doc.clone(), version=2.0)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _entries(self):
+        return [f for f in os.listdir(self.cache.directory)
+                if f.endswith(DocumentCache.EXT)]
+
+    def test_roundtrip(self):
+        doc = nineml.read(self.url, reload=True, cache=self.cache)
+        self.assertEqual(len(self._entries()), 1)
+        key = self.cache.key(self.url)
+        cached_doc = self.cache.load(key)
+        self.assertIsNot(cached_doc, doc)
+        self.assertEqual(cached_doc.url, self.url)
+        self.assertTrue(cached_doc.equals(doc), cached_doc.find_mismatch(doc))
+        reread_doc = nineml.read(self.url, reload=True, cache=self.cache)
+        self.assertTrue(reread_doc.equals(doc), reread_doc.find_mismatch(doc))
+
+    def test_overwrite(self):
+        # Entries saved by another process in the meantime are overwritten
+        doc = nineml.read(self.url, reload=True, cache=self.cache)
+        key = self.cache.key(self.url)
+        self.cache.save(key, doc)
+        self.assertEqual(len(self._entries()), 1)
+        self.assertEqual(os.listdir(self.cache.directory), self._entries())
+        self.assertTrue(self.cache.load(key).equals(doc))
+
+    def test_content_change(self):
+        nineml.read(self.url, reload=True, cache=self.cache)
+        key = self.cache.key(self.url)
+        nineml.write(self.url, dynC, version=2.0)
+        self.assertNotEqual(self.cache.key(self.url), key)
+        doc = nineml.read(self.url, reload=True, cache=self.cache)
+        self.assertIn('dynC', doc)
+        self.assertEqual(len(self._entries()), 2)
+
+    def test_external_references(self):
+        url_a = os.path.join(self._tmp_dir, 'a.xml')
+        url_b = os.path.join(self._tmp_dir, 'b.xml')
+        nineml.write(url_a, dynC)
+        props = nineml.DynamicsProperties(
+            'props', nineml.read(url_a)['dynC'], list(dynPropC.properties))
+        nineml.write(url_b, props)
+        nineml.read(url_b, reload=True, cache=self.cache)
+        cached_doc = self.cache.load(self.cache.key(url_b))
+        # Elements of other documents are not stored in the cache entry but
+        # are loaded from their documents
+        self.assertIs(cached_doc['props'].component_class,
+                      nineml.read(url_a)['dynC'])
+
+    def test_eviction(self):
+        nineml.read(self.url, reload=True, cache=self.cache)
+        entry_path = os.path.join(self.cache.directory, self._entries()[0])
+        entry_size = os.path.getsize(entry_path)
+        # Make sure the existing entry is the least recently used
+        os.utime(entry_path, (0, 0))
+        cache = DocumentCache(self.cache.directory, max_size=entry_size)
+        nineml.write(self.url, dynC, version=2.0)
+        nineml.read(self.url, reload=True, cache=cache)
+        self.assertEqual(self._entries(),
+                         [cache.key(self.url) + DocumentCache.EXT])
@@ -0,0 +1,52 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+import numpy
+import nineml
+from nineml.serialization.dict import DictSerializer, DictUnserializer
+from nineml.exceptions import NineMLSerializationError
+from nineml.utils.comprehensive_example import dynC, dynPropC
+
+
+class TestCompactArrays(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_roundtrip(self):
+        for ext in ('.json', '.yml'):
+            for encoding in DictSerializer.array_encodings:
+                url = os.path.join(self._tmp_dir, encoding + ext)
+                nineml.write(url, dynC, dynPropC, version=2.0,
+                             array_encoding=encoding)
+                if ext == '.json':
+                    with open(url) as f:
+                        contents = f.read()
+                    # Only the row encoding should write separate indices
+                    self.assertEqual('index' in contents, encoding == 'rows',
+                                     encoding)
+                reread = nineml.read(url, reload=True)['dynPropC']
+                self.assertEqual(list(reread.properties),
+                                 list(dynPropC.properties),
+                                 "{} ({})".format(encoding, ext))
+
+    def test_dtypes(self):
+        serializer = DictSerializer(array_encoding='base64')
+        unserializer = DictUnserializer(root=None, version=2.0)
+        for values in (numpy.arange(10, dtype='>i4'),
+                       numpy.linspace(-1.0, 1.0, 7)):
+            elem = serializer.create_elem('ArrayValue',
+                                          parent=serializer.root)
+            serializer.set_array(elem, 'ArrayValueRow', values)
+            decoded = unserializer.get_array(elem, 'ArrayValueRow')
+            self.assertIn(decoded.dtype.byteorder, '<=|')
+            self.assertTrue(numpy.array_equal(decoded, values))
+            del serializer.root['ArrayValue']
+
+    def test_unrecognised_encoding(self):
+        self.assertRaises(NineMLSerializationError, DictSerializer,
+                          array_encoding='csv')
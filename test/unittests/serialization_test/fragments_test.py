@@ -0,0 +1,100 @@
+import gc
+import os.path
+import shutil
+import tempfile
+import unittest
+import nineml
+import nineml.units as un
+from nineml.serialization.base import BaseSerializer
+from nineml.serialization.base.fragments import FragmentCache
+from nineml.utils.comprehensive_example import doc1
+
+
+class TestFragmentCache(unittest.TestCase):
+
+    def setUp(self):
+        self.doc = doc1.clone()
+        self.dyn = self.doc['dynA']
+        self.props = self.doc['dynPropA']
+        self.cache = FragmentCache()
+
+    def serialize(self, nineml_object, **kwargs):
+        return nineml.serialize(nineml_object, to_str=True,
+                                fragment_cache=self.cache, **kwargs)
+
+    def test_reuse(self):
+        for format in ('xml', 'json', 'yaml'):  # @ReservedAssignment
+            serialized = self.serialize(self.doc, format=format)
+            self.assertIn(id(self.dyn), self.cache._entries)
+            self.assertEqual(self.serialize(self.doc, format=format),
+                             serialized)
+            self.assertEqual(
+                nineml.serialize(self.doc, format=format, to_str=True),
+                serialized)
+
+    def test_opt_in(self):
+        self.serialize(self.dyn)
+        self.assertNotIn(id(self.dyn), BaseSerializer.fragment_cache._entries)
+        try:
+            nineml.serialize(self.dyn, to_str=True, fragment_cache=True)
+            self.assertIn(id(self.dyn),
+                          BaseSerializer.fragment_cache._entries)
+        finally:
+            BaseSerializer.fragment_cache.clear()
+
+    def test_context_unchanged_without_cache(self):
+        # Without a fragment cache, document-level objects are serialized in
+        # a new document as they were before fragments were cached
+        self.assertEqual(
+            nineml.serialize(self.props, to_str=True),
+            nineml.serialize(self.props, to_str=True,
+                             document=nineml.Document(self.props)))
+
+    def test_not_cached_when_streaming(self):
+        tmp_dir = tempfile.mkdtemp()
+        try:
+            nineml.write(os.path.join(tmp_dir, 'streamed.xml'), self.doc,
+                         stream=True, fragment_cache=self.cache,
+                         register=False)
+        finally:
+            shutil.rmtree(tmp_dir)
+        self.assertEqual(len(self.cache), 0)
+
+    def test_invalidation(self):
+        serialized = self.serialize(self.dyn)
+        time_deriv = next(next(self.dyn.regimes).time_derivatives)
+        rhs = time_deriv.rhs
+        time_deriv.rhs = rhs * 2
+        self.assertNotEqual(self.serialize(self.dyn),
+                            serialized)
+        time_deriv.rhs = rhs
+        self.assertEqual(self.serialize(self.dyn),
+                         serialized)
+        self.dyn.annotations.set(('TestFragments', 'http://test.org'),
+                                 'attr', 'value')
+        self.assertIn('TestFragments',
+                      self.serialize(self.dyn))
+
+    def test_property_invalidation(self):
+        serialized = self.serialize(self.props)
+        prop = next(self.props.properties)
+        prop.quantity = nineml.Quantity(123.0, prop.units)
+        reserialized = self.serialize(self.props)
+        self.assertNotEqual(reserialized, serialized)
+        self.assertIn('123.0', reserialized)
+
+    def test_disabled(self):
+        self.assertTrue(self.cache.enabled)
+        self.cache.enabled = False
+        self.serialize(self.dyn)
+        self.assertNotIn(id(self.dyn), self.cache._entries)
+
+    def test_garbage_collection(self):
+        cache = FragmentCache()
+        dimension = un.Dimension('fragment_test', t=1)
+        cache.set(dimension, 'key', 'fragment', [dimension])
+        self.assertEqual(cache.get(dimension, 'key'),
+                         ('fragment', [dimension]))
+        del dimension
+        gc.collect()
+        self.assertEqual(len(cache), 0)
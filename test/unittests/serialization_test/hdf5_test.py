@@ -0,0 +1,47 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+import numpy
+import h5py
+import nineml
+from nineml.utils.comprehensive_example import dynC, dynPropC
+
+
+class TestHDF5Arrays(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.url = os.path.join(self._tmp_dir, 'arrays.h5')
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _dataset_paths(self):
+        paths = []
+        with h5py.File(self.url, 'r') as f:
+            f.visititems(lambda n, o: paths.append(n)
+                         if isinstance(o, h5py.Dataset) else None)
+        return paths
+
+    def test_contiguous_roundtrip(self):
+        nineml.write(self.url, dynC, dynPropC, version=2.0)
+        paths = self._dataset_paths()
+        self.assertTrue(paths)
+        self.assertTrue(all(p.endswith('ArrayValueRow') for p in paths))
+        reread = nineml.read(self.url, reload=True)['dynPropC']
+        self.assertEqual(list(reread.properties), list(dynPropC.properties))
+        values = reread.property('P2').value.values
+        # Uncompressed datasets should be memory-mapped from the file
+        self.assertIsInstance(values, numpy.memmap)
+        self.assertEqual(list(values), [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    def test_compressed_roundtrip(self):
+        nineml.write(self.url, dynC, dynPropC, version=2.0, compression='gzip')
+        with h5py.File(self.url, 'r') as f:
+            datasets = []
+            f.visititems(lambda n, o: datasets.append(o.compression)
+                         if isinstance(o, h5py.Dataset) else None)
+        self.assertTrue(all(c == 'gzip' for c in datasets))
+        reread = nineml.read(self.url, reload=True)['dynPropC']
+        self.assertEqual(list(reread.properties), list(dynPropC.properties))
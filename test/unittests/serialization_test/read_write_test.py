@@ -3,7 +3,7 @@ import unittest
 import tempfile
 import os
 from nineml import read, write
-from nineml import DynamicsProperties
+from nineml import DynamicsProperties, Document
 from nineml.utils.comprehensive_example import dynA, dynB
 
 
@@ -23,3 +23,89 @@ class TestReadWrite(unittest.TestCase):
             definition='{}#dynB'.format(os.path.join(tmp_dir, self.tmp_path)),
             properties={'P1': 1, 'P2': 2, 'P3': 3})
         self.assertEqual(dynB, dynBProps.component_class)
+
+    def test_lazy_read(self):
+        tmp_dir = tempfile.mkdtemp()
+        url = os.path.join(tmp_dir, 'lazy.xml')
+        write(url, dynA, dynB)
+        doc = read(url, lazy=True, reload=True)
+        # Nothing should be loaded until it is accessed
+        self.assertEqual(list(dict.keys(doc)), [])
+        self.assertEqual(sorted(doc.keys()),
+                         sorted(read(url, reload=True).keys()))
+        self.assertEqual(doc['dynA'], dynA)
+        self.assertIn('dynA', dict.keys(doc))
+        self.assertNotIn('dynB', dict.keys(doc))
+        # Iterating over the elements should load the remaining elements
+        self.assertEqual(len(list(doc.elements)), len(list(doc.keys())))
+        self.assertEqual(doc['dynB'], dynB)
+
+    def test_prefetch(self):
+        tmp_dir = tempfile.mkdtemp()
+        url_a = os.path.join(tmp_dir, 'a.xml')
+        url_b = os.path.join(tmp_dir, 'b.xml')
+        url_c = os.path.join(tmp_dir, 'c.xml')
+        write(url_a, dynA, dynB)
+        write(url_b, DynamicsProperties(
+            name='dynBProps', definition=read(url_a)['dynB'],
+            properties={'P1': 1, 'P2': 2, 'P3': 3}))
+        # Reference a directly and indirectly via b
+        with open(url_c, 'w') as f:
+            f.write(
+                '<NineML xmlns="http://nineml.net/9ML/1.0">\n'
+                '  <Component name="dynBProps2">\n'
+                '    <Prototype url="./b.xml">dynBProps</Prototype>\n'
+                '    <Property name="P1" units="unitless">\n'
+                '      <SingleValue>4.0</SingleValue>\n'
+                '    </Property>\n'
+                '  </Component>\n'
+                '  <Component name="dynBProps3">\n'
+                '    <Definition url="./a.xml">dynB</Definition>\n'
+                '    <Property name="P1" units="unitless">\n'
+                '      <SingleValue>5.0</SingleValue>\n'
+                '    </Property>\n'
+                '    <Property name="P2" units="unitless">\n'
+                '      <SingleValue>6.0</SingleValue>\n'
+                '    </Property>\n'
+                '    <Property name="P3" units="unitless">\n'
+                '      <SingleValue>7.0</SingleValue>\n'
+                '    </Property>\n'
+                '  </Component>\n'
+                '  <Unit symbol="unitless" dimension="dimensionless" '
+                'power="0"/>\n'
+                '  <Dimension name="dimensionless"/>\n'
+                '</NineML>\n')
+        urls = (url_a, url_b, url_c)
+        for url in urls:
+            Document.registry.pop(url, None)
+        prefetched = read(url_c, prefetch=2)
+        # Both directly and indirectly referenced documents should have been
+        # added to the registry
+        self.assertEqual(sorted(u for u in urls if u in Document.registry),
+                         sorted(urls))
+        self.assertIs(prefetched['dynBProps2'].component_class,
+                      read(url_a)['dynB'])
+        self.assertIs(prefetched['dynBProps3'].component_class,
+                      read(url_a)['dynB'])
+        self.assertEqual(prefetched, read(url_c, reload=True))
+
+    def test_v1_component_type_resolution(self):
+        tmp_dir = tempfile.mkdtemp()
+        url = os.path.join(tmp_dir, 'chain.xml')
+        write(url, dynB, DynamicsProperties(
+            name='dynBProps0', definition=dynB,
+            properties={'P1': 1, 'P2': 2, 'P3': 3}), version=1.0)
+        with open(url) as f:
+            contents = f.read()
+        # Append a chain of components that are each the prototype of the next
+        components = ''.join(
+            '  <Component name="dynBProps{}">\n'
+            '    <Prototype>dynBProps{}</Prototype>\n'
+            '  </Component>\n'.format(i, i - 1) for i in range(1, 5))
+        with open(url, 'w') as f:
+            f.write(contents.replace('</NineML>', components + '</NineML>'))
+        doc = read(url, reload=True)
+        for i in range(5):
+            props = doc['dynBProps{}'.format(i)]
+            self.assertIsInstance(props, DynamicsProperties)
+            self.assertEqual(props.component_class, dynB)
@@ -0,0 +1,115 @@
+import os.path
+import shutil
+import tempfile
+import unittest
+import nineml
+from nineml.serialization import format_to_serializer
+from nineml.serialization.xml import XMLSerializer
+from nineml.exceptions import NineMLSerializationError
+from nineml.utils.comprehensive_example import (
+    instances_of_all_types, v1_safe_docs)
+
+
+class FailingXMLSerializer(XMLSerializer):
+    "Fails after the first document-level element has been streamed"
+
+    _streamed = False
+
+    def visit(self, nineml_object, parent=None, **kwargs):
+        is_doc_level = parent is None or parent is self.root
+        if is_doc_level and self._streamed:
+            raise NineMLSerializationError("Failing serialization")
+        serial_elem = super(FailingXMLSerializer, self).visit(
+            nineml_object, parent=parent, **kwargs)
+        self._streamed |= is_doc_level
+        return serial_elem
+
+
+class FailingOpenXMLSerializer(XMLSerializer):
+    "Fails to open the file to write to"
+
+    @classmethod
+    def open_file(cls, url):
+        raise IOError("Failing open of '{}'".format(url))
+
+
+class TestStreaming(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def test_roundtrip(self):
+        for version, docs in (
+                (1.0, v1_safe_docs),
+                (2.0, list(instances_of_all_types['NineML'].values()))):
+            for i, doc in enumerate(docs):
+                url = os.path.join(self._tmp_dir,
+                                   'stream{}v{}.xml'.format(i, version))
+                nineml.write(url, doc.clone(), version=version, stream=True)
+                reread = nineml.read(url, reload=True)
+                self.assertTrue(reread.equals(doc), reread.find_mismatch(doc))
+
+    def test_elements_freed(self):
+        doc = next(iter(instances_of_all_types['NineML'].values())).clone()
+        url = os.path.join(self._tmp_dir, 'freed.xml')
+        with open(url, 'wb') as f:
+            serializer = XMLSerializer(document=doc, fname=f, stream=True)
+            serializer.serialize()
+            # Document-level elements should have been written and removed
+            # from the root as they were serialized
+            self.assertEqual(len(serializer.root), 0)
+            self.assertRaises(NineMLSerializationError, serializer.to_str,
+                              serializer.root)
+            serializer.to_file(serializer.root, f)
+        self.assertEqual(sorted(nineml.read(url, reload=True).keys()),
+                         sorted(doc.keys()))
+
+    def test_missing_file(self):
+        self.assertRaises(NineMLSerializationError, XMLSerializer,
+                          stream=True)
+
+    def test_failure(self):
+        doc = next(iter(instances_of_all_types['NineML'].values())).clone()
+        url = os.path.join(self._tmp_dir, 'failed.xml')
+        format_to_serializer['xml'] = FailingXMLSerializer
+        try:
+            self.assertRaises(NineMLSerializationError, nineml.write, url,
+                              doc, stream=True)
+        finally:
+            format_to_serializer['xml'] = XMLSerializer
+        # The truncated file is removed
+        self.assertFalse(os.path.exists(url))
+        self.assertEqual(os.listdir(self._tmp_dir), [])
+        # The writer is closed so the file handle can be closed cleanly
+        with open(url, 'wb') as f:
+            serializer = FailingXMLSerializer(document=doc, fname=f,
+                                              stream=True)
+            self.assertRaises(NineMLSerializationError, serializer.serialize)
+            serializer.abort()
+            self.assertIsNone(serializer._stream)
+            serializer.abort()  # Has no effect once the writer is closed
+
+    def test_existing_file_preserved(self):
+        doc = next(iter(instances_of_all_types['NineML'].values())).clone()
+        url = os.path.join(self._tmp_dir, 'existing.xml')
+        with open(url, 'w') as f:
+            f.write('previous contents')
+        for serializer_cls, kwargs in (
+                (FailingOpenXMLSerializer, {}),
+                (FailingXMLSerializer, {'stream': True})):
+            format_to_serializer['xml'] = serializer_cls
+            try:
+                self.assertRaises((IOError, NineMLSerializationError),
+                                  nineml.write, url, doc, **kwargs)
+            finally:
+                format_to_serializer['xml'] = XMLSerializer
+            with open(url) as f:
+                self.assertEqual(f.read(), 'previous contents')
+            self.assertEqual(os.listdir(self._tmp_dir), ['existing.xml'])
+        # A successful write replaces the contents
+        nineml.write(url, doc)
+        self.assertEqual(sorted(nineml.read(url, reload=True).keys()),
+                         sorted(doc.keys()))
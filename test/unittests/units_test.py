@@ -1,6 +1,14 @@
 import unittest
+import numpy
 from sympy import sympify
 from nineml import units as un
+from nineml.units import Quantity
+from nineml.values import RandomDistributionValue
+from nineml.abstraction import (
+    Dynamics, Parameter, StateVariable, Regime, RandomDistribution)
+from nineml.user import (
+    DynamicsProperties, Population, RandomDistributionProperties)
+from nineml.exceptions import NineMLUsageError, NineMLDimensionError
 from nineml.serialization.xml import XMLUnserializer
 
 
@@ -24,6 +32,12 @@ class TestUnitsDimensions(unittest.TestCase):
             self.assertEquals(dim, new_dim,
                               "Sympy roundtrip failed for {}".format(dim))
 
+    def test_from_powers(self):
+        dim = un.Dimension.from_powers((1, 2, -3, -1, 0, 0, 0))
+        self.assertEqual(dim, un.voltage)
+        self.assertEqual(dim.name, 'mass_length2_per_time3_current')
+        self.assertIs(un.Dimension.from_powers((0,) * 7), un.dimensionless)
+
     def test_accessors(self):
 
         for i, (abbrev, name) in enumerate((
@@ -34,6 +48,91 @@ class TestUnitsDimensions(unittest.TestCase):
                 self.assertEqual(getattr(dim, abbrev), dim._dims[i])
                 self.assertEqual(getattr(dim, name), dim._dims[i])
 
+    def test_equality_consistent_with_visitor(self):
+        for dim1 in all_dims:
+            for dim2 in all_dims:
+                self.assertEqual(dim1 == dim2, dim1.equals(dim2))
+        all_units = [getattr(un, u) for u in dir(un)
+                     if isinstance(getattr(un, u), un.Unit)]
+        for unit1 in all_units:
+            for unit2 in all_units:
+                self.assertEqual(unit1 == unit2, unit1.equals(unit2))
+                if unit1 == unit2:
+                    self.assertEqual(hash(unit1), hash(unit2))
+        self.assertNotEqual(un.time, un.ms)
+
+    def test_interning(self):
+        self.assertIs(un.Dimension('other_time', t=1)._dims, un.time._dims)
+        self.assertIs(un.mV * un.nA, un.mV * un.nA)
+        self.assertIs(un.voltage / un.time, un.voltage / un.time)
+        self.assertEqual((un.mV * un.nA).dimension, un.voltage * un.current)
+
+
+class TestUnitConversion(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamics = Dynamics(
+            name='D',
+            parameters=[Parameter('tau', dimension=un.time),
+                        Parameter('v_rest', dimension=un.voltage)],
+            state_variables=[StateVariable('v', dimension=un.voltage)],
+            regimes=[Regime('dv/dt = (v_rest - v) / tau', name='R')])
+        self.uniform = RandomDistribution(
+            name='uniform',
+            standard_library='http://www.uncertml.org/distributions/uniform',
+            parameters=[Parameter('minimum', dimension=un.dimensionless),
+                        Parameter('maximum', dimension=un.dimensionless)])
+        self.props = DynamicsProperties(
+            name='DP', definition=self.dynamics,
+            properties={'tau': 20.0 * un.ms,
+                        'v_rest': Quantity([-65.0, -70.0], un.mV)},
+            initial_values={'v': Quantity(RandomDistributionValue(
+                RandomDistributionProperties(
+                    'uniform_props', self.uniform,
+                    {'minimum': -70.0, 'maximum': -60.0})), un.mV)})
+
+    def test_si(self):
+        values = self.props.values_in_units(size=5, seed=1)
+        self.assertEqual(list(values), ['tau', 'v_rest', 'v'])
+        self.assertAlmostEqual(values['tau'], 0.02)
+        self.assertTrue(numpy.allclose(values['v_rest'], [-0.065, -0.07]))
+        self.assertEqual(values['v'].shape, (5,))
+        self.assertTrue(numpy.all((values['v'] >= -0.07) &
+                                  (values['v'] <= -0.06)))
+        self.assertRaises(NineMLUsageError, self.props.values_in_units)
+
+    def test_generator_seed(self):
+        values = self.props.values_in_units(
+            size=5, seed=numpy.random.default_rng(1))
+        self.assertTrue(numpy.array_equal(
+            values['v'], self.props.values_in_units(size=5, seed=1)['v']))
+
+    def test_mapping(self):
+        values = self.props.values_in_units({un.voltage: un.mV},
+                                            size=5, seed=1)
+        self.assertAlmostEqual(values['tau'], 0.02)
+        self.assertTrue(numpy.allclose(values['v_rest'], [-65.0, -70.0]))
+        self.assertRaises(NineMLDimensionError, un.UnitConverter,
+                          {un.time: un.mV})
+
+    def test_population(self):
+        pop = Population('P', 10, self.props)
+        values = pop.values_in_units({un.time: un.ms}, seed=1)
+        self.assertAlmostEqual(values['tau'], 20.0)
+        self.assertEqual(values['v'].shape, (10,))
+        self.assertTrue(numpy.array_equal(
+            values['v'], pop.values_in_units(seed=1)['v']))
+
+    def test_offset(self):
+        degC = un.Unit('degC', un.temperature, power=0, offset=273.15)
+        converter = un.UnitConverter()
+        self.assertAlmostEqual(converter.convert(Quantity(10.0, degC)),
+                               283.15)
+        self.assertAlmostEqual(
+            un.UnitConverter({un.temperature: degC}).convert(
+                Quantity(283.15, un.K)), 10.0)
+
+
 # FIXME: Currently the 'scale' attribute isn't supported, need to work out
 #        whether we want to do this or not.
 units_xml_str = """<?xml version="1.0" encoding="UTF-8"?>
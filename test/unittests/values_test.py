@@ -0,0 +1,245 @@
+import math
+import os.path
+import shutil
+import tempfile
+import unittest
+import numpy
+import nineml
+import nineml.units as un
+from nineml.abstraction import Parameter
+from nineml.values import ArrayValue, RandomDistributionValue
+from nineml.utils import nearly_equal, nearly_equal_arrays, round_mantissas
+from nineml.exceptions import NineMLValueError, NineMLUsageError
+from nineml.utils.comprehensive_example import dynC, dynPropC
+
+
+class TestExternalArrayValue(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp_dir = tempfile.mkdtemp()
+        self.values = numpy.arange(10, dtype=float)
+
+    def tearDown(self):
+        shutil.rmtree(self._tmp_dir)
+
+    def _path(self, fname):
+        return os.path.join(self._tmp_dir, fname)
+
+    def test_npy_memmap(self):
+        url = self._path('values.npy')
+        numpy.save(url, self.values)
+        array_value = ArrayValue(datafile=(url, 'application/x-npy', None))
+        self.assertFalse(array_value.loaded)
+        self.assertEqual(list(array_value), list(self.values))
+        self.assertTrue(array_value.loaded)
+        self.assertIsInstance(array_value.values, numpy.memmap)
+
+    def test_raw_memmap(self):
+        url = self._path('values.bin')
+        self.values.astype('<f8').tofile(url)
+        array_value = ArrayValue(datafile=(url, 'application/octet-stream',
+                                           None))
+        self.assertIsInstance(array_value.values, numpy.memmap)
+        self.assertEqual(list(array_value), list(self.values))
+
+    def test_shared_buffer(self):
+        url = self._path('values.npy')
+        numpy.save(url, self.values)
+        array_value1 = ArrayValue(datafile=(url, 'application/x-npy', None))
+        array_value2 = ArrayValue(datafile=(url, 'application/x-npy', None))
+        self.assertIs(array_value1.values, array_value2.values)
+        # Read-only buffers are shared with clones too
+        self.assertIs(array_value1.clone().values, array_value1.values)
+
+    def test_text_column_selection(self):
+        url = self._path('values.csv')
+        with open(url, 'w') as f:
+            f.write('a, b\n')
+            for v in self.values:
+                f.write('{}, {}\n'.format(v, 2 * v))
+        array_a = ArrayValue(datafile=(url, 'text/csv', 'a'))
+        array_b = ArrayValue(datafile=(url, 'text/csv', 'b'))
+        self.assertEqual(list(array_a), list(self.values))
+        self.assertEqual(list(array_b), list(2 * self.values))
+        # Both columns are contiguous views of the same parsed buffer
+        self.assertIs(array_a.values.base, array_b.values.base)
+        self.assertTrue(array_a.values.flags['C_CONTIGUOUS'])
+        self.assertRaises(
+            NineMLValueError,
+            ArrayValue.load_datafile, url, 'text/csv', 'c')
+
+    def test_reload_on_modification(self):
+        url = self._path('values.txt')
+        numpy.savetxt(url, self.values)
+        array_value = ArrayValue(datafile=(url, 'text/plain', None))
+        self.assertEqual(list(array_value), list(self.values))
+        numpy.savetxt(url, self.values * 2)
+        # Ensure the modification time is different
+        mtime = os.path.getmtime(url) + 10
+        os.utime(url, (mtime, mtime))
+        reloaded = ArrayValue(datafile=(url, 'text/plain', None))
+        self.assertEqual(list(reloaded), list(self.values * 2))
+
+    def test_indices(self):
+        url = self._path('indices.txt')
+        numpy.savetxt(url, self.values)
+        indices = ArrayValue.from_indices(
+            ArrayValue(datafile=(url, 'text/plain', None)))
+        self.assertFalse(indices.loaded)
+        self.assertEqual(list(indices), list(range(10)))
+        self.assertEqual(indices.dtype, numpy.dtype('int64'))
+        # Non-integral and negative indices are rejected when loaded
+        for values in (self.values + 0.5, self.values - 1):
+            numpy.savetxt(url, values)
+            mtime = os.path.getmtime(url) + 10
+            os.utime(url, (mtime, mtime))
+            indices = ArrayValue.from_indices(
+                ArrayValue(datafile=(url, 'text/plain', None)))
+            self.assertRaises(NineMLValueError, getattr, indices, 'values')
+            self.assertRaises(NineMLValueError, getattr, indices.clone(),
+                              'values')
+
+    def test_roundtrip(self):
+        numpy.save(self._path('values.npy'), self.values)
+        dynPropExt = dynPropC.clone()
+        dynPropExt.set(nineml.Property('P2', nineml.Quantity(
+            ArrayValue(datafile=('./values.npy', 'application/x-npy', None)),
+            dynPropC.property('P2').units)))
+        url = self._path('external.xml')
+        nineml.write(url, dynC, dynPropExt)
+        reread = nineml.read(url, reload=True)['dynPropC']
+        array_value = reread.property('P2').value
+        self.assertEqual(array_value.datafile.url, './values.npy')
+        self.assertFalse(array_value.loaded)
+        self.assertEqual(list(array_value), list(self.values))
+
+
+class TestArrayValueDtype(unittest.TestCase):
+
+    def test_default_dtype(self):
+        self.assertEqual(ArrayValue([1, 2, 3]).dtype, numpy.float64)
+        self.assertEqual(ArrayValue(numpy.arange(3, dtype='int32')).dtype,
+                         numpy.int32)
+        self.assertEqual(ArrayValue([1, 2, 3], dtype='float32').dtype,
+                         numpy.float32)
+        self.assertRaises(NineMLValueError, ArrayValue, [1, 2], dtype='u1')
+        self.assertRaises(NineMLValueError, ArrayValue, ['a', 'b'])
+        self.assertRaises(NineMLValueError, ArrayValue, [[1, 2], [3, 4]])
+
+    def test_no_copy(self):
+        values = numpy.arange(10, dtype=float)
+        array_value = ArrayValue(values)
+        self.assertIs(array_value.values, values)
+        self.assertIs(numpy.asarray(array_value), values)
+        # Arguments of the NumPy 2 array protocol
+        self.assertIs(array_value.__array__(copy=False), values)
+        self.assertIsNot(array_value.__array__(copy=True), values)
+        self.assertEqual(array_value.__array__(dtype='float32').dtype,
+                         numpy.float32)
+        self.assertRaises(ValueError, array_value.__array__, dtype='float32',
+                          copy=False)
+        self.assertIsNot(ArrayValue(values, dtype='float32').values, values)
+        # Non-contiguous arrays are copied into contiguous ones
+        strided = ArrayValue(values[::2])
+        self.assertTrue(strided.values.flags['C_CONTIGUOUS'])
+        self.assertEqual(list(strided), [0.0, 2.0, 4.0, 6.0, 8.0])
+
+    def test_clone_copies_values(self):
+        array_value = ArrayValue(numpy.arange(5, dtype='int32'))
+        clone = array_value.clone()
+        self.assertEqual(clone.dtype, numpy.dtype('int32'))
+        clone.values[0] = 10
+        self.assertEqual(list(array_value), [0, 1, 2, 3, 4])
+        self.assertEqual(list(clone), [10, 1, 2, 3, 4])
+
+    def test_operators(self):
+        array_value = ArrayValue([1.0, 2.0, 4.0])
+        self.assertEqual(list(array_value + 1), [2.0, 3.0, 5.0])
+        self.assertEqual(list(2 - array_value), [1.0, 0.0, -2.0])
+        self.assertEqual(list(4 / array_value), [4.0, 2.0, 1.0])
+        self.assertEqual(list(array_value ** 2), [1.0, 4.0, 16.0])
+        self.assertEqual(list(-array_value), [-1.0, -2.0, -4.0])
+        self.assertEqual(list(array_value > 1.5), [0.0, 1.0, 1.0])
+        self.assertEqual(list(array_value.inverse()), [1.0, 0.5, 0.25])
+        integers = ArrayValue(numpy.arange(4, dtype='int64'))
+        self.assertEqual((integers * 2).dtype, numpy.float64)
+        self.assertEqual(list(integers % 2), [0.0, 1.0, 0.0, 1.0])
+
+
+class TestRandomSampling(unittest.TestCase):
+
+    def setUp(self):
+        self.normal = nineml.RandomDistribution(
+            name='normal',
+            standard_library='http://www.uncertml.org/distributions/normal',
+            parameters=[Parameter('mean', dimension=un.dimensionless),
+                        Parameter('variance',
+                                         dimension=un.dimensionless)])
+        self.value = RandomDistributionValue(
+            nineml.RandomDistributionProperties(
+                'normal_props', self.normal,
+                {'mean': -65.0, 'variance': 4.0}))
+
+    def test_sample(self):
+        samples = self.value.sample(100000, seed=42)
+        self.assertEqual(samples.shape, (100000,))
+        self.assertAlmostEqual(samples.mean(), -65.0, 1)
+        self.assertAlmostEqual(samples.std(), 2.0, 1)
+
+    def test_reproducible_streams(self):
+        pop1 = self.value.sample(10, seed=42, stream='pop1')
+        self.assertTrue(numpy.array_equal(
+            pop1, self.value.sample(10, seed=42, stream='pop1')))
+        self.assertFalse(numpy.array_equal(
+            pop1, self.value.sample(10, seed=42, stream='pop2')))
+        self.assertTrue(numpy.array_equal(
+            pop1, self.value.sample(10, seed=numpy.random.default_rng(42),
+                                    stream='pop1')))
+
+    def test_quantity_sample(self):
+        qty = nineml.Quantity(self.value, un.mV)
+        self.assertTrue(numpy.array_equal(
+            qty.sample(10, seed=1), self.value.sample(10, seed=1)))
+        self.assertEqual(list(nineml.Quantity(1.5, un.mV).sample(3)),
+                         [1.5, 1.5, 1.5])
+        self.assertRaises(NineMLUsageError,
+                          nineml.Quantity([1.0, 2.0], un.mV).sample, 3)
+
+    def test_missing_property(self):
+        uniform = nineml.RandomDistribution(
+            name='uniform',
+            standard_library='http://www.uncertml.org/distributions/uniform',
+            parameters=[Parameter('low', dimension=un.dimensionless),
+                        Parameter('high',
+                                         dimension=un.dimensionless)])
+        value = RandomDistributionValue(nineml.RandomDistributionProperties(
+            'uniform_props', uniform, {'low': 0.0, 'high': 1.0}))
+        self.assertRaises(NineMLUsageError, value.sample, 10)
+
+
+class TestArrayValueEquality(unittest.TestCase):
+
+    def test_nearly_equal_semantics(self):
+        rng = numpy.random.RandomState(12345)
+        values = rng.standard_normal(1000) * 10.0 ** rng.randint(-20, 20, 1000)
+        for places in (3, 10, 15):
+            perturbed = values * (1.0 + 10.0 ** -(places + 1))
+            mantissas, exponents = round_mantissas(values, places)
+            for v, m, e in zip(values, mantissas, exponents):
+                mantissa, exponent = math.frexp(v)
+                self.assertEqual(m, round(mantissa, places))
+                self.assertEqual(e, exponent)
+            self.assertEqual(
+                nearly_equal_arrays(values, perturbed, places),
+                all(nearly_equal(v, p, places)
+                    for v, p in zip(values, perturbed)))
+
+    def test_equality_and_hash(self):
+        array1 = ArrayValue(numpy.arange(100, dtype='int32'))
+        array2 = ArrayValue(numpy.arange(100, dtype=float) * (1.0 + 1e-17))
+        array3 = ArrayValue(numpy.arange(100, dtype=float) + 1e-3)
+        self.assertEqual(array1, array2)
+        self.assertEqual(hash(array1), hash(array2))
+        self.assertNotEqual(array1, array3)
+        self.assertEqual(ArrayValue([0.0]), ArrayValue([-0.0]))
+        self.assertEqual(hash(ArrayValue([0.0])), hash(ArrayValue([-0.0])))
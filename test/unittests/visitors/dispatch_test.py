@@ -0,0 +1,51 @@
+import unittest
+from nineml.abstraction import Dynamics, Regime, Parameter
+from nineml.visitors.base import BaseVisitor, _dispatch_tables
+
+
+class ParameterCounter(BaseVisitor):
+
+    def __init__(self):
+        super(ParameterCounter, self).__init__()
+        self.count = 0
+
+    def action_parameter(self, parameter, **kwargs):  # @UnusedVariable
+        self.count += 1
+
+    def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
+        pass
+
+
+class RegimeCounter(ParameterCounter):
+
+    def action_parameter(self, parameter, **kwargs):  # @UnusedVariable
+        pass
+
+    def action_regime(self, regime, **kwargs):  # @UnusedVariable
+        self.count += 1
+
+
+class TestDispatchTables(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamics = Dynamics(
+            name='D', parameters=[Parameter('P1'), Parameter('P2')],
+            regimes=[Regime('dSV1/dt = -SV1 / P1', name='R1'),
+                     Regime('dSV1/dt = -SV1 / P2', name='R2')],
+            validate=False)
+
+    def test_per_visitor_class(self):
+        for visitor_cls, expected in ((ParameterCounter, 2),
+                                      (RegimeCounter, 2)):
+            for _ in range(2):  # Second time uses the cached dispatch
+                visitor = visitor_cls()
+                visitor.visit(self.dynamics)
+                self.assertEqual(visitor.count, expected)
+        self.assertIs(_dispatch_tables[(ParameterCounter, Parameter)].action,
+                      ParameterCounter.action_parameter)
+        self.assertIs(_dispatch_tables[(RegimeCounter, Parameter)].action,
+                      RegimeCounter.action_parameter)
+        self.assertIs(_dispatch_tables[(RegimeCounter, Dynamics)].action,
+                      ParameterCounter.default_action)
+        self.assertEqual(_dispatch_tables[(RegimeCounter, Dynamics)].children,
+                         tuple(Dynamics.nineml_children))
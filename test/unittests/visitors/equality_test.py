@@ -1,11 +1,12 @@
 import re
 import unittest
-from nineml.visitors.equality import MismatchFinder
+from nineml.visitors.equality import (
+    MismatchFinder, EqualityChecker, _rhs_equality_memo)
 import nineml.units as un
 from nineml.abstraction import (
     Parameter, Constant, Dynamics, Regime,
     OutputEvent, StateVariable, On, AnalogSendPort,
-    AnalogReceivePort, OnCondition, Trigger)
+    AnalogReceivePort, OnCondition, Trigger, Alias)
 
 
 class TestFindMismatch(unittest.TestCase):
@@ -55,6 +56,53 @@ class TestFindMismatch(unittest.TestCase):
         return re.sub(r'\s+', ' ', string).strip()
 
 
+class TestRhsEquality(unittest.TestCase):
+
+    def setUp(self):
+        _rhs_equality_memo.clear()
+        self.checker = EqualityChecker()
+
+    def test_tiers(self):
+        alias = Alias('A', 'a * (b + c)')
+        # Identical sources are compared without parsing them
+        same_source = Alias('A', 'a * (b + c)')
+        self.assertTrue(self.checker._rhs_equal(alias, same_source))
+        self.assertFalse(alias.is_parsed)
+        # Structurally equal expressions don't need to be expanded
+        self.assertTrue(self.checker._rhs_equal(alias,
+                                                Alias('A', '(c + b) * a')))
+        self.assertFalse(_rhs_equality_memo)
+        # Expressions that are only equal after expansion
+        expanded = Alias('A', 'a * b + a * c')
+        self.assertTrue(self.checker._rhs_equal(alias, expanded))
+        self.assertTrue(_rhs_equality_memo[(alias.rhs, expanded.rhs)])
+        self.assertTrue(_rhs_equality_memo[(expanded.rhs, alias.rhs)])
+        # Differing expressions are rejected by probing
+        self.assertTrue(self.checker._probes_differ(
+            alias.rhs, Alias('A', 'a * b + c').rhs))
+        self.assertFalse(self.checker._rhs_equal(
+            alias, Alias('A', 'a * b + c')))
+        self.assertFalse(self.checker._rhs_equal(
+            alias, Alias('A', 'a * (b + c) + 1e-9 * a')))
+
+    def test_unprobeable(self):
+        self.assertFalse(self.checker._probes_differ(
+            Alias('A', 'random.uniform() + a').rhs,
+            Alias('A', 'random.uniform() + b').rhs))
+        self.assertFalse(self.checker._rhs_equal(
+            Alias('A', 'random.uniform() + a'),
+            Alias('A', 'random.uniform() + b')))
+        self.assertTrue(self.checker._rhs_equal(
+            Alias('A', 'log(a) + exp(b + c)'),
+            Alias('A', 'exp(c) * exp(b) + log(a)')))
+
+    def test_booleans(self):
+        self.assertTrue(self.checker._rhs_equal(
+            Trigger('(a > b) & (c < d)'), Trigger('(c < d) && (a > b)')))
+        self.assertFalse(self.checker._rhs_equal(
+            Trigger('(a > b) & (c < d)'), Trigger('(a > b) | (c < d)')))
+
+
 ref = Dynamics(
     name='dyn',
     aliases=['A1:=P1 * SV2', 'A2 := ARP1 + SV2', 'A3 := SV1',
@@ -0,0 +1,113 @@
+import unittest
+import pickle
+import sympy
+from nineml.abstraction import (
+    Dynamics, Regime, Parameter, StateVariable, Alias, On)
+from nineml.user import DynamicsProperties, MultiDynamics
+from nineml.visitors.equality import Hasher
+from nineml import units as un
+
+
+class TestCachedHash(unittest.TestCase):
+
+    def setUp(self):
+        self.dynamics = self._make_dynamics()
+
+    def _make_dynamics(self, name='D'):
+        return Dynamics(
+            name=name, parameters=[Parameter('P1', un.time), Parameter('P2')],
+            state_variables=[StateVariable('SV1')],
+            regimes=[Regime('dSV1/dt = -SV1 / P1',
+                            transitions=[On('SV1 > P2', do=['SV1 = 0'])],
+                            name='R1')],
+            aliases=['A1 := SV1 * P2'], validate=False)
+
+    def assertHashUpToDate(self, obj):
+        self.assertEqual(hash(obj), hash(Hasher().hash(obj)))
+
+    def test_cached(self):
+        hsh = hash(self.dynamics)
+        self.assertEqual(hash(self.dynamics._cached_hash), hsh)
+        self.assertEqual(hash(self.dynamics), hsh)
+        self.assertHashUpToDate(self.dynamics)
+
+    def test_expression_mutation(self):
+        hsh = hash(self.dynamics)
+        regime = self.dynamics.regime('R1')
+        td = regime.time_derivative('SV1')
+        td.rhs = '-SV1 / P2'
+        self.assertIsNone(regime._cached_hash)
+        self.assertNotEqual(hash(self.dynamics), hsh)
+        self.assertHashUpToDate(self.dynamics)
+        hsh = hash(self.dynamics)
+        td.subs(sympy.Symbol('P2'), sympy.Symbol('P1'))
+        self.assertNotEqual(hash(self.dynamics), hsh)
+        # Mutation of a nested child (the trigger of an on-condition)
+        self.assertEqual(hash(self.dynamics), hash(self._make_dynamics()))
+        next(regime.on_conditions).trigger.subs(sympy.Symbol('P2'), 1)
+        self.assertNotEqual(hash(self.dynamics), hash(self._make_dynamics()))
+        self.assertHashUpToDate(self.dynamics)
+
+    def test_container_mutation(self):
+        hsh = hash(self.dynamics)
+        alias = Alias('A2', 'P1 * P2')
+        self.dynamics.add(alias)
+        self.assertNotEqual(hash(self.dynamics), hsh)
+        self.assertHashUpToDate(self.dynamics)
+        self.dynamics.remove(alias)
+        self.assertEqual(hash(self.dynamics), hsh)
+        # Removed elements no longer propagate modifications
+        hash(alias)
+        alias.rhs = 'P1'
+        self.assertEqual(hash(self.dynamics._cached_hash), hsh)
+        self.assertNotEqual(hash(alias), hash(Alias('A2', 'P1 * P2')))
+
+    def test_rename_symbol(self):
+        hsh = hash(self.dynamics)
+        self.dynamics.rename_symbol('P2', 'P3')
+        self.assertNotEqual(hash(self.dynamics), hsh)
+        self.assertHashUpToDate(self.dynamics)
+        self.assertEqual(hash(self.dynamics.parameter('P3')),
+                         hash(Parameter('P3')))
+
+    def test_property_setter(self):
+        props = DynamicsProperties(
+            name='DP', definition=self.dynamics,
+            properties={'P1': 1.0 * un.ms, 'P2': 2.0 * un.unitless})
+        hsh = hash(props)
+        props['P1'] = 3.0 * un.ms
+        self.assertNotEqual(hash(props), hsh)
+        self.assertHashUpToDate(props)
+
+    def test_shared_component_class(self):
+        # The same class is used by two sub-components, neither of which
+        # it is linked to via its '_parent' attribute
+        multi = MultiDynamics(
+            name='M', sub_components={'a': self.dynamics,
+                                      'b': self.dynamics},
+            validate_dimensions=False)
+        hsh = hash(multi)
+        self.dynamics.regime('R1').time_derivative('SV1').rhs = '-SV1'
+        self.assertNotEqual(hash(multi), hsh)
+        self.assertHashUpToDate(multi)
+
+    def test_pickle(self):
+        hash(self.dynamics)
+        unpickled = pickle.loads(pickle.dumps(self.dynamics))
+        self.assertIsNone(unpickled._cached_hash)
+        self.assertEqual(unpickled, self.dynamics)
+
+    def test_element_in_several_containers(self):
+        alias = Alias('A2', 'P1 * P2')
+        other = self._make_dynamics(name='E')
+        self.dynamics.add(alias)
+        other.add(alias)
+        hashes = [hash(self.dynamics), hash(other)]
+        alias.rhs = 'P1 * 3'
+        for dynamics, hsh in zip((self.dynamics, other), hashes):
+            self.assertNotEqual(hash(dynamics), hsh)
+            self.assertHashUpToDate(dynamics)
+        # Both links survive pickling
+        unpickled_alias = pickle.loads(pickle.dumps(
+            (self.dynamics, other)))[0].alias('A2')
+        self.assertEqual(len(unpickled_alias._containers), 2)
@@ -0,0 +1,94 @@
+"""
+Benchmarks the time taken to read documents with increasing numbers of
+document-level elements, which should scale linearly with the number of
+elements.
+
+Each generated document is in 9ML v1 format and contains a single component
+class, a component that refers to it via a 'Definition' and then components
+that refer to that component via 'Prototype' elements, so the type of every
+component needs to be resolved through the chain of references.
+"""
+from __future__ import print_function, division
+import os.path
+import shutil
+import tempfile
+import time
+from argparse import ArgumentParser
+import nineml
+
+
+HEADER = """<?xml version='1.0' encoding='UTF-8'?>
+<NineML xmlns="http://nineml.net/9ML/1.0">
+  <ComponentClass name="D">
+    <Parameter name="a" dimension="per_time"/>
+    <Dynamics>
+      <StateVariable name="x" dimension="dimensionless"/>
+      <Regime name="R">
+        <TimeDerivative variable="x">
+          <MathInline>a</MathInline>
+        </TimeDerivative>
+      </Regime>
+    </Dynamics>
+  </ComponentClass>
+  <Component name="P0">
+    <Definition>D</Definition>
+    <Property name="a" units="per_ms">
+      <SingleValue>1.0</SingleValue>
+    </Property>
+  </Component>
+"""
+
+COMPONENT = """  <Component name="P{}">
+    <Prototype>P0</Prototype>
+    <Property name="a" units="per_ms">
+      <SingleValue>{}</SingleValue>
+    </Property>
+  </Component>
+"""
+
+FOOTER = """  <Dimension name="dimensionless"/>
+  <Unit symbol="per_ms" dimension="per_time" power="3"/>
+  <Dimension name="per_time" t="-1"/>
+</NineML>
+"""
+
+
+def write_document(url, num_elems):
+    with open(url, 'w') as f:
+        f.write(HEADER)
+        # Two of the elements are the component class and base component
+        for i in range(1, num_elems - 1):
+            f.write(COMPONENT.format(i, float(i)))
+        f.write(FOOTER)
+
+
+def time_read(url, num_repeats):
+    times = []
+    for _ in range(num_repeats):
+        start = time.time()
+        doc = nineml.read(url, reload=True)
+        times.append(time.time() - start)
+        del doc
+    return min(times)
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--sizes', type=int, nargs='+',
+                    default=[1000, 3000, 10000, 30000, 100000],
+                    help="Numbers of document-level elements to time")
+parser.add_argument('--repeats', type=int, default=1,
+                    help="Number of times to repeat each read (min is used)")
+args = parser.parse_args()
+
+tmp_dir = tempfile.mkdtemp()
+try:
+    print("{:>10} {:>12} {:>16}".format('elements', 'time (s)',
+                                        'per elem (us)'))
+    for size in args.sizes:
+        url = os.path.join(tmp_dir, 'scaling{}.xml'.format(size))
+        write_document(url, size)
+        elapsed = time_read(url, args.repeats)
+        print("{:>10} {:>12.3f} {:>16.1f}".format(size, elapsed,
+                                                  1e6 * elapsed / size))
+finally:
+    shutil.rmtree(tmp_dir)
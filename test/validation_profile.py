@@ -0,0 +1,118 @@
+"""
+Benchmarks the validation of flattened MultiDynamics classes, made up of a
+neuron receiving input from an increasing number of alpha synapses, with all
+Dynamics validators checked together in a single traversal of the class and
+with each validator traversing the class in turn (as they were before the
+fused validator was introduced).
+"""
+from __future__ import print_function, division
+import timeit
+from argparse import ArgumentParser
+from nineml import abstraction as al, units as un
+from nineml.user import MultiDynamics
+from nineml.abstraction.dynamics.visitors.validators.base import (
+    DynamicsValidator)
+from nineml.abstraction.dynamics.visitors.validators.general import (
+    DimensionalityDynamicsValidator)
+from nineml.visitors.base import BaseVisitor
+
+
+class Counter(BaseVisitor):
+
+    def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
+        self.count += 1
+
+
+def create_neuron():
+    return al.Dynamics(
+        name='Neuron',
+        parameters=[al.Parameter('C', un.capacitance),
+                    al.Parameter('g_L', un.conductance),
+                    al.Parameter('E_L', un.voltage),
+                    al.Parameter('V_th', un.voltage),
+                    al.Parameter('V_reset', un.voltage),
+                    al.Parameter('t_ref', un.time)],
+        state_variables=[al.StateVariable('V', un.voltage),
+                         al.StateVariable('t_spike', un.time)],
+        regimes=[
+            al.Regime('dV/dt = (g_L * (E_L - V) + Isyn) / C',
+                      transitions=[al.On('V > V_th',
+                                         do=['V = V_reset', 't_spike = t',
+                                             al.OutputEvent('spike')],
+                                         to='refractory')],
+                      name='subthreshold'),
+            al.Regime(transitions=[al.On('t > t_spike + t_ref',
+                                         to='subthreshold')],
+                      name='refractory')],
+        aliases=['I_L := g_L * (E_L - V)'],
+        analog_ports=[al.AnalogReducePort('Isyn', un.current, '+'),
+                      al.AnalogSendPort('V', un.voltage),
+                      al.AnalogSendPort('I_L', un.current)],
+        event_ports=[al.EventSendPort('spike')])
+
+
+def create_alpha():
+    return al.Dynamics(
+        name='Alpha',
+        parameters=[al.Parameter('tau', un.time),
+                    al.Parameter('q', un.current)],
+        state_variables=[al.StateVariable('a', un.current),
+                         al.StateVariable('b', un.current)],
+        regimes=[al.Regime('da/dt = -a / tau', 'db/dt = (a - b) / tau',
+                           transitions=[al.On('spike', do=['a = a + q'])],
+                           name='default')],
+        aliases=['Isyn := b'],
+        analog_ports=[al.AnalogSendPort('Isyn', un.current)],
+        event_ports=[al.EventReceivePort('spike')])
+
+
+def create_flat(num_synapses):
+    neuron = create_neuron()
+    alpha = create_alpha()
+    sub_components = {'cell': neuron}
+    port_connections = []
+    port_exposures = [('cell', 'spike', 'spike'), ('cell', 'V', 'V')]
+    for i in range(num_synapses):
+        name = 'syn{}'.format(i)
+        sub_components[name] = alpha
+        port_connections.append((name, 'Isyn', 'cell', 'Isyn'))
+        port_exposures.append((name, 'spike', 'spike_' + name))
+    multi = MultiDynamics(
+        name='Multi', sub_components=sub_components,
+        port_connections=port_connections, port_exposures=port_exposures,
+        validate_dimensions=False)
+    return multi.flatten(validate=False)
+
+
+def sequential(component_class):
+    for validator_cls in (DynamicsValidator.validator_classes +
+                          (DimensionalityDynamicsValidator,)):
+        validator_cls(component_class)
+
+
+def fused(component_class):
+    DynamicsValidator.validate_componentclass(component_class)
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--sizes', type=int, nargs='+', default=[1, 10, 50, 100],
+                    help="Numbers of synapses in the flattened classes")
+parser.add_argument('--number', type=int, default=3,
+                    help="Number of times to validate each class")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+print("{:>9} {:>9} {:>16} {:>16} {:>8}".format(
+    'synapses', 'nodes', 'sequential (ms)', 'fused (ms)', 'speedup'))
+for size in args.sizes:
+    flat = create_flat(size)
+    counter = Counter()
+    counter.count = 0
+    counter.visit(flat)
+    times = [min(timeit.repeat(lambda: validate(flat), number=args.number,
+                               repeat=args.repeats)) / args.number
+             for validate in (sequential, fused)]
+    print("{:>9} {:>9} {:>16.2f} {:>16.2f} {:>8.2f}".format(
+        size, counter.count, 1e3 * times[0], 1e3 * times[1],
+        times[0] / times[1]))
@@ -0,0 +1,135 @@
+"""
+Benchmarks the traversal throughput (in visited nodes per second) of the
+base visitor classes over the objects in the comprehensive example, with the
+per-class dispatch tables and with the dispatch recomputed for every visited
+node (as it was before the tables were introduced, apart from the memoized
+accessor names of the NineML classes).
+"""
+from __future__ import print_function, division
+import timeit
+from argparse import ArgumentParser
+from nineml.utils.comprehensive_example import doc1, instances_of_all_types
+from nineml.visitors.base import (
+    BaseVisitor, BaseChildResultsVisitor, BaseVisitorWithContext,
+    BaseDualVisitor, BaseDualVisitorWithContext, Dispatch)
+from nineml.visitors import Cloner
+from nineml.visitors.equality import EqualityChecker
+
+
+class Counter(BaseVisitor):
+
+    def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
+        self.count += 1
+
+
+class ChildResultsCounter(BaseChildResultsVisitor):
+
+    def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
+        self.count += 1
+
+
+class ContextCounter(BaseVisitorWithContext):
+
+    def default_action(self, obj, nineml_cls, **kwargs):  # @UnusedVariable
+        self.count += 1
+
+
+class DualCounter(BaseDualVisitor):
+
+    def default_action(self, obj1, obj2, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
+        self.count += 1
+
+
+class DualContextCounter(BaseDualVisitorWithContext):
+
+    def default_action(self, obj1, obj2, nineml_cls, **kwargs):  # @UnusedVariable @IgnorePep8
+        self.count += 1
+
+
+class UncachedDispatchMixin(object):
+    "Recomputes the dispatch table entry for every visited node"
+
+    def _dispatch(self, nineml_cls):
+        visitor_cls = type(self)
+        type_name = nineml_cls.nineml_type.lower()
+        return Dispatch(
+            getattr(visitor_cls, 'action_' + type_name,
+                    visitor_cls.default_action),
+            getattr(visitor_cls, 'post_action_' + type_name,
+                    getattr(visitor_cls, 'default_post_action', None)),
+            tuple(nineml_cls.nineml_child.items()),
+            tuple(nineml_cls.nineml_children))
+
+
+def uncached(visitor_cls):
+    return type('Uncached' + visitor_cls.__name__,
+                (UncachedDispatchMixin, visitor_cls), {})
+
+
+def count_nodes(objects):
+    counter = Counter()
+    counter.count = 0
+    for obj in objects:
+        counter.visit(obj)
+    return counter.count
+
+
+def traverse(visitor_cls, objects, dual):
+    def run():
+        visitor = visitor_cls()
+        visitor.count = 0
+        for obj in objects:
+            if dual:
+                visitor.visit(obj, obj)
+            else:
+                visitor.visit(obj)
+    return run
+
+
+def clone(visitor_cls, objects, dual):  # @UnusedVariable
+    def run():
+        for obj in objects:
+            visitor_cls().clone(obj)
+    return run
+
+
+def check(visitor_cls, objects, dual):  # @UnusedVariable
+    clones = [obj.clone() for obj in objects]
+
+    def run():
+        for obj, obj_clone in zip(objects, clones):
+            visitor_cls().check(obj, obj_clone)
+    return run
+
+
+parser = ArgumentParser(__doc__)
+parser.add_argument('--number', type=int, default=10,
+                    help="Number of times to traverse the objects")
+parser.add_argument('--repeats', type=int, default=3,
+                    help="Number of times to repeat each timing (min is used)")
+args = parser.parse_args()
+
+objects = [doc1] + [
+    obj for type_name in ('Dynamics', 'MultiDynamics', 'ConnectionRule',
+                          'RandomDistribution', 'Network')
+    for _, obj in sorted(instances_of_all_types.get(type_name, {}).items())]
+num_nodes = count_nodes(objects)
+
+print("Traversing {} nodes\n".format(num_nodes))
+print("{:>22} {:>18} {:>18} {:>8}".format(
+    'visitor', 'uncached (node/s)', 'cached (node/s)', 'speedup'))
+for visitor_cls, make_run, dual in (
+        (Counter, traverse, False),
+        (ChildResultsCounter, traverse, False),
+        (ContextCounter, traverse, False),
+        (DualCounter, traverse, True),
+        (DualContextCounter, traverse, True),
+        (Cloner, clone, False),
+        (EqualityChecker, check, True)):
+    rates = []
+    for cls in (uncached(visitor_cls), visitor_cls):
+        elapsed = min(timeit.repeat(make_run(cls, objects, dual),
+                                    number=args.number, repeat=args.repeats))
+        rates.append(num_nodes * args.number / elapsed)
+    print("{:>22} {:>18.0f} {:>18.0f} {:>8.2f}".format(
+        visitor_cls.__name__, rates[0], rates[1], rates[1] / rates[0]))